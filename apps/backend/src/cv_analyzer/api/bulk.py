@@ -0,0 +1,266 @@
+"""Bulk upload and bulk analysis endpoints."""
+import asyncio
+import contextlib
+import mimetypes
+import posixpath
+import zipfile
+from typing import Optional, List, BinaryIO, Callable, ContextManager, NamedTuple
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from opentelemetry import trace
+from cv_analyzer.api.common import validate_file_type, store_cv, admit, enqueue_analyses
+from cv_analyzer.api.rate_limit import rate_limited
+from cv_analyzer.core.config import settings
+from cv_analyzer.core.logging import get_logger
+from cv_analyzer.core.metrics import cv_uploads_total, cv_bulk_upload_files
+from cv_analyzer.models.schemas import (
+    BulkUploadResult,
+    BulkUploadResponse,
+    AnalyzeResponse,
+    BulkAnalyzeRequest,
+    BulkAnalyzeResponse,
+    JobStatus,
+    JobPriority,
+)
+from cv_analyzer.services.storage import FileTooLargeError
+from cv_analyzer.services.cv_registry import cv_registry
+
+logger = get_logger(__name__)
+tracer = trace.get_tracer(__name__)
+
+router = APIRouter()
+
+
+class BulkUploadMember(NamedTuple):
+    """One CV file of a bulk upload: a plain upload or a zip member."""
+    filename: str
+    content_type: str
+    size: Optional[int]
+    open_stream: Optional[Callable[[], ContextManager[BinaryIO]]]
+    error: Optional[str] = None
+
+
+def _bulk_upload_members(files: List[UploadFile], archives: List[zipfile.ZipFile]) -> List[BulkUploadMember]:
+    """
+    Expand a bulk upload into its CV files.
+    
+    ``.zip`` uploads are replaced by their members, skipping directories and
+    archiver metadata (``__MACOSX/``, dotfiles). Files that cannot be stored
+    get an error instead of an ``open_stream`` callable. Opened archives are added
+    to ``archives`` for the caller to close.
+    """
+    members = []
+    for file in files:
+        filename = file.filename or "unknown"
+        if not filename.lower().endswith(".zip"):
+            members.append(BulkUploadMember(
+                filename=filename,
+                content_type=file.content_type or "application/octet-stream",
+                size=file.size,
+                open_stream=lambda file=file: contextlib.nullcontext(file.file),
+            ))
+            continue
+        
+        try:
+            archive = zipfile.ZipFile(file.file)
+        except zipfile.BadZipFile:
+            members.append(BulkUploadMember(filename, "application/zip", file.size, None, "Invalid zip archive"))
+            continue
+        archives.append(archive)
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith("__MACOSX/") or posixpath.basename(name).startswith("."):
+                continue
+            content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            if info.flag_bits & 0x1:
+                members.append(BulkUploadMember(name, content_type, info.file_size, None, "Encrypted zip members are not supported"))
+                continue
+            members.append(BulkUploadMember(
+                filename=name,
+                content_type=content_type,
+                size=info.file_size,
+                open_stream=lambda archive=archive, info=info: archive.open(info),
+            ))
+    return members
+
+
+def _bulk_member_error(member: BulkUploadMember) -> Optional[str]:
+    """Validate a bulk upload member's type and declared size."""
+    if member.error:
+        return member.error
+    try:
+        validate_file_type(member.filename)
+    except HTTPException as e:
+        return e.detail
+    if member.size is not None and member.size > settings.max_file_size_mb * 1024 * 1024:
+        return f"File too large. Max size: {settings.max_file_size_mb}MB"
+    return None
+
+
+async def _store_bulk_member(
+    member: BulkUploadMember,
+    analyze: bool,
+    provider: Optional[str],
+    prompt_version: Optional[str],
+) -> BulkUploadResult:
+    """Store one validated member and optionally enqueue its analysis."""
+    try:
+        with member.open_stream() as stream:
+            cv = await store_cv(stream, member.filename, member.content_type, member.size)
+    except FileTooLargeError:
+        cv_uploads_total.labels(status="rejected").inc()
+        return BulkUploadResult(
+            filename=member.filename,
+            error=f"File too large. Max size: {settings.max_file_size_mb}MB",
+        )
+    except (zipfile.BadZipFile, NotImplementedError, RuntimeError) as e:
+        cv_uploads_total.labels(status="rejected").inc()
+        return BulkUploadResult(filename=member.filename, error=f"Unreadable zip member: {e}")
+    except Exception as e:
+        logger.error("bulk_upload_file_failed", filename=member.filename, error=str(e))
+        cv_uploads_total.labels(status="failed").inc()
+        return BulkUploadResult(filename=member.filename, error="Upload failed")
+    
+    job_id = None
+    error = None
+    if analyze:
+        # The file is stored either way, so a failed enqueue is reported on its entry
+        try:
+            job_id = (await enqueue_analyses([(cv["cv_id"], cv, provider, prompt_version)]))[0]["job_id"]
+        except Exception as e:
+            logger.error("bulk_upload_enqueue_failed", cv_id=cv["cv_id"], error=str(e))
+            error = "Stored, but the analysis could not be queued"
+    return BulkUploadResult(
+        filename=member.filename,
+        cv_id=cv["cv_id"],
+        size_bytes=cv["size_bytes"],
+        sha256=cv["sha256"],
+        deduplicated=cv["deduplicated"],
+        job_id=job_id,
+        error=error,
+    )
+
+
+@router.post(
+    f"{settings.api_prefix}/cv/upload/bulk",
+    response_model=BulkUploadResponse,
+    dependencies=[Depends(rate_limited("upload_bulk"))],
+)
+async def bulk_upload_cv(
+    files: List[UploadFile] = File(...),
+    analyze: bool = Form(False),
+    provider: Optional[str] = Form(None),
+    prompt_version: Optional[str] = Form(None),
+    priority: JobPriority = Form(JobPriority.LOW),
+):
+    """
+    Upload many CV files in one request.
+    
+    Accepts any number of ``files`` parts; ``.zip`` parts are expanded into
+    their members. Each file is validated on its own and up to
+    ``bulk_upload_concurrency`` are stored at a time. A rejected file does
+    not fail the request: it gets an ``error`` entry in the results. With
+    ``analyze``, an analysis job is enqueued for every stored file, and
+    nothing is stored if admission control turns the jobs away. A stored file
+    whose job could not be enqueued keeps its ``cv_id`` and gets an ``error``.
+    """
+    with tracer.start_as_current_span("bulk_upload_cv") as span:
+        archives: List[zipfile.ZipFile] = []
+        try:
+            members = _bulk_upload_members(files, archives)
+            if not members:
+                raise HTTPException(status_code=400, detail="No files to upload")
+            if len(members) > settings.bulk_upload_max_files:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Too many files. Max files per request: {settings.bulk_upload_max_files}",
+                )
+            span.set_attribute("files", len(members))
+            cv_bulk_upload_files.observe(len(members))
+            if analyze:
+                await admit(len(members), priority)
+            
+            semaphore = asyncio.Semaphore(settings.bulk_upload_concurrency)
+            
+            async def store(member: BulkUploadMember) -> BulkUploadResult:
+                error = _bulk_member_error(member)
+                if error:
+                    cv_uploads_total.labels(status="rejected").inc()
+                    return BulkUploadResult(filename=member.filename, error=error)
+                async with semaphore:
+                    return await _store_bulk_member(member, analyze, provider, prompt_version)
+            
+            results = await asyncio.gather(*(store(member) for member in members))
+        finally:
+            for archive in archives:
+                archive.close()
+        
+        uploaded = sum(1 for result in results if result.cv_id)
+        span.set_attribute("uploaded", uploaded)
+        logger.info("cv_bulk_uploaded", files=len(results), uploaded=uploaded, analyze=analyze)
+        return BulkUploadResponse(results=results, uploaded=uploaded, failed=len(results) - uploaded)
+
+
+@router.post(
+    f"{settings.api_prefix}/cv/analyze/bulk",
+    response_model=BulkAnalyzeResponse,
+    dependencies=[Depends(rate_limited("analyze_bulk"))],
+)
+async def bulk_analyze_cv(request: BulkAnalyzeRequest):
+    """
+    Trigger analysis of many CVs at once.
+    
+    Every CV is analyzed with every combination of ``providers`` and
+    ``prompt_versions`` (for comparison runs). CVs are looked up in one
+    Redis round trip and jobs are written in pipelined chunks; unknown CVs
+    are reported in ``not_found`` and do not fail the request. All jobs are
+    admitted together or the request gets 429 with ``Retry-After``.
+    """
+    with tracer.start_as_current_span("bulk_analyze_cv") as span:
+        cv_ids = list(dict.fromkeys(request.cv_ids))
+        providers = list(dict.fromkeys(request.providers))
+        prompt_versions = list(dict.fromkeys(request.prompt_versions))
+        job_count = len(cv_ids) * len(providers) * len(prompt_versions)
+        span.set_attribute("cv_count", len(cv_ids))
+        span.set_attribute("job_count", job_count)
+        span.set_attribute("priority", request.priority.value)
+        if job_count > settings.bulk_analyze_max_jobs:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many jobs. Max: {settings.bulk_analyze_max_jobs}",
+            )
+        
+        found = {}
+        not_found = []
+        for cv_id, cv_metadata in zip(cv_ids, await cv_registry.get_many(cv_ids)):
+            if cv_metadata:
+                found[cv_id] = cv_metadata
+            else:
+                not_found.append(cv_id)
+        
+        analyses = [
+            (cv_id, cv_metadata, provider, prompt_version)
+            for cv_id, cv_metadata in found.items()
+            for provider in providers
+            for prompt_version in prompt_versions
+        ]
+        estimate = await admit(len(analyses), request.priority)
+        jobs = await enqueue_analyses(analyses)
+        
+        span.set_attribute("jobs_created", len(jobs))
+        logger.info("bulk_analysis_triggered", cvs=len(found), jobs=len(jobs), not_found=len(not_found))
+        
+        return BulkAnalyzeResponse(
+            jobs=[
+                AnalyzeResponse(
+                    job_id=job["job_id"],
+                    cv_id=job["cv_id"],
+                    status=JobStatus.PENDING,
+                    created_at=job["created_at"],
+                    provider=job["provider"],
+                    prompt_version=job["prompt_version"],
+                    estimated_wait_seconds=estimate.wait_seconds(position),
+                )
+                for position, job in enumerate(jobs)
+            ],
+            not_found=not_found,
+        )
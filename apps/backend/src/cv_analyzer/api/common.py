@@ -0,0 +1,155 @@
+"""Helpers shared by the upload and analysis endpoints."""
+import uuid
+from datetime import datetime
+from typing import Optional, Dict, Any, List, BinaryIO, Tuple
+from fastapi import HTTPException
+from cv_analyzer.core.config import settings
+from cv_analyzer.core.logging import get_logger
+from cv_analyzer.core.metrics import cv_uploads_total, cv_upload_size_bytes
+from cv_analyzer.models.schemas import JobPriority
+from cv_analyzer.services.admission import admission_controller, QueueEstimate, QueueOverloadedError
+from cv_analyzer.services.storage import storage_service
+from cv_analyzer.services.queue import queue_service
+from cv_analyzer.services.job_tracker import job_tracker
+from cv_analyzer.services.cv_registry import cv_registry, BlobDeletingError
+
+logger = get_logger(__name__)
+
+
+def validate_file_type(filename: str):
+    """Reject filenames whose extension is not allowed."""
+    file_ext = None
+    if filename:
+        file_ext = "." + filename.split(".")[-1].lower()
+    
+    if file_ext not in settings.allowed_file_types:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File type not allowed. Allowed types: {settings.allowed_file_types}",
+        )
+
+
+async def store_cv(stream: BinaryIO, filename: str, content_type: str, size: Optional[int]) -> Dict[str, Any]:
+    """
+    Store a file's content and register it as a new CV.
+    
+    The stream is read on the storage thread pool. Seekable streams (spooled
+    uploads) are hashed locally first; others are uploaded to a staging key.
+    The CV takes its reference on the content's blob before the blob's
+    existence is checked, so retention cannot delete an identical blob
+    between the check and the reference.
+    
+    Returns:
+        The CV's registry record, plus whether its content was already stored
+    
+    Raises:
+        FileTooLargeError: The content exceeds the maximum file size
+    """
+    cv_id = str(uuid.uuid4())
+    max_size = settings.max_file_size_mb * 1024 * 1024
+    staging_name = None
+    if stream.seekable():
+        stored = await storage_service.to_thread(storage_service.hash_stream, stream, max_size)
+    else:
+        staging_name = f"uploads/{cv_id}"
+        stored = await storage_service.to_thread(
+            storage_service.upload_stream,
+            staging_name,
+            stream,
+            content_type,
+            max_size,
+            size if size is not None else -1,
+        )
+    
+    while True:
+        try:
+            record = await cv_registry.register(
+                cv_id=cv_id,
+                filename=filename,
+                content_type=content_type,
+                size_bytes=stored["size"],
+                object_name=storage_service.blob_object_name(stored["sha256"]),
+                sha256=stored["sha256"],
+                uploaded_at=datetime.utcnow(),
+            )
+            break
+        except BlobDeletingError:
+            await cv_registry.wait_for_blob_deletion(stored["sha256"])
+    try:
+        if staging_name:
+            deduplicated = await storage_service.to_thread(storage_service.promote_staged, staging_name, stored["sha256"])
+        else:
+            deduplicated = await storage_service.to_thread(
+                storage_service.put_blob, stream, stored["sha256"], stored["size"], content_type
+            )
+    except Exception:
+        await cv_registry.release(cv_id)
+        raise
+    
+    cv_uploads_total.labels(status="success").inc()
+    cv_upload_size_bytes.observe(stored["size"])
+    logger.info(
+        "cv_uploaded",
+        cv_id=cv_id,
+        filename=filename,
+        size=stored["size"],
+        deduplicated=deduplicated,
+    )
+    return dict(record, deduplicated=deduplicated)
+
+
+async def admit(job_count: int, priority: JobPriority) -> QueueEstimate:
+    """
+    Run admission control for new analysis jobs.
+    
+    Raises:
+        HTTPException: 429 with ``Retry-After`` if the queue is over the class's limits
+    """
+    try:
+        return await admission_controller.admit(job_count, priority)
+    except QueueOverloadedError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after_seconds)},
+        )
+
+
+async def enqueue_analyses(
+    analyses: List[Tuple[str, Dict[str, Any], Optional[str], Optional[str]]],
+) -> List[Dict[str, Any]]:
+    """
+    Enqueue analysis jobs for registered CVs and create their tracker records.
+    
+    Jobs are written in chunks of ``bulk_analyze_chunk_size``; each chunk's
+    queue push and tracker records go out in one Redis transaction, so a
+    worker never dequeues a job whose record does not exist yet.
+    
+    Args:
+        analyses: (cv_id, CV metadata, provider, prompt_version) per job
+    
+    Returns:
+        The enqueued job messages, in order
+    """
+    jobs = [
+        queue_service.new_job(
+            cv_id=cv_id,
+            provider=provider,
+            prompt_version=prompt_version,
+            metadata={
+                "object_name": cv_metadata["object_name"],
+                "filename": cv_metadata["filename"],
+                "content_type": cv_metadata["content_type"],
+                "sha256": cv_metadata["sha256"],
+            },
+        )
+        for cv_id, cv_metadata, provider, prompt_version in analyses
+    ]
+    for start in range(0, len(jobs), settings.bulk_analyze_chunk_size):
+        chunk = jobs[start:start + settings.bulk_analyze_chunk_size]
+        pipe = queue_service.redis_client.pipeline()
+        await job_tracker.create_jobs(chunk, client=pipe)
+        await queue_service.enqueue_jobs(chunk, client=pipe)
+        await pipe.execute()
+    await queue_service.update_queue_size()
+    return jobs
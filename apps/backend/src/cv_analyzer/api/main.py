@@ -1,33 +1,51 @@
 """FastAPI application."""
+import asyncio
+import json
 import time
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends
+from datetime import datetime
+from typing import Optional, Dict, Any, List, AsyncIterator
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from sqlalchemy.exc import SQLAlchemyError
 from starlette.responses import Response
 from opentelemetry import trace
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
+from cv_analyzer.api import bulk, resumable
+from cv_analyzer.api.common import validate_file_type, store_cv, admit, enqueue_analyses
+from cv_analyzer.api.rate_limit import rate_limited
+from cv_analyzer.core.codec import decode_event
 from cv_analyzer.core.config import settings
+from cv_analyzer.core.database import database
 from cv_analyzer.core.logging import configure_logging, get_logger
 from cv_analyzer.core.metrics import (
     http_requests_total,
     http_request_duration_seconds,
+    cv_uploads_total,
 )
+from cv_analyzer.core.redis_pool import close_redis
+from cv_analyzer.core.report_schema import metadata as report_metadata
 from cv_analyzer.models.schemas import (
     CVUploadResponse,
     AnalyzeRequest,
     AnalyzeResponse,
     JobStatusResponse,
+    JobStatusBulkRequest,
+    JobStatusBulkResponse,
+    JobListResponse,
+    TimelineEvent,
     AnalysisReport,
     JobStatus,
 )
-from cv_analyzer.services.storage import storage_service
+from cv_analyzer.services.storage import storage_service, FileTooLargeError
 from cv_analyzer.services.queue import queue_service
 from cv_analyzer.services.job_tracker import job_tracker
-import uuid
-from datetime import datetime
+from cv_analyzer.services.job_events import job_event_hub
+from cv_analyzer.services.cv_registry import cv_registry
+from cv_analyzer.services.report_store import report_store
 
 # Configure logging
 configure_logging(settings.service_name, settings.debug)
@@ -36,13 +54,29 @@ logger = get_logger(__name__)
 # OpenTelemetry tracer
 tracer = trace.get_tracer(__name__)
 
+# Allowance for multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Job statuses after which nothing more is published
+TERMINAL_STATUSES = {JobStatus.COMPLETED.value, JobStatus.FAILED.value}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
     logger.info("application_starting", service=settings.service_name)
+    # Fail startup rather than the first upload if the bucket is unavailable
+    await storage_service.to_thread(storage_service.connect)
+    # Create the reports table once here rather than on the read path
+    try:
+        await database.ensure_schema(report_metadata)
+    except (SQLAlchemyError, OSError) as e:
+        logger.error("db_schema_unavailable", error=str(e))
     yield
     logger.info("application_shutting_down", service=settings.service_name)
+    await job_event_hub.close()
+    await database.close()
+    await close_redis()
 
 
 app = FastAPI(
@@ -58,11 +92,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "RateLimit-Policy", "Retry-After"],
 )
 
 # OpenTelemetry instrumentation
 FastAPIInstrumentor.instrument_app(app)
 
+# Bulk, direct and resumable uploads
+app.include_router(bulk.router)
+app.include_router(resumable.router)
+
 
 @app.middleware("http")
 async def metrics_middleware(request, call_next):
@@ -85,6 +124,23 @@ async def metrics_middleware(request, call_next):
     return response
 
 
+@app.middleware("http")
+async def upload_size_guard(request, call_next):
+    """Reject oversized uploads from Content-Length before the body is read."""
+    if request.method == "POST" and request.url.path == f"{settings.api_prefix}/cv/upload":
+        content_length = request.headers.get("content-length")
+        max_size_bytes = settings.max_file_size_mb * 1024 * 1024
+        if content_length and content_length.isdigit() and (
+            int(content_length) > max_size_bytes + MULTIPART_OVERHEAD_BYTES
+        ):
+            cv_uploads_total.labels(status="rejected").inc()
+            return JSONResponse(
+                status_code=400,
+                content={"detail": f"File too large. Max size: {settings.max_file_size_mb}MB"},
+            )
+    return await call_next(request)
+
+
 @app.get("/health")
 async def health():
     """Health check endpoint."""
@@ -97,9 +153,9 @@ async def ready():
     # Check dependencies
     try:
         # Check Redis
-        queue_service.redis_client.ping()
+        await queue_service.redis_client.ping()
         # Check MinIO
-        storage_service.client.bucket_exists(settings.minio_bucket)
+        await storage_service.to_thread(storage_service.client.bucket_exists, settings.minio_bucket)
     except Exception as e:
         logger.error("readiness_check_failed", error=str(e))
         raise HTTPException(status_code=503, detail="Service not ready")
@@ -113,7 +169,11 @@ async def metrics():
     return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
-@app.post(f"{settings.api_prefix}/cv/upload", response_model=CVUploadResponse)
+@app.post(
+    f"{settings.api_prefix}/cv/upload",
+    response_model=CVUploadResponse,
+    dependencies=[Depends(rate_limited("upload"))],
+)
 async def upload_cv(file: UploadFile = File(...)):
     """
     Upload a CV file.
@@ -124,82 +184,70 @@ async def upload_cv(file: UploadFile = File(...)):
         span.set_attribute("filename", file.filename)
         
         # Validate file type
-        file_ext = None
-        if file.filename:
-            file_ext = "." + file.filename.split(".")[-1].lower()
+        validate_file_type(file.filename)
+        
+        content_type = file.content_type or "application/octet-stream"
+        max_size_bytes = settings.max_file_size_mb * 1024 * 1024
         
-        if file_ext not in settings.allowed_file_types:
+        # Validate file size up front when the multipart parser knows it
+        if file.size is not None and file.size > max_size_bytes:
+            cv_uploads_total.labels(status="rejected").inc()
             raise HTTPException(
                 status_code=400,
-                detail=f"File type not allowed. Allowed types: {settings.allowed_file_types}",
+                detail=f"File too large. Max size: {settings.max_file_size_mb}MB",
             )
         
-        # Read file
-        file_data = await file.read()
-        file_size = len(file_data)
+        # TODO: Virus scan hook (placeholder)
+        # virus_scan_result = await virus_scan(file.file)
         
-        # Validate file size
-        max_size_bytes = settings.max_file_size_mb * 1024 * 1024
-        if file_size > max_size_bytes:
+        # Store content once under its hash; the size limit is enforced while reading
+        try:
+            cv = await store_cv(file.file, file.filename or "unknown", content_type, file.size)
+        except FileTooLargeError:
+            cv_uploads_total.labels(status="rejected").inc()
             raise HTTPException(
                 status_code=400,
                 detail=f"File too large. Max size: {settings.max_file_size_mb}MB",
             )
         
-        # TODO: Virus scan hook (placeholder)
-        # virus_scan_result = await virus_scan(file_data)
-        
-        # Generate CV ID
-        cv_id = str(uuid.uuid4())
-        
-        # Upload to MinIO
-        content_type = file.content_type or "application/octet-stream"
-        storage_service.upload_file(cv_id, file_data, content_type)
-        
-        span.set_attribute("cv_id", cv_id)
-        span.set_attribute("file_size", file_size)
-        
-        logger.info("cv_uploaded", cv_id=cv_id, filename=file.filename, size=file_size)
+        span.set_attribute("cv_id", cv["cv_id"])
+        span.set_attribute("file_size", cv["size_bytes"])
         
         return CVUploadResponse(
-            cv_id=cv_id,
-            filename=file.filename or "unknown",
-            size_bytes=file_size,
-            uploaded_at=datetime.utcnow(),
+            cv_id=cv["cv_id"],
+            filename=cv["filename"],
+            size_bytes=cv["size_bytes"],
+            sha256=cv["sha256"],
+            deduplicated=cv["deduplicated"],
+            uploaded_at=cv["uploaded_at"],
         )
 
 
-@app.post(f"{settings.api_prefix}/cv/{{cv_id}}/analyze", response_model=AnalyzeResponse)
+@app.post(
+    f"{settings.api_prefix}/cv/{{cv_id}}/analyze",
+    response_model=AnalyzeResponse,
+    dependencies=[Depends(rate_limited("analyze"))],
+)
 async def analyze_cv(cv_id: str, request: AnalyzeRequest):
     """
     Trigger CV analysis.
     
-    Returns job ID for status tracking.
+    Returns job ID for status tracking, or 429 with ``Retry-After`` when
+    the queue is too deep for the request's priority class.
     """
     with tracer.start_as_current_span("analyze_cv") as span:
         span.set_attribute("cv_id", cv_id)
+        span.set_attribute("priority", request.priority.value)
         
-        # Verify CV exists (try to download)
-        try:
-            storage_service.download_file(cv_id)
-        except Exception as e:
-            logger.error("cv_not_found", cv_id=cv_id, error=str(e))
+        # Verify CV exists (metadata index lookup, no download)
+        cv_metadata = await cv_registry.get(cv_id)
+        if not cv_metadata:
+            logger.error("cv_not_found", cv_id=cv_id)
             raise HTTPException(status_code=404, detail="CV not found")
         
-        # Enqueue job
-        job_id = queue_service.enqueue_job(
-            cv_id=cv_id,
-            provider=request.provider,
-            prompt_version=request.prompt_version,
-        )
-        
-        # Create job tracker record
-        job_tracker.create_job(
-            job_id=job_id,
-            cv_id=cv_id,
-            provider=request.provider or settings.default_provider,
-            prompt_version=request.prompt_version,
-        )
+        estimate = await admit(1, request.priority)
+        job = (await enqueue_analyses([(cv_id, cv_metadata, request.provider, request.prompt_version)]))[0]
+        job_id = job["job_id"]
         
         # Trigger n8n webhook (if configured)
         if settings.n8n_webhook_url:
@@ -213,42 +261,229 @@ async def analyze_cv(cv_id: str, request: AnalyzeRequest):
             job_id=job_id,
             cv_id=cv_id,
             status=JobStatus.PENDING,
-            created_at=datetime.utcnow(),
+            created_at=job["created_at"],
+            provider=job["provider"],
+            prompt_version=job["prompt_version"],
+            estimated_wait_seconds=estimate.wait_seconds(),
         )
 
 
 @app.get(f"{settings.api_prefix}/jobs/{{job_id}}", response_model=JobStatusResponse)
-async def get_job_status(job_id: str):
-    """Get job status and timeline."""
+async def get_job_status(
+    job_id: str,
+    wait: Optional[float] = Query(None, gt=0, description="Seconds to wait for a change after `since`"),
+    since: Optional[int] = Query(None, ge=0, description="Last version the client has seen"),
+):
+    """
+    Get job status and timeline.
+    
+    With ``wait`` and ``since``, the request is held open until the job's
+    version moves past ``since``, the job reaches a final status, or
+    ``wait`` seconds (capped at ``job_status_max_wait_seconds``) pass. The
+    wait is driven by the job's event channel, not by polling Redis.
+    """
     with tracer.start_as_current_span("get_job_status") as span:
         span.set_attribute("job_id", job_id)
         
-        job_data = job_tracker.get_job(job_id)
+        if wait is None or since is None:
+            job_data = await job_tracker.get_job(job_id)
+        else:
+            job_data = await _wait_for_job_change(job_id, since, min(wait, settings.job_status_max_wait_seconds))
         if not job_data:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        timeline = job_tracker.get_timeline(job_id)
+        timeline = await job_tracker.get_timeline(job_id)
+        
+        return _job_status_response(job_data, timeline)
+
+
+async def _wait_for_job_change(job_id: str, since: int, timeout: float) -> Optional[Dict[str, Any]]:
+    """Return the job once its version passes ``since``, it is final, or the timeout elapses."""
+    deadline = time.monotonic() + timeout
+    async with job_event_hub.subscribe(job_id) as queue:
+        # Subscribed before reading, so a change in between still wakes us
+        while True:
+            job_data = await job_tracker.get_job(job_id)
+            if (
+                not job_data
+                or job_data.get("version", 0) > since
+                or job_data["status"] in TERMINAL_STATUSES
+            ):
+                return job_data
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return job_data
+            try:
+                await asyncio.wait_for(queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return job_data
+
+
+def _job_status_response(job_data: Dict[str, Any], timeline: List[TimelineEvent]) -> JobStatusResponse:
+    """Build the API view of a job record."""
+    return JobStatusResponse(
+        job_id=job_data["job_id"],
+        cv_id=job_data["cv_id"],
+        status=JobStatus(job_data["status"]),
+        created_at=datetime.fromisoformat(job_data["created_at"]),
+        updated_at=datetime.fromisoformat(job_data["updated_at"]),
+        timeline=timeline,
+        error=job_data.get("error"),
+        version=job_data.get("version", 0),
+    )
+
+
+@app.post(f"{settings.api_prefix}/jobs/status", response_model=JobStatusBulkResponse)
+async def get_job_statuses(request: JobStatusBulkRequest):
+    """
+    Get the status of several jobs at once.
+    
+    All jobs (and, optionally, the latest part of their timelines) are read
+    in a single Redis round trip.
+    """
+    with tracer.start_as_current_span("get_job_statuses") as span:
+        job_ids = list(dict.fromkeys(request.job_ids))
+        span.set_attribute("job_count", len(job_ids))
+        if len(job_ids) > settings.bulk_status_max_jobs:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many job IDs. Max: {settings.bulk_status_max_jobs}",
+            )
+        
+        timeline_limit = request.timeline_limit if request.include_timeline else 0
+        jobs = await job_tracker.get_jobs(job_ids, timeline_limit=timeline_limit)
+        
+        return JobStatusBulkResponse(
+            jobs=[_job_status_response(*jobs[job_id]) for job_id in job_ids if job_id in jobs],
+            not_found=[job_id for job_id in job_ids if job_id not in jobs],
+        )
+
+
+def _sse_event(event: Dict[str, Any]) -> str:
+    """Frame a timeline event for an event stream, keyed by its sequence number."""
+    return f"id: {event.get('seq', 0)}\ndata: {json.dumps(event)}\n\n"
+
+
+async def _job_event_stream(request: Request, job_id: str, last_event_id: int, terminal: bool) -> AsyncIterator[str]:
+    """
+    Yield a job's timeline events as server-sent events.
+    
+    The channel is subscribed before the timeline is read, so nothing
+    published in between is missed; sequence numbers drop duplicates and
+    reveal gaps, which are filled from the timeline.
+    """
+    async with job_event_hub.subscribe(job_id) as queue:
+        yield "retry: 3000\n\n"
+        last_sent = last_event_id
+        done = terminal
+        pending = await job_tracker.get_events_since(job_id, last_sent)
+        
+        while True:
+            for event in pending:
+                seq = event.get("seq", 0)
+                if seq and seq <= last_sent:
+                    continue
+                last_sent = max(last_sent, seq)
+                done = done or event.get("status") in TERMINAL_STATUSES
+                yield _sse_event(event)
+            if done or await request.is_disconnected():
+                return
+            
+            try:
+                data = await asyncio.wait_for(queue.get(), timeout=settings.sse_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                pending = []
+                yield ": heartbeat\n\n"
+                continue
+            
+            event = decode_event(data) if data is not None else None
+            if event is None or event.get("seq", 0) > last_sent + 1:
+                # Lagged, reconnected or skipped ahead: re-read from the timeline
+                pending = await job_tracker.get_events_since(job_id, last_sent)
+            else:
+                pending = [event]
+
+
+@app.get(f"{settings.api_prefix}/jobs/{{job_id}}/events")
+async def stream_job_events(job_id: str, request: Request, last_event_id: Optional[int] = Query(None, ge=0)):
+    """
+    Stream a job's timeline as server-sent events.
+    
+    Each event's ``id`` is its sequence number; reconnecting clients resume
+    after the ``Last-Event-ID`` they send (or ``last_event_id``). The stream
+    ends once the job completes or fails.
+    """
+    job_data = await job_tracker.get_job(job_id)
+    if not job_data:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    header = request.headers.get("last-event-id")
+    if last_event_id is None:
+        last_event_id = int(header) if header and header.isdigit() else 0
+    
+    return StreamingResponse(
+        _job_event_stream(request, job_id, last_event_id, job_data["status"] in TERMINAL_STATUSES),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get(f"{settings.api_prefix}/jobs", response_model=JobListResponse)
+async def list_jobs(
+    cv_id: Optional[str] = None,
+    status: Optional[JobStatus] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+):
+    """
+    List jobs newest first, filtered by CV, status and creation time.
+    
+    Served from the job tracker's sorted-set indexes; pass ``next_cursor``
+    back as ``cursor`` (with the same filters) for the next page.
+    """
+    with tracer.start_as_current_span("list_jobs") as span:
+        span.set_attribute("limit", limit)
+        try:
+            jobs, next_cursor = await job_tracker.list_jobs(
+                cv_id=cv_id,
+                status=status.value if status else None,
+                created_after=created_after,
+                created_before=created_before,
+                cursor=cursor,
+                limit=limit,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        return JobStatusResponse(
-            job_id=job_data["job_id"],
-            cv_id=job_data["cv_id"],
-            status=JobStatus(job_data["status"]),
-            created_at=datetime.fromisoformat(job_data["created_at"]),
-            updated_at=datetime.fromisoformat(job_data["updated_at"]),
-            timeline=timeline,
-            error=job_data.get("error"),
+        return JobListResponse(
+            jobs=[_job_status_response(job_data, []) for job_data in jobs],
+            next_cursor=next_cursor,
         )
 
 
 @app.get(f"{settings.api_prefix}/cv/{{cv_id}}/report", response_model=AnalysisReport)
-async def get_report(cv_id: str):
-    """Get final analysis report."""
+async def get_report(cv_id: str, job_id: Optional[str] = None):
+    """
+    Get the CV's latest analysis report, or the report of one of its jobs.
+    
+    Served from the Redis report cache when possible, otherwise from
+    PostgreSQL; the cached JSON is returned as-is.
+    """
     with tracer.start_as_current_span("get_report") as span:
         span.set_attribute("cv_id", cv_id)
         
-        # TODO: Fetch report from database/storage
-        # For now, return 404
-        raise HTTPException(status_code=404, detail="Report not found")
+        try:
+            report_json = await report_store.get_report_json(cv_id, job_id)
+        except (SQLAlchemyError, OSError) as e:
+            # asyncpg raises connection errors (refused, reset) unwrapped
+            logger.error("report_fetch_failed", cv_id=cv_id, error=str(e))
+            raise HTTPException(status_code=503, detail="Report store unavailable")
+        if report_json is None:
+            raise HTTPException(status_code=404, detail="Report not found")
+        
+        return Response(content=report_json, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,73 @@
+"""Per-client rate limiting for API endpoints."""
+import time
+from typing import Callable
+import redis
+from fastapi import HTTPException, Request
+from starlette.responses import Response
+from cv_analyzer.core.config import settings
+from cv_analyzer.core.logging import get_logger
+from cv_analyzer.core.metrics import rate_limit_rejections_total, rate_limit_check_duration_seconds
+from cv_analyzer.services.rate_limiter import rate_limiter, RateLimitPolicy
+
+logger = get_logger(__name__)
+
+
+def _rate_limit_client(request: Request) -> str:
+    """
+    Rate limit key for a request: the client IP.
+    
+    Client-supplied headers such as ``X-API-Key`` are not authenticated, so
+    keying on them would let a client reset its limit by changing the value.
+    Behind a proxy, run uvicorn with ``--proxy-headers`` so the IP is the
+    caller's rather than the proxy's.
+    """
+    return "ip:" + (request.client.host if request.client else "unknown")
+
+
+def rate_limited(name: str) -> Callable:
+    """
+    Dependency enforcing the ``rate_limit_policies`` entry ``name`` per client.
+    
+    Responses carry ``RateLimit-Limit``, ``RateLimit-Remaining``,
+    ``RateLimit-Reset`` and ``RateLimit-Policy``; requests over the limit get
+    429 with ``Retry-After``. Requests are let through if Redis is unavailable.
+    
+    Usage: ``@app.post(..., dependencies=[Depends(rate_limited("analyze"))])``
+    
+    Raises:
+        ValueError: The policy is malformed (when the app is imported, not per request)
+    """
+    value = settings.rate_limit_policies.get(name)
+    policy = RateLimitPolicy.parse(value) if value else None
+    policy_header = f"{policy.limit};w={policy.window_seconds}" if policy else ""
+    
+    async def check(request: Request, response: Response):
+        if policy is None or not settings.rate_limit_enabled:
+            return
+        
+        start = time.perf_counter()
+        try:
+            result = await rate_limiter.hit(name, _rate_limit_client(request), policy)
+        except redis.RedisError as e:
+            logger.warning("rate_limit_unavailable", policy=name, error=str(e))
+            return
+        finally:
+            rate_limit_check_duration_seconds.observe(time.perf_counter() - start)
+        
+        headers = {
+            "RateLimit-Limit": str(result.limit),
+            "RateLimit-Remaining": str(result.remaining),
+            "RateLimit-Reset": str(result.reset_seconds),
+            "RateLimit-Policy": policy_header,
+        }
+        if not result.allowed:
+            rate_limit_rejections_total.labels(policy=name).inc()
+            logger.warning("rate_limit_exceeded", policy=name, retry_after=result.retry_after_seconds)
+            raise HTTPException(
+                status_code=429,
+                detail="Rate limit exceeded",
+                headers={**headers, "Retry-After": str(result.retry_after_seconds)},
+            )
+        response.headers.update(headers)
+    
+    return check
@@ -0,0 +1,373 @@
+"""Direct (presigned) and resumable upload endpoints."""
+import uuid
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+from fastapi import APIRouter, HTTPException, Depends, Request, Query
+from minio.error import S3Error
+from opentelemetry import trace
+from cv_analyzer.api.common import validate_file_type
+from cv_analyzer.api.rate_limit import rate_limited
+from cv_analyzer.core.config import settings
+from cv_analyzer.core.logging import get_logger
+from cv_analyzer.core.metrics import cv_uploads_total, cv_upload_size_bytes, cv_upload_chunks_total
+from cv_analyzer.models.schemas import (
+    CVUploadResponse,
+    UploadURLRequest,
+    UploadURLResponse,
+    UploadCompleteRequest,
+    ResumableUploadRequest,
+    ResumableUploadStatus,
+)
+from cv_analyzer.services.storage import storage_service, MIN_PART_SIZE
+from cv_analyzer.services.cv_registry import cv_registry, BlobDeletingError
+from cv_analyzer.services.upload_sessions import upload_sessions
+
+logger = get_logger(__name__)
+tracer = trace.get_tracer(__name__)
+
+router = APIRouter()
+
+
+@router.post(
+    f"{settings.api_prefix}/cv/upload-url",
+    response_model=UploadURLResponse,
+    dependencies=[Depends(rate_limited("upload"))],
+)
+async def create_upload_url(request: UploadURLRequest):
+    """
+    Start a direct upload to object storage.
+    
+    Returns a presigned POST form; the file goes straight to MinIO and is
+    registered by calling the completion endpoint afterwards.
+    """
+    with tracer.start_as_current_span("create_upload_url") as span:
+        span.set_attribute("filename", request.filename)
+        validate_file_type(request.filename)
+        
+        upload_id = str(uuid.uuid4())
+        object_name = f"uploads/{upload_id}"
+        max_size_bytes = settings.max_file_size_mb * 1024 * 1024
+        expires_seconds = settings.presigned_upload_expiry_seconds
+        
+        form = await storage_service.to_thread(
+            storage_service.presigned_upload,
+            object_name,
+            request.content_type,
+            max_size_bytes,
+            expires_seconds=expires_seconds,
+        )
+        await upload_sessions.create(
+            upload_id=upload_id,
+            filename=request.filename,
+            content_type=request.content_type,
+            object_name=object_name,
+            max_size=max_size_bytes,
+            expires_seconds=expires_seconds,
+        )
+        
+        span.set_attribute("upload_id", upload_id)
+        return UploadURLResponse(
+            upload_id=upload_id,
+            url=form["url"],
+            fields=form["fields"],
+            max_size_bytes=max_size_bytes,
+            expires_at=form["expires_at"],
+        )
+
+
+async def _reject_upload(upload_id: str, object_name: str, detail: str):
+    """Discard a staged upload that failed verification."""
+    await storage_service.to_thread(storage_service.delete_file, upload_id, object_name=object_name)
+    await upload_sessions.delete(upload_id)
+    cv_uploads_total.labels(status="rejected").inc()
+    logger.warning("direct_upload_rejected", upload_id=upload_id, reason=detail)
+    raise HTTPException(status_code=400, detail=detail)
+
+
+async def _complete_staged_upload(
+    upload_id: str,
+    session: Dict[str, Any],
+    expected_sha256: Optional[str] = None,
+) -> CVUploadResponse:
+    """
+    Verify a staged object against its upload session and register it as a CV.
+    
+    The object is checked by ``stat`` (size, content type), hashed by
+    streaming it back from MinIO and promoted to its content-addressed key.
+    The upload ID becomes the CV ID.
+    """
+    object_name = session["object_name"]
+    stat = await storage_service.to_thread(storage_service.stat_file, upload_id, object_name=object_name)
+    if not stat:
+        raise HTTPException(status_code=409, detail="File has not been uploaded yet")
+    if not await upload_sessions.claim(upload_id):
+        raise HTTPException(status_code=409, detail="Upload is already being completed or has expired")
+    
+    if stat["size_bytes"] > session["max_size"]:
+        await _reject_upload(upload_id, object_name, f"File too large. Max size: {settings.max_file_size_mb}MB")
+    if stat["content_type"] != session["content_type"]:
+        await _reject_upload(upload_id, object_name, "Content type does not match upload request")
+    
+    try:
+        sha256 = await storage_service.to_thread(storage_service.hash_object, object_name)
+        if expected_sha256 and expected_sha256.lower() != sha256:
+            await _reject_upload(upload_id, object_name, "Checksum mismatch")
+    except S3Error:
+        await upload_sessions.unclaim(upload_id)
+        raise
+    
+    # Reference the blob before checking whether it exists, so retention
+    # cannot delete an identical blob between the check and the reference
+    uploaded_at = datetime.utcnow()
+    while True:
+        try:
+            await cv_registry.register(
+                cv_id=upload_id,
+                filename=session["filename"],
+                content_type=session["content_type"],
+                size_bytes=stat["size_bytes"],
+                object_name=storage_service.blob_object_name(sha256),
+                sha256=sha256,
+                uploaded_at=uploaded_at,
+            )
+            break
+        except BlobDeletingError:
+            await cv_registry.wait_for_blob_deletion(sha256)
+    try:
+        deduplicated = await storage_service.to_thread(storage_service.promote_staged, object_name, sha256)
+    except S3Error:
+        await cv_registry.release(upload_id)
+        await upload_sessions.unclaim(upload_id)
+        raise
+    await upload_sessions.delete(upload_id)
+    
+    cv_uploads_total.labels(status="success").inc()
+    cv_upload_size_bytes.observe(stat["size_bytes"])
+    logger.info(
+        "cv_uploaded",
+        cv_id=upload_id,
+        filename=session["filename"],
+        size=stat["size_bytes"],
+        deduplicated=deduplicated,
+    )
+    
+    return CVUploadResponse(
+        cv_id=upload_id,
+        filename=session["filename"],
+        size_bytes=stat["size_bytes"],
+        sha256=sha256,
+        deduplicated=deduplicated,
+        uploaded_at=uploaded_at,
+    )
+
+
+def _missing_offsets(session: Dict[str, Any], parts: Dict[int, str]) -> List[int]:
+    """Offsets of chunks of a resumable upload not received yet."""
+    chunk_size = session["chunk_size"]
+    part_count = -(-session["size_bytes"] // chunk_size)
+    return [
+        (number - 1) * chunk_size
+        for number in range(1, part_count + 1)
+        if number not in parts
+    ]
+
+
+async def _resumable_status(upload_id: str, session: Dict[str, Any]) -> ResumableUploadStatus:
+    """Build the progress report of a resumable upload."""
+    missing = _missing_offsets(session, await upload_sessions.get_parts(upload_id))
+    missing_bytes = sum(min(session["chunk_size"], session["size_bytes"] - offset) for offset in missing)
+    return ResumableUploadStatus(
+        upload_id=upload_id,
+        size_bytes=session["size_bytes"],
+        chunk_size_bytes=session["chunk_size"],
+        received_bytes=session["size_bytes"] - missing_bytes,
+        missing_offsets=missing,
+    )
+
+
+async def _get_resumable_session(upload_id: str) -> Dict[str, Any]:
+    """Get a resumable upload session that is still accepting chunks."""
+    session = await upload_sessions.get(upload_id)
+    if not session or "multipart_upload_id" not in session:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    if "completing" in session:
+        raise HTTPException(status_code=409, detail="Upload is already being completed")
+    return session
+
+
+async def _assemble_chunks(upload_id: str, session: Dict[str, Any]):
+    """
+    Complete the MinIO multipart upload behind a resumable session.
+    
+    Afterwards the session is an ordinary staged upload and goes through
+    the same verification as a presigned upload.
+    """
+    parts = await upload_sessions.get_parts(upload_id)
+    missing = _missing_offsets(session, parts)
+    if missing:
+        raise HTTPException(status_code=409, detail=f"Missing chunks at offsets: {missing}")
+    if not await upload_sessions.claim(upload_id):
+        raise HTTPException(status_code=409, detail="Upload is already being completed or has expired")
+    try:
+        await storage_service.to_thread(
+            storage_service.complete_multipart_upload,
+            session["object_name"],
+            session["multipart_upload_id"],
+            parts,
+        )
+        await upload_sessions.forget_multipart(upload_id)
+    finally:
+        await upload_sessions.unclaim(upload_id)
+
+
+@router.post(
+    f"{settings.api_prefix}/cv/uploads",
+    response_model=ResumableUploadStatus,
+    dependencies=[Depends(rate_limited("upload"))],
+)
+async def create_resumable_upload(request: ResumableUploadRequest):
+    """
+    Start a resumable upload.
+    
+    Chunks are sent with ``PUT /cv/uploads/{upload_id}/chunks?offset=N`` in
+    any order and can be retried individually; finish with the completion
+    endpoint.
+    """
+    with tracer.start_as_current_span("create_resumable_upload") as span:
+        span.set_attribute("filename", request.filename)
+        validate_file_type(request.filename)
+        
+        max_size_bytes = settings.max_file_size_mb * 1024 * 1024
+        if request.size_bytes > max_size_bytes:
+            cv_uploads_total.labels(status="rejected").inc()
+            raise HTTPException(
+                status_code=400,
+                detail=f"File too large. Max size: {settings.max_file_size_mb}MB",
+            )
+        
+        upload_id = str(uuid.uuid4())
+        object_name = f"uploads/{upload_id}"
+        multipart_upload_id = await storage_service.to_thread(
+            storage_service.create_multipart_upload, object_name, request.content_type
+        )
+        session = await upload_sessions.create(
+            upload_id=upload_id,
+            filename=request.filename,
+            content_type=request.content_type,
+            object_name=object_name,
+            max_size=max_size_bytes,
+            expires_seconds=settings.resumable_upload_ttl_seconds,
+            size_bytes=request.size_bytes,
+            chunk_size=max(settings.resumable_chunk_size_mb * 1024 * 1024, MIN_PART_SIZE),
+            multipart_upload_id=multipart_upload_id,
+        )
+        
+        span.set_attribute("upload_id", upload_id)
+        return ResumableUploadStatus(
+            upload_id=upload_id,
+            size_bytes=session["size_bytes"],
+            chunk_size_bytes=session["chunk_size"],
+            received_bytes=0,
+            missing_offsets=_missing_offsets(session, {}),
+        )
+
+
+@router.put(f"{settings.api_prefix}/cv/uploads/{{upload_id}}/chunks", response_model=ResumableUploadStatus)
+async def upload_chunk(upload_id: str, request: Request, offset: int = Query(..., ge=0)):
+    """
+    Upload one chunk of a resumable upload.
+    
+    The offset must be a multiple of the session's chunk size and the body
+    exactly one chunk long (the last chunk holds the remainder).
+    """
+    with tracer.start_as_current_span("upload_chunk") as span:
+        span.set_attribute("upload_id", upload_id)
+        span.set_attribute("offset", offset)
+        
+        session = await _get_resumable_session(upload_id)
+        chunk_size = session["chunk_size"]
+        if offset % chunk_size or offset >= session["size_bytes"]:
+            cv_upload_chunks_total.labels(status="rejected").inc()
+            raise HTTPException(
+                status_code=400,
+                detail=f"Offset must be a multiple of {chunk_size} below {session['size_bytes']}",
+            )
+        
+        expected_size = min(chunk_size, session["size_bytes"] - offset)
+        max_size = min(expected_size, settings.max_file_size_mb * 1024 * 1024)
+        too_large = HTTPException(status_code=413, detail=f"Chunk at offset {offset} must be {expected_size} bytes")
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit():
+            if int(content_length) > max_size:
+                cv_upload_chunks_total.labels(status="rejected").inc()
+                raise too_large
+            if int(content_length) != expected_size:
+                cv_upload_chunks_total.labels(status="rejected").inc()
+                raise HTTPException(status_code=400, detail=f"Chunk at offset {offset} must be {expected_size} bytes")
+        
+        # Read incrementally so a body without Content-Length is cut off at the limit
+        body = bytearray()
+        async for piece in request.stream():
+            body.extend(piece)
+            if len(body) > max_size:
+                cv_upload_chunks_total.labels(status="rejected").inc()
+                raise too_large
+        data = bytes(body)
+        if len(data) != expected_size:
+            cv_upload_chunks_total.labels(status="rejected").inc()
+            raise HTTPException(status_code=400, detail=f"Chunk at offset {offset} must be {expected_size} bytes")
+        
+        part_number = offset // chunk_size + 1
+        etag = await storage_service.to_thread(
+            storage_service.upload_part,
+            session["object_name"],
+            session["multipart_upload_id"],
+            part_number,
+            data,
+        )
+        await upload_sessions.record_part(upload_id, part_number, etag, settings.resumable_upload_ttl_seconds)
+        cv_upload_chunks_total.labels(status="accepted").inc()
+        
+        return await _resumable_status(upload_id, session)
+
+
+@router.get(f"{settings.api_prefix}/cv/uploads/{{upload_id}}", response_model=ResumableUploadStatus)
+async def get_resumable_upload(upload_id: str):
+    """Get resumable upload progress, e.g. to find where to resume."""
+    session = await _get_resumable_session(upload_id)
+    return await _resumable_status(upload_id, session)
+
+
+@router.delete(f"{settings.api_prefix}/cv/uploads/{{upload_id}}")
+async def abort_resumable_upload(upload_id: str):
+    """Abort a resumable upload and discard the chunks received."""
+    session = await _get_resumable_session(upload_id)
+    await storage_service.to_thread(
+        storage_service.abort_multipart_upload, session["object_name"], session["multipart_upload_id"]
+    )
+    await upload_sessions.delete(upload_id)
+    logger.info("resumable_upload_aborted", upload_id=upload_id)
+    return {"upload_id": upload_id, "status": "aborted"}
+
+
+@router.post(f"{settings.api_prefix}/cv/uploads/{{upload_id}}/complete", response_model=CVUploadResponse)
+async def complete_upload(upload_id: str, request: UploadCompleteRequest):
+    """
+    Finish a direct upload.
+    
+    Verifies the uploaded object and returns the registered CV.
+    """
+    with tracer.start_as_current_span("complete_upload") as span:
+        span.set_attribute("upload_id", upload_id)
+        
+        session = await upload_sessions.get(upload_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Upload session not found")
+        
+        if "multipart_upload_id" in session:
+            await _assemble_chunks(upload_id, session)
+        
+        response = await _complete_staged_upload(upload_id, session, request.sha256)
+        span.set_attribute("cv_id", response.cv_id)
+        span.set_attribute("file_size", response.size_bytes)
+        return response
@@ -22,12 +22,18 @@ class Settings(BaseSettings):
     minio_secret_key: str = "minioadmin"
     minio_bucket: str = "cv-analyzer"
     minio_secure: bool = False
+    minio_public_endpoint: Optional[str] = None  # Host clients use for presigned uploads
+    minio_max_workers: int = 16  # Threads for blocking MinIO calls from the API
     
     # Redis
     redis_host: str = "redis"
     redis_port: int = 6379
     redis_db: int = 0
     redis_queue_name: str = "cv_analysis_queue"
+    redis_wire_format: str = "msgpack"  # "json" keeps writing the old format until every reader is upgraded
+    queue_drain_window_seconds: int = 300  # Dequeues counted for the drain rate used by admission control
+    redis_max_connections: int = 50  # Per API process, per pool (text and binary)
+    redis_pool_timeout_seconds: float = 5.0  # Wait for a free connection before failing
     
     # PostgreSQL
     postgres_host: str = "postgres"
@@ -35,10 +41,55 @@ class Settings(BaseSettings):
     postgres_user: str = "cvanalyzer"
     postgres_password: str = "cvanalyzer"
     postgres_db: str = "cvanalyzer"
+    database_pool_size: int = 10  # Connections kept open per process
+    database_max_overflow: int = 5  # Extra connections allowed under load
+    database_pool_timeout_seconds: float = 5.0  # Wait for a free connection before failing
+    database_pool_recycle_seconds: int = 1800
+    database_query_cache_size: int = 500  # SQLAlchemy compiled SQL cache, per engine
+    database_prepared_statement_cache_size: int = 256  # asyncpg prepared statements per connection; 0 behind PgBouncer (transaction mode)
+    
+    # Reports
+    report_cache_ttl_seconds: int = 300  # Redis copy of each fetched report
     
     # File upload
     max_file_size_mb: int = 10
     allowed_file_types: list[str] = [".pdf", ".docx", ".txt"]
+    upload_part_size_mb: int = 5  # Bytes buffered per upload (MinIO minimum is 5)
+    presigned_upload_expiry_seconds: int = 900
+    resumable_chunk_size_mb: int = 5  # Chunk offsets must be multiples of this (MinIO minimum is 5)
+    resumable_upload_ttl_seconds: int = 86400  # Idle time before a resumable session expires
+    bulk_upload_max_files: int = 500  # Files per bulk request, counting zip members
+    bulk_upload_concurrency: int = 8  # Files stored in parallel per bulk request
+    
+    # Retention
+    cv_retention_days: int = 30
+    staged_upload_retention_hours: int = 24  # Abandoned uploads and unreferenced blobs
+    retention_derived_prefixes: list[str] = ["reports/", "derived/"]  # {prefix}{cv_id}/... removed with the CV
+    retention_batch_size: int = 500  # Objects per DeleteObjects request (S3 maximum is 1000)
+    retention_max_deletes_per_second: float = 200.0
+    
+    # Job status
+    bulk_status_max_jobs: int = 500
+    bulk_analyze_max_jobs: int = 10000  # CVs x providers x prompt versions per bulk analyze request
+    bulk_analyze_chunk_size: int = 500  # Jobs written per Redis transaction
+    job_status_max_wait_seconds: float = 60.0  # Longest long-poll via ?wait=
+    sse_heartbeat_seconds: float = 15.0  # Comment line sent on idle event streams
+    
+    # Admission control (per priority class: high, normal, low)
+    admission_control_enabled: bool = True
+    admission_min_queue_depth: int = 100  # Always admit below this; a short queue's drain rate only reflects arrivals
+    admission_max_queue_depth: dict[str, int] = {"high": 50000, "normal": 20000, "low": 10000}
+    admission_max_wait_seconds: dict[str, float] = {"high": 3600.0, "normal": 1800.0, "low": 600.0}  # Estimated wait of a batch's last job
+    admission_retry_after_seconds: int = 60  # Retry-After for depth rejections while no drain rate is known
+    
+    # Rate limiting (per client IP)
+    rate_limit_enabled: bool = True
+    rate_limit_policies: dict[str, str] = {  # "limit/period" (second, minute, hour, day or seconds); omit to disable
+        "upload": "60/minute",
+        "upload_bulk": "10/minute",
+        "analyze": "60/minute",
+        "analyze_bulk": "10/minute",
+    }
     
     # AI Providers
     openai_api_key: Optional[str] = None
@@ -0,0 +1,137 @@
+"""Async PostgreSQL access with a bounded, instrumented connection pool."""
+# Shared by the backend and worker images: keep both copies identical
+# (``scripts/check_shared_modules.py``, run by ``make lint``).
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from sqlalchemy import MetaData
+from sqlalchemy.engine import URL
+from sqlalchemy.exc import IntegrityError, ProgrammingError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from cv_analyzer.core.config import settings
+from cv_analyzer.core.logging import get_logger
+from cv_analyzer.core.metrics import (
+    db_pool_connections,
+    db_pool_saturation,
+    db_pool_checkout_duration_seconds,
+    db_pool_timeouts_total,
+)
+
+logger = get_logger(__name__)
+
+
+def database_url() -> URL:
+    """asyncpg URL for the configured database, with its prepared statement cache size."""
+    return URL.create(
+        "postgresql+asyncpg",
+        username=settings.postgres_user,
+        password=settings.postgres_password,
+        host=settings.postgres_host,
+        port=settings.postgres_port,
+        database=settings.postgres_db,
+        query={"prepared_statement_cache_size": str(settings.database_prepared_statement_cache_size)},
+    )
+
+
+class Database:
+    """
+    Process-wide async engine over a bounded asyncpg pool.
+    
+    The engine is created on first use, so importing services does not need
+    a running event loop or database. Connections are pinged on checkout,
+    compiled SQL is cached by SQLAlchemy and prepared statements by asyncpg
+    per connection (``database_query_cache_size`` and
+    ``database_prepared_statement_cache_size``). Pool occupancy, saturation
+    (checked out / maximum), checkout wait and checkout timeouts are exported
+    as metrics.
+    
+    Behind PgBouncer in transaction mode, consecutive statements can run on
+    different server connections, so prepared statements must be off: set
+    ``database_prepared_statement_cache_size`` to 0, which also sets
+    asyncpg's own ``statement_cache_size`` to 0.
+    """
+    
+    def __init__(self):
+        self._engine: Optional[AsyncEngine] = None
+        self._max_connections = settings.database_pool_size + settings.database_max_overflow
+        self._schemas_ready = set()
+    
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            self._engine = create_async_engine(
+                database_url(),
+                pool_size=settings.database_pool_size,
+                max_overflow=settings.database_max_overflow,
+                pool_timeout=settings.database_pool_timeout_seconds,
+                pool_recycle=settings.database_pool_recycle_seconds,
+                pool_pre_ping=True,
+                query_cache_size=settings.database_query_cache_size,
+                connect_args={} if settings.database_prepared_statement_cache_size else {"statement_cache_size": 0},
+            )
+            # Read from the pool at scrape time
+            pool = self._engine.sync_engine.pool
+            db_pool_connections.labels(state="checked_out").set_function(pool.checkedout)
+            db_pool_connections.labels(state="idle").set_function(pool.checkedin)
+            db_pool_connections.labels(state="overflow").set_function(lambda: max(pool.overflow(), 0))
+            db_pool_saturation.set_function(lambda: pool.checkedout() / self._max_connections)
+        return self._engine
+    
+    @asynccontextmanager
+    async def _checkout(self, begin: bool) -> AsyncIterator[AsyncConnection]:
+        start = time.perf_counter()
+        connection = self.engine.connect()
+        try:
+            await connection.start()
+        except PoolTimeoutError:
+            db_pool_timeouts_total.inc()
+            logger.error("db_pool_exhausted", max_connections=self._max_connections)
+            raise
+        db_pool_checkout_duration_seconds.observe(time.perf_counter() - start)
+        try:
+            if begin:
+                async with connection.begin():
+                    yield connection
+            else:
+                yield connection
+        finally:
+            await connection.close()
+    
+    def connection(self):
+        """
+        Borrow a pooled connection (autobegin; commit explicitly to write).
+        
+        Usage: ``async with database.connection() as conn: ...``
+        """
+        return self._checkout(begin=False)
+    
+    def transaction(self):
+        """Borrow a pooled connection inside a transaction committed on exit."""
+        return self._checkout(begin=True)
+    
+    async def ensure_schema(self, metadata: MetaData):
+        """
+        Create a module's tables if missing (once per process, at startup).
+        
+        Processes starting together can both find a table missing; the one
+        whose ``CREATE`` loses gets a duplicate-object error and checks again.
+        """
+        if id(metadata) in self._schemas_ready:
+            return
+        try:
+            async with self.transaction() as connection:
+                await connection.run_sync(metadata.create_all, checkfirst=True)
+        except (ProgrammingError, IntegrityError) as e:
+            logger.info("db_schema_create_raced", error=str(e))
+            async with self.transaction() as connection:
+                await connection.run_sync(metadata.create_all, checkfirst=True)
+        self._schemas_ready.add(id(metadata))
+    
+    async def close(self):
+        """Close all pooled connections."""
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+
+
+database = Database()
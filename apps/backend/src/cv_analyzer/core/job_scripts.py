@@ -0,0 +1,92 @@
+"""Redis scripts and key layout shared by the API and worker job trackers."""
+
+# Timeline events get the job's next version as "seq", are pushed
+# newest-first and published on the job's channel. The version lets
+# subscribers resume and detect gaps. Msgpack events (see core.codec) get the
+# array header and seq inserted after the version byte; JSON events get a
+# "seq" key spliced into the object.
+WITH_SEQ_LUA = """
+local function with_seq(seq, event)
+    if string.byte(event, 1) ~= 1 then
+        return '{"seq": ' .. seq .. ', ' .. string.sub(event, 2)
+    end
+    local packed
+    if seq < 128 then
+        packed = string.char(seq)
+    elseif seq < 65536 then
+        packed = string.char(0xcd, math.floor(seq / 256), seq % 256)
+    else
+        packed = string.char(
+            0xce, math.floor(seq / 16777216) % 256, math.floor(seq / 65536) % 256,
+            math.floor(seq / 256) % 256, seq % 256
+        )
+    end
+    return '\\1\\150' .. packed .. string.sub(event, 2)
+end
+"""
+
+# Jobs are indexed in sorted sets scored by creation time (epoch seconds):
+# all jobs, jobs per CV and jobs per status. Entries older than the job TTL
+# are trimmed whenever a job is created.
+STATUS_ORDER = ("pending", "processing", "completed", "failed")
+
+# Apply a status change and its timeline events in one atomic step, moving
+# the job between status indexes.
+# KEYS: job hash, timeline list, event channel, creation index, then the
+# status indexes in STATUS_ORDER
+# ARGV: new status, timestamp, TTL, error ('' for none), then zero or more
+# encoded timeline events, oldest first. Returns the updated job hash as a flat
+# field/value array.
+TRANSITION_SCRIPT = WITH_SEQ_LUA + """
+local allowed = {
+    pending = {processing = true, failed = true},
+    processing = {completed = true, failed = true},
+}
+local job = redis.call('HMGET', KEYS[1], 'status', 'job_id')
+local current, job_id = job[1], job[2]
+if not current then
+    return redis.error_reply('NOT_FOUND')
+end
+local next_states = allowed[current]
+if not next_states or not next_states[ARGV[1]] then
+    return redis.error_reply('INVALID_TRANSITION ' .. current .. ' -> ' .. ARGV[1])
+end
+redis.call('HSET', KEYS[1], 'status', ARGV[1], 'updated_at', ARGV[2])
+local created = redis.call('ZSCORE', KEYS[4], job_id)
+if created then
+    local status_index = {pending = KEYS[5], processing = KEYS[6], completed = KEYS[7], failed = KEYS[8]}
+    redis.call('ZREM', status_index[current], job_id)
+    redis.call('ZADD', status_index[ARGV[1]], created, job_id)
+end
+if ARGV[4] ~= '' then
+    redis.call('HSET', KEYS[1], 'error', ARGV[4])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+for i = 5, #ARGV do
+    local seq = redis.call('HINCRBY', KEYS[1], 'version', 1)
+    local event = with_seq(seq, ARGV[i])
+    redis.call('LPUSH', KEYS[2], event)
+    redis.call('PUBLISH', KEYS[3], event)
+end
+if #ARGV >= 5 then
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+end
+return redis.call('HGETALL', KEYS[1])
+"""
+
+# Append timeline events without a status change.
+# KEYS: job hash, timeline list, event channel
+# ARGV: TTL, then one or more encoded timeline events, oldest first.
+APPEND_EVENTS_SCRIPT = WITH_SEQ_LUA + """
+local exists = redis.call('EXISTS', KEYS[1]) == 1
+for i = 2, #ARGV do
+    local seq = 0
+    if exists then
+        seq = redis.call('HINCRBY', KEYS[1], 'version', 1)
+    end
+    local event = with_seq(seq, ARGV[i])
+    redis.call('LPUSH', KEYS[2], event)
+    redis.call('PUBLISH', KEYS[3], event)
+end
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+"""
@@ -28,6 +28,36 @@ cv_upload_size_bytes = Histogram(
     buckets=[1024, 10240, 102400, 1048576, 10485760],  # 1KB to 10MB
 )
 
+cv_upload_chunks_total = Counter(
+    "cv_upload_chunks_total",
+    "Resumable upload chunks received",
+    ["status"],
+)
+
+cv_bulk_upload_files = Histogram(
+    "cv_bulk_upload_files",
+    "Files per bulk upload request",
+    buckets=[1, 10, 50, 100, 250, 500],
+)
+
+# Retention metrics
+retention_objects_deleted_total = Counter(
+    "retention_objects_deleted_total",
+    "Objects deleted by the retention engine",
+    ["kind"],
+)
+
+retention_bytes_reclaimed_total = Counter(
+    "retention_bytes_reclaimed_total",
+    "Bytes reclaimed by the retention engine",
+    ["kind"],
+)
+
+retention_delete_failures_total = Counter(
+    "retention_delete_failures_total",
+    "Objects the retention engine failed to delete",
+)
+
 # Job metrics
 jobs_created_total = Counter(
     "jobs_created_total",
@@ -58,3 +88,66 @@ queue_dequeued_total = Counter(
     "Total items dequeued",
     ["queue_name"],
 )
+
+# Report metrics
+report_cache_requests_total = Counter(
+    "report_cache_requests_total",
+    "Report lookups by cache result",
+    ["result"],
+)
+
+report_fetch_duration_seconds = Histogram(
+    "report_fetch_duration_seconds",
+    "Time to fetch a report (cache or PostgreSQL)",
+    ["source"],
+    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1],
+)
+
+# Database pool metrics
+db_pool_connections = Gauge(
+    "db_pool_connections",
+    "PostgreSQL pool connections by state",
+    ["state"],
+)
+
+db_pool_saturation = Gauge(
+    "db_pool_saturation",
+    "Checked-out PostgreSQL connections as a fraction of the pool maximum",
+)
+
+db_pool_checkout_duration_seconds = Histogram(
+    "db_pool_checkout_duration_seconds",
+    "Time to obtain a PostgreSQL connection from the pool",
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0],
+)
+
+db_pool_timeouts_total = Counter(
+    "db_pool_timeouts_total",
+    "PostgreSQL connection requests that timed out waiting for the pool",
+)
+
+# Admission control metrics
+admission_rejections_total = Counter(
+    "admission_rejections_total",
+    "Analysis requests turned away by admission control",
+    ["priority", "reason"],
+)
+
+queue_drain_rate = Gauge(
+    "queue_drain_rate",
+    "Jobs dequeued per second by workers over the drain window",
+    ["queue_name"],
+)
+
+# Rate limiting metrics
+rate_limit_rejections_total = Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by per-client rate limits",
+    ["policy"],
+)
+
+rate_limit_check_duration_seconds = Histogram(
+    "rate_limit_check_duration_seconds",
+    "Time spent checking a request against its rate limit",
+    buckets=[0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01],
+)
@@ -0,0 +1,28 @@
+"""Shared async Redis clients for the API process."""
+import redis.asyncio as aioredis
+from cv_analyzer.core.config import settings
+
+
+def _connection_pool(decode_responses: bool) -> aioredis.BlockingConnectionPool:
+    """Bounded pool: requests wait for a free connection instead of opening more."""
+    return aioredis.BlockingConnectionPool(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        db=settings.redis_db,
+        max_connections=settings.redis_max_connections,
+        timeout=settings.redis_pool_timeout_seconds,
+        decode_responses=decode_responses,
+    )
+
+
+# Hashes, indexes and counters are read as text
+redis_client = aioredis.Redis(connection_pool=_connection_pool(decode_responses=True))
+
+# Queue messages and timeline entries are binary (see core.codec)
+binary_redis_client = aioredis.Redis(connection_pool=_connection_pool(decode_responses=False))
+
+
+async def close_redis():
+    """Close both shared pools."""
+    await redis_client.aclose(close_connection_pool=True)
+    await binary_redis_client.aclose(close_connection_pool=True)
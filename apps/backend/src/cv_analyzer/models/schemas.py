@@ -13,18 +13,82 @@ class JobStatus(str, Enum):
     FAILED = "failed"
 
 
+class JobPriority(str, Enum):
+    """Admission class of new analysis jobs."""
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
+
+
 class CVUploadResponse(BaseModel):
     """Response for CV upload."""
     cv_id: str = Field(..., description="Unique CV identifier")
     filename: str = Field(..., description="Original filename")
     size_bytes: int = Field(..., description="File size in bytes")
+    sha256: Optional[str] = Field(None, description="SHA-256 of the file content")
+    deduplicated: bool = Field(False, description="Content was already stored by a previous upload")
     uploaded_at: datetime = Field(..., description="Upload timestamp")
 
 
+class BulkUploadResult(BaseModel):
+    """Outcome of one file in a bulk upload."""
+    filename: str = Field(..., description="Original filename (path inside the archive for zip members)")
+    cv_id: Optional[str] = Field(None, description="CV identifier, if the file was stored")
+    size_bytes: Optional[int] = Field(None, description="File size in bytes")
+    sha256: Optional[str] = Field(None, description="SHA-256 of the file content")
+    deduplicated: bool = Field(False, description="Content was already stored by a previous upload")
+    job_id: Optional[str] = Field(None, description="Analysis job, if analysis was requested")
+    error: Optional[str] = Field(None, description="Why the file was rejected, or why its analysis was not queued")
+
+
+class BulkUploadResponse(BaseModel):
+    """Response for a bulk CV upload."""
+    results: List[BulkUploadResult] = Field(..., description="One entry per file, in upload order")
+    uploaded: int = Field(..., description="Files stored")
+    failed: int = Field(..., description="Files rejected")
+
+
+class UploadURLRequest(BaseModel):
+    """Request for a direct-to-storage upload form."""
+    filename: str = Field(..., description="Original filename")
+    content_type: str = Field("application/octet-stream", description="MIME type the file will be sent with")
+
+
+class UploadURLResponse(BaseModel):
+    """Presigned form for uploading a CV straight to object storage."""
+    upload_id: str = Field(..., description="Upload session identifier")
+    url: str = Field(..., description="URL to POST the multipart form to")
+    fields: Dict[str, str] = Field(..., description="Form fields to send before the file field")
+    max_size_bytes: int = Field(..., description="Maximum accepted file size")
+    expires_at: datetime = Field(..., description="Form expiration timestamp")
+
+
+class UploadCompleteRequest(BaseModel):
+    """Request to finish a direct upload."""
+    sha256: Optional[str] = Field(None, description="Client-computed SHA-256, verified if provided")
+
+
+class ResumableUploadRequest(BaseModel):
+    """Request to start a resumable upload."""
+    filename: str = Field(..., description="Original filename")
+    content_type: str = Field("application/octet-stream", description="MIME type of the file")
+    size_bytes: int = Field(..., gt=0, description="Total file size in bytes")
+
+
+class ResumableUploadStatus(BaseModel):
+    """Progress of a resumable upload."""
+    upload_id: str = Field(..., description="Upload session identifier")
+    size_bytes: int = Field(..., description="Total file size in bytes")
+    chunk_size_bytes: int = Field(..., description="Chunk size; offsets must be multiples of it")
+    received_bytes: int = Field(..., description="Bytes received so far")
+    missing_offsets: List[int] = Field(default_factory=list, description="Offsets of chunks still to send")
+
+
 class AnalyzeRequest(BaseModel):
     """Request to analyze a CV."""
     provider: Optional[str] = Field(None, description="AI provider to use (default: configured default)")
     prompt_version: Optional[str] = Field(None, description="Prompt template version")
+    priority: JobPriority = Field(JobPriority.NORMAL, description="Admission class; lower classes are turned away sooner when the queue is deep")
 
 
 class AnalyzeResponse(BaseModel):
@@ -33,6 +97,34 @@ class AnalyzeResponse(BaseModel):
     cv_id: str = Field(..., description="CV identifier")
     status: JobStatus = Field(..., description="Initial job status")
     created_at: datetime = Field(..., description="Job creation timestamp")
+    provider: Optional[str] = Field(None, description="AI provider the job will use")
+    prompt_version: Optional[str] = Field(None, description="Prompt template version")
+    estimated_wait_seconds: Optional[float] = Field(
+        None,
+        description="Estimated time until a worker starts the job (null: no recent worker throughput to estimate from)",
+    )
+
+
+class BulkAnalyzeRequest(BaseModel):
+    """Request to analyze several CVs, optionally with several providers and prompt versions."""
+    cv_ids: List[str] = Field(..., min_length=1, description="CV identifiers")
+    providers: List[Optional[str]] = Field(
+        default_factory=lambda: [None],
+        min_length=1,
+        description="AI providers; every CV is analyzed with each (null: configured default)",
+    )
+    prompt_versions: List[Optional[str]] = Field(
+        default_factory=lambda: [None],
+        min_length=1,
+        description="Prompt template versions; crossed with the providers",
+    )
+    priority: JobPriority = Field(JobPriority.LOW, description="Admission class for all of the request's jobs")
+
+
+class BulkAnalyzeResponse(BaseModel):
+    """Response for a bulk analysis trigger."""
+    jobs: List[AnalyzeResponse] = Field(default_factory=list, description="Jobs created, by CV then provider then prompt version")
+    not_found: List[str] = Field(default_factory=list, description="CV IDs that do not exist")
 
 
 class TimelineEvent(BaseModel):
@@ -52,6 +144,26 @@ class JobStatusResponse(BaseModel):
     updated_at: datetime = Field(..., description="Last update timestamp")
     timeline: List[TimelineEvent] = Field(default_factory=list, description="Job timeline")
     error: Optional[str] = Field(None, description="Error message if failed")
+    version: int = Field(0, description="Incremented on every status change and timeline event")
+
+
+class JobStatusBulkRequest(BaseModel):
+    """Request for the status of several jobs."""
+    job_ids: List[str] = Field(..., min_length=1, description="Job identifiers")
+    include_timeline: bool = Field(True, description="Include job timelines")
+    timeline_limit: Optional[int] = Field(None, ge=1, description="Most recent timeline events per job (default: all)")
+
+
+class JobStatusBulkResponse(BaseModel):
+    """Response for a bulk job status request."""
+    jobs: List[JobStatusResponse] = Field(default_factory=list, description="Jobs found, in request order")
+    not_found: List[str] = Field(default_factory=list, description="Job IDs that do not exist")
+
+
+class JobListResponse(BaseModel):
+    """A page of jobs, newest first."""
+    jobs: List[JobStatusResponse] = Field(default_factory=list, description="Jobs on this page (without timelines)")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if there may be one")
 
 
 class Score(BaseModel):
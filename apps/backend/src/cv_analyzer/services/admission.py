@@ -0,0 +1,110 @@
+"""Queue-depth-aware admission control for analysis jobs."""
+import math
+from typing import NamedTuple, Optional
+from cv_analyzer.core.config import settings
+from cv_analyzer.core.logging import get_logger
+from cv_analyzer.core.metrics import admission_rejections_total, queue_drain_rate
+from cv_analyzer.models.schemas import JobPriority
+from cv_analyzer.services.queue import queue_service
+
+logger = get_logger(__name__)
+
+
+class QueueEstimate(NamedTuple):
+    """Queue size and worker drain rate when jobs were admitted."""
+    size: int
+    drain_rate: float  # Jobs per second
+    
+    def wait_seconds(self, position: int = 0) -> Optional[float]:
+        """
+        Estimated time until a new job starts.
+        
+        Args:
+            position: Jobs of the same batch enqueued ahead of it
+        
+        Returns:
+            Seconds, or None while no drain rate is known
+        """
+        ahead = self.size + position
+        if ahead == 0:
+            return 0.0
+        if self.drain_rate <= 0:
+            return None
+        return round(ahead / self.drain_rate, 1)
+
+
+class QueueOverloadedError(Exception):
+    """Raised when new jobs would exceed their priority class's queue limits."""
+    
+    def __init__(self, priority: JobPriority, retry_after_seconds: int, estimated_wait_seconds: Optional[float]):
+        super().__init__(f"Analysis queue is over capacity for {priority.value} priority jobs")
+        self.priority = priority
+        self.retry_after_seconds = retry_after_seconds
+        self.estimated_wait_seconds = estimated_wait_seconds
+
+
+class AdmissionController:
+    """
+    Turns away analysis jobs that the workers could not start in time.
+    
+    Each priority class has a maximum queue size
+    (``admission_max_queue_depth``) and a maximum estimated wait for the
+    last job of a batch (``admission_max_wait_seconds``), estimated from the
+    queue size and the drain rate recorded by workers. Rejections carry the
+    time until the queue is back within the class's limits at the current
+    drain rate. Below ``admission_min_queue_depth`` every batch is admitted,
+    since a short queue's drain rate reflects arrivals rather than worker
+    capacity. The check is not atomic with the enqueue, so concurrent
+    requests can overshoot a limit by their own size.
+    """
+    
+    async def admit(self, job_count: int, priority: JobPriority) -> QueueEstimate:
+        """
+        Check whether a batch of new jobs may be enqueued.
+        
+        Args:
+            job_count: Jobs in the batch
+            priority: Admission class of the batch
+        
+        Returns:
+            The queue estimate the decision was based on
+        
+        Raises:
+            QueueOverloadedError: The batch would exceed the class's limits
+        """
+        estimate = QueueEstimate(*await queue_service.get_drain_stats())
+        queue_drain_rate.labels(queue_name=queue_service.queue_name).set(estimate.drain_rate)
+        
+        size_after = estimate.size + job_count
+        if not settings.admission_control_enabled or job_count == 0 or size_after <= settings.admission_min_queue_depth:
+            return estimate
+        
+        retry_after = 0.0
+        reason = None
+        excess = size_after - settings.admission_max_queue_depth[priority.value]
+        if excess > 0:
+            retry_after = excess / estimate.drain_rate if estimate.drain_rate > 0 else settings.admission_retry_after_seconds
+            reason = "queue_depth"
+        wait = estimate.wait_seconds(job_count - 1)
+        max_wait = settings.admission_max_wait_seconds[priority.value]
+        if wait is not None and wait > max_wait:
+            retry_after = max(retry_after, wait - max_wait)
+            reason = reason or "wait_time"
+        if reason is None:
+            return estimate
+        
+        retry_after_seconds = max(math.ceil(retry_after), 1)
+        admission_rejections_total.labels(priority=priority.value, reason=reason).inc()
+        logger.warning(
+            "admission_rejected",
+            priority=priority.value,
+            reason=reason,
+            jobs=job_count,
+            queue_size=estimate.size,
+            drain_rate=estimate.drain_rate,
+            retry_after=retry_after_seconds,
+        )
+        raise QueueOverloadedError(priority, retry_after_seconds, wait)
+
+
+admission_controller = AdmissionController()
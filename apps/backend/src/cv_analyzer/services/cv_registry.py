@@ -0,0 +1,307 @@
+"""CV metadata index."""
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List
+from cv_analyzer.core.config import settings
+from cv_analyzer.core.logging import get_logger
+from cv_analyzer.core.redis_pool import redis_client
+from cv_analyzer.services.storage import storage_service
+
+logger = get_logger(__name__)
+
+# Drop a CV reference and decrement its blob's reference count atomically.
+# Returns {sha256, remaining references, object name, size} or nil if the CV
+# is unknown.
+RELEASE_SCRIPT = """
+redis.call('ZREM', KEYS[2], ARGV[2])
+local record = redis.call('HMGET', KEYS[1], 'sha256', 'object_name', 'size_bytes')
+local sha256 = record[1]
+if not sha256 then
+    return nil
+end
+redis.call('DEL', KEYS[1])
+if sha256 == '' then
+    return {sha256, 0, record[2], record[3]}
+end
+local refs_key = ARGV[1] .. sha256
+local refs = redis.call('DECR', refs_key)
+if refs <= 0 then
+    redis.call('DEL', refs_key)
+    refs = 0
+end
+return {sha256, refs, record[2], record[3]}
+"""
+
+# Record a CV and take a reference on its blob, unless retention is deleting
+# the blob. KEYS: CV hash, expiry index, blob refs, blob deletion lock.
+# ARGV: CV ID, expiry score, then the record's field/value pairs.
+# Returns 1 if registered, 0 if the blob is being deleted.
+REGISTER_SCRIPT = """
+if redis.call('EXISTS', KEYS[4]) == 1 then
+    return 0
+end
+for i = 3, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+redis.call('INCR', KEYS[3])
+return 1
+"""
+
+# Lock blobs for deletion if nothing references them. ARGV: refs prefix,
+# lock prefix, lock TTL (ms), then the blob hashes. Returns the locked hashes.
+LOCK_UNREFERENCED_SCRIPT = """
+local locked = {}
+for i = 4, #ARGV do
+    if tonumber(redis.call('GET', ARGV[1] .. ARGV[i]) or '0') <= 0 then
+        redis.call('SET', ARGV[2] .. ARGV[i], 1, 'PX', ARGV[3])
+        table.insert(locked, ARGV[i])
+    end
+end
+return locked
+"""
+
+# Upper bound on one retention delete batch; the lock expires after it
+BLOB_DELETE_LOCK_SECONDS = 60
+
+# Legacy CVs looked up in object storage at once by ``get_many``, leaving
+# most of the storage thread pool to other requests
+LEGACY_LOOKUP_CONCURRENCY = 4
+
+
+class BlobDeletingError(Exception):
+    """Raised when registering a CV whose blob retention is about to delete."""
+
+    def __init__(self, sha256: str):
+        super().__init__(f"Blob {sha256} is being deleted")
+        self.sha256 = sha256
+
+
+class CVRegistry:
+    """
+    Index of uploaded CVs kept in Redis.
+
+    Records size, content type, original filename and content hash at upload
+    time so existence checks never touch the object store. CVs uploaded
+    before the index existed are resolved once via ``stat_object`` and
+    backfilled.
+
+    A ``cv_id`` is a lightweight reference to a content-addressed blob; the
+    number of CVs pointing at each blob is tracked under ``blob:refs:{sha256}``.
+
+    Every CV is also scored by its retention deadline in the ``cvs:expiry``
+    sorted set, so expired CVs are found without scanning.
+
+    Retention locks an unreferenced blob under ``blob:deleting:{sha256}``
+    before deleting it, checking the reference count in the same script.
+    Registering a CV against a locked blob is refused, so the caller waits
+    for the delete instead of pointing at a blob that is about to disappear.
+    Callers register before checking whether the blob exists, and upload it
+    again if it is gone.
+    """
+
+    def __init__(self):
+        self.redis_client = redis_client
+        self.cv_prefix = "cv:"
+        self.blob_refs_prefix = "blob:refs:"
+        self.blob_lock_prefix = "blob:deleting:"
+        self.expiry_key = "cvs:expiry"
+        self._release_script = self.redis_client.register_script(RELEASE_SCRIPT)
+        self._register_script = self.redis_client.register_script(REGISTER_SCRIPT)
+        self._lock_script = self.redis_client.register_script(LOCK_UNREFERENCED_SCRIPT)
+
+    async def register(
+        self,
+        cv_id: str,
+        filename: str,
+        content_type: str,
+        size_bytes: int,
+        object_name: str,
+        sha256: Optional[str] = None,
+        uploaded_at: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Record metadata for an uploaded CV.
+
+        Raises:
+            BlobDeletingError: Retention is deleting the CV's blob
+        """
+        uploaded_at = uploaded_at or datetime.utcnow()
+        expires_at = uploaded_at.replace(tzinfo=timezone.utc) + timedelta(days=settings.cv_retention_days)
+        record = {
+            "cv_id": cv_id,
+            "filename": filename,
+            "content_type": content_type,
+            "size_bytes": size_bytes,
+            "object_name": object_name,
+            "sha256": sha256 or "",
+            "uploaded_at": uploaded_at.isoformat(),
+        }
+        if sha256:
+            registered = await self._register_script(
+                keys=[
+                    f"{self.cv_prefix}{cv_id}",
+                    self.expiry_key,
+                    f"{self.blob_refs_prefix}{sha256}",
+                    f"{self.blob_lock_prefix}{sha256}",
+                ],
+                args=[cv_id, expires_at.timestamp(), *(item for pair in record.items() for item in pair)],
+            )
+            if not registered:
+                logger.warning("cv_register_blob_deleting", cv_id=cv_id, sha256=sha256)
+                raise BlobDeletingError(sha256)
+        else:
+            pipe = self.redis_client.pipeline()
+            pipe.hset(f"{self.cv_prefix}{cv_id}", mapping=record)
+            pipe.zadd(self.expiry_key, {cv_id: expires_at.timestamp()})
+            await pipe.execute()
+        logger.info("cv_registered", cv_id=cv_id, size=size_bytes, sha256=sha256)
+        return record
+
+    async def get(self, cv_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get CV metadata.
+
+        Args:
+            cv_id: CV identifier
+
+        Returns:
+            CV metadata or None if the CV does not exist
+        """
+        record = await self.redis_client.hgetall(f"{self.cv_prefix}{cv_id}")
+        if record:
+            record["size_bytes"] = int(record["size_bytes"])
+            return record
+        return await self._backfill(cv_id)
+
+    async def _backfill(self, cv_id: str) -> Optional[Dict[str, Any]]:
+        """Register a CV uploaded before the index existed from its stored object."""
+        stat = await storage_service.to_thread(storage_service.stat_file, cv_id)
+        if not stat:
+            return None
+        logger.info("cv_registry_backfilled", cv_id=cv_id)
+        return await self.register(
+            cv_id=cv_id,
+            filename=stat["filename"] or f"{cv_id}.pdf",
+            content_type=stat["content_type"] or "application/octet-stream",
+            size_bytes=stat["size_bytes"],
+            object_name=stat["object_name"],
+        )
+
+    async def get_many(self, cv_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get the metadata of several CVs in one round trip.
+
+        CVs without a record are looked up in object storage (legacy
+        uploads), ``LEGACY_LOOKUP_CONCURRENCY`` at a time.
+
+        Returns:
+            Metadata or None for each CV, in request order
+        """
+        pipe = self.redis_client.pipeline(transaction=False)
+        for cv_id in cv_ids:
+            pipe.hgetall(f"{self.cv_prefix}{cv_id}")
+        records = await pipe.execute()
+        missing = []
+        for i, record in enumerate(records):
+            if record:
+                record["size_bytes"] = int(record["size_bytes"])
+            else:
+                missing.append(i)
+        if missing:
+            semaphore = asyncio.Semaphore(LEGACY_LOOKUP_CONCURRENCY)
+
+            async def backfill(cv_id: str) -> Optional[Dict[str, Any]]:
+                async with semaphore:
+                    return await self._backfill(cv_id)
+
+            backfilled = await asyncio.gather(*(backfill(cv_ids[i]) for i in missing))
+            for i, record in zip(missing, backfilled):
+                records[i] = record
+        return records
+
+    async def get_blob_refs(self, sha256: str) -> int:
+        """Number of CVs referencing a blob."""
+        return int(await self.redis_client.get(f"{self.blob_refs_prefix}{sha256}") or 0)
+
+    async def get_blob_refs_many(self, sha256s: List[str]) -> List[int]:
+        """Reference counts of several blobs in one round trip."""
+        if not sha256s:
+            return []
+        values = await self.redis_client.mget([f"{self.blob_refs_prefix}{sha256}" for sha256 in sha256s])
+        return [int(value or 0) for value in values]
+
+    async def lock_unreferenced_blobs(self, sha256s: List[str]) -> List[str]:
+        """
+        Lock blobs for deletion, skipping any that are referenced again.
+
+        Locks expire after ``BLOB_DELETE_LOCK_SECONDS``; call
+        ``unlock_blobs`` once the delete is done.
+
+        Returns:
+            Hashes of the blobs that were locked and may be deleted
+        """
+        if not sha256s:
+            return []
+        return await self._lock_script(
+            args=[self.blob_refs_prefix, self.blob_lock_prefix, BLOB_DELETE_LOCK_SECONDS * 1000, *sha256s],
+        )
+
+    async def unlock_blobs(self, sha256s: List[str]):
+        """Release deletion locks taken by ``lock_unreferenced_blobs``."""
+        if sha256s:
+            await self.redis_client.delete(*(f"{self.blob_lock_prefix}{sha256}" for sha256 in sha256s))
+
+    async def wait_for_blob_deletion(self, sha256: str):
+        """Wait until a locked blob's delete has finished (or its lock expired)."""
+        deadline = time.monotonic() + BLOB_DELETE_LOCK_SECONDS
+        while time.monotonic() < deadline and await self.redis_client.exists(f"{self.blob_lock_prefix}{sha256}"):
+            await asyncio.sleep(0.1)
+
+    async def registered_many(self, cv_ids: List[str]) -> List[bool]:
+        """Whether each CV has a metadata record, in one round trip."""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for cv_id in cv_ids:
+            pipe.exists(f"{self.cv_prefix}{cv_id}")
+        return [bool(exists) for exists in await pipe.execute()]
+
+    async def expired(self, now: datetime, limit: int) -> List[str]:
+        """
+        CVs whose retention deadline has passed, oldest first.
+
+        Args:
+            now: Current time (timezone-aware)
+            limit: Maximum number of CV IDs to return
+        """
+        return await self.redis_client.zrangebyscore(self.expiry_key, "-inf", now.timestamp(), start=0, num=limit)
+
+    async def release(self, cv_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Remove a CV reference.
+
+        Args:
+            cv_id: CV identifier
+
+        Returns:
+            Blob hash, remaining references (0 means the blob can be
+            deleted), object name and size, or None if the CV was not
+            registered
+        """
+        result = await self._release_script(
+            keys=[f"{self.cv_prefix}{cv_id}", self.expiry_key],
+            args=[self.blob_refs_prefix, cv_id],
+        )
+        if result is None:
+            return None
+        sha256, refs, object_name, size_bytes = result
+        logger.info("cv_released", cv_id=cv_id, sha256=sha256, remaining_refs=refs)
+        return {
+            "sha256": sha256,
+            "remaining_refs": int(refs),
+            "object_name": object_name,
+            "size_bytes": int(size_bytes or 0),
+        }
+
+
+cv_registry = CVRegistry()
@@ -0,0 +1,119 @@
+"""Shared Redis pub/sub subscriber for job events."""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+from cv_analyzer.core.logging import get_logger
+from cv_analyzer.core.redis_pool import binary_redis_client
+
+logger = get_logger(__name__)
+
+# Events buffered per open stream before it is marked as lagging
+STREAM_QUEUE_SIZE = 256
+
+# Pause before reconnecting after the subscriber connection fails
+RECONNECT_DELAY_SECONDS = 1.0
+
+
+class JobEventHub:
+    """
+    Fan-out of ``job-events:{job_id}`` messages to open streams.
+    
+    The whole process shares one pub/sub connection (taken from the shared
+    binary pool and held while the hub is open): a channel is subscribed
+    when its first stream opens and unsubscribed when its last one closes,
+    and a single reader task routes messages to per-stream queues. A stream
+    that falls behind gets ``None`` and should re-read from the timeline.
+    """
+    
+    def __init__(self, channel_prefix: str = "job-events:"):
+        self.channel_prefix = channel_prefix
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._streams: Dict[str, Set[asyncio.Queue]] = {}
+        self._lock = asyncio.Lock()
+    
+    @asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[asyncio.Queue]:
+        """
+        Receive a job's events for the duration of the context.
+        
+        Yields:
+            Queue of encoded timeline events (see ``codec.decode_event``)
+        """
+        channel = f"{self.channel_prefix}{job_id}"
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        async with self._lock:
+            if self._pubsub is None:
+                self._pubsub = binary_redis_client.pubsub()
+            if channel not in self._streams:
+                await self._pubsub.subscribe(channel)
+                self._streams[channel] = set()
+            self._streams[channel].add(queue)
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read())
+        try:
+            yield queue
+        finally:
+            async with self._lock:
+                streams = self._streams.get(channel)
+                if streams is not None:
+                    streams.discard(queue)
+                    if not streams:
+                        del self._streams[channel]
+                        try:
+                            await self._pubsub.unsubscribe(channel)
+                        except Exception as e:
+                            logger.warning("job_events_unsubscribe_failed", channel=channel, error=str(e))
+    
+    async def _read(self):
+        """Route messages from the shared connection until cancelled."""
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("job_events_reader_failed", error=str(e))
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+                await self._resubscribe()
+                continue
+            if not message or message["type"] != "message":
+                continue
+            for queue in tuple(self._streams.get(message["channel"].decode(), ())):
+                self._deliver(queue, message["data"])
+    
+    async def _resubscribe(self):
+        """Restore channel subscriptions after a reconnect; streams resync from the timeline."""
+        async with self._lock:
+            try:
+                if self._streams:
+                    await self._pubsub.subscribe(*self._streams)
+            except Exception as e:
+                logger.error("job_events_resubscribe_failed", error=str(e))
+                return
+            for streams in self._streams.values():
+                for queue in streams:
+                    self._deliver(queue, None)
+    
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, data: Optional[bytes]):
+        try:
+            queue.put_nowait(data)
+        except asyncio.QueueFull:
+            # Lagging stream: replace its backlog with a resync marker
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+    
+    async def close(self):
+        """Stop the reader and return the pub/sub connection to the pool."""
+        if self._reader:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        self._reader = self._pubsub = None
+        self._streams.clear()
+
+
+job_event_hub = JobEventHub()
@@ -1,84 +1,250 @@
 """Job status tracking service."""
+import base64
 import json
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import time
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Tuple
 import redis
-from cv_analyzer.core.config import settings
+from redis.asyncio.client import Pipeline
+from cv_analyzer.core.codec import encode_event, decode_event, decode_event_fields
+from cv_analyzer.core.job_scripts import STATUS_ORDER, TRANSITION_SCRIPT, APPEND_EVENTS_SCRIPT
 from cv_analyzer.core.logging import get_logger
+from cv_analyzer.core.redis_pool import redis_client, binary_redis_client
 from cv_analyzer.models.schemas import JobStatus, TimelineEvent
 
 logger = get_logger(__name__)
 
+# Seconds job records and timelines are kept
+JOB_TTL_SECONDS = 86400 * 7
+
+
+class InvalidTransitionError(ValueError):
+    """Raised when a job status change is not allowed from its current status."""
+
 
 class JobTracker:
-    """Service for tracking job status and timeline."""
+    """
+    Service for tracking job status and timeline.
+    
+    Jobs are Redis hashes (``job:{job_id}``); the timeline is a list
+    (``timeline:{job_id}``), newest event first. Every timeline event is
+    also published on ``job-events:{job_id}``. Sorted-set indexes
+    (``jobs:index:created``, ``jobs:index:cv:{cv_id}`` and
+    ``jobs:index:status:{status}``) list jobs by creation time.
+    """
     
     def __init__(self):
-        self.redis_client = redis.Redis(
-            host=settings.redis_host,
-            port=settings.redis_port,
-            db=settings.redis_db,
-            decode_responses=True,
-        )
+        self.redis_client = redis_client
+        # Timeline entries are binary, so they are read without decoding
+        self.binary_client = binary_redis_client
         self.job_prefix = "job:"
         self.timeline_prefix = "timeline:"
+        self.channel_prefix = "job-events:"
+        self.index_prefix = "jobs:index:"
+        self._transition = self.redis_client.register_script(TRANSITION_SCRIPT)
+        self._append_events = self.redis_client.register_script(APPEND_EVENTS_SCRIPT)
     
-    def create_job(
+    async def create_job(
         self,
         job_id: str,
         cv_id: str,
         provider: str,
         prompt_version: Optional[str] = None,
     ):
-        """Create a new job record."""
-        job_data = {
-            "job_id": job_id,
-            "cv_id": cv_id,
-            "status": JobStatus.PENDING.value,
-            "provider": provider,
-            "prompt_version": prompt_version,
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat(),
-        }
-        self.redis_client.setex(
-            f"{self.job_prefix}{job_id}",
-            86400 * 7,  # 7 days TTL
-            json.dumps(job_data),
-        )
-        self.add_timeline_event(job_id, "job_created", "Job created", {})
-        logger.info("job_created", job_id=job_id, cv_id=cv_id)
+        """Create a new job record, its index entries and first timeline event in one round trip."""
+        await self.create_jobs([{"job_id": job_id, "cv_id": cv_id, "provider": provider, "prompt_version": prompt_version}])
     
-    def update_job_status(
+    async def create_jobs(self, jobs: List[Dict[str, Any]], client: Optional[Pipeline] = None):
+        """
+        Create several job records with their index entries and first timeline events.
+        
+        Expired index entries are trimmed once per batch rather than per job.
+        
+        Args:
+            jobs: Dicts with ``job_id``, ``cv_id``, ``provider`` and ``prompt_version``
+            client: Pipeline to queue the writes on (default: one transaction, executed now)
+        """
+        if not jobs:
+            return
+        created = time.time()
+        now = datetime.utcfromtimestamp(created)
+        created_event = encode_event(now, "job_created", "Job created", {})
+        created_index = f"{self.index_prefix}created"
+        pending_index = self._status_index(JobStatus.PENDING.value)
+        pipe = client if client is not None else self.redis_client.pipeline()
+        # One multi-member ZADD per index
+        index_entries: Dict[str, Dict[str, float]] = {}
+        cv_indexes = set()
+        for job in jobs:
+            job_id = job["job_id"]
+            job_key = f"{self.job_prefix}{job_id}"
+            pipe.hset(job_key, mapping={
+                "job_id": job_id,
+                "cv_id": job["cv_id"],
+                "status": JobStatus.PENDING.value,
+                "provider": job["provider"],
+                "prompt_version": job["prompt_version"] or "",
+                "created_at": now.isoformat(),
+                "updated_at": now.isoformat(),
+                "version": 0,
+            })
+            pipe.expire(job_key, JOB_TTL_SECONDS)
+            cv_index = f"{self.index_prefix}cv:{job['cv_id']}"
+            cv_indexes.add(cv_index)
+            for index in (created_index, cv_index, pending_index):
+                index_entries.setdefault(index, {})[job_id] = created
+            await self.write_events(job_id, [created_event], client=pipe)
+        for index, entries in index_entries.items():
+            pipe.zadd(index, entries)
+        for index in (created_index, *cv_indexes, *self._status_indexes()):
+            pipe.zremrangebyscore(index, "-inf", created - JOB_TTL_SECONDS)
+        for cv_index in cv_indexes:
+            pipe.expire(cv_index, JOB_TTL_SECONDS)
+        if client is None:
+            await pipe.execute()
+        if len(jobs) == 1:
+            logger.info("job_created", job_id=jobs[0]["job_id"], cv_id=jobs[0]["cv_id"])
+        else:
+            logger.info("jobs_created", jobs=len(jobs))
+    
+    async def transition(
         self,
         job_id: str,
         status: JobStatus,
+        event: Optional[str] = None,
+        message: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
         error: Optional[str] = None,
-    ):
-        """Update job status."""
-        job_data = self.get_job(job_id)
-        if not job_data:
-            raise ValueError(f"Job {job_id} not found")
+    ) -> Dict[str, Any]:
+        """
+        Change job status and record the matching timeline event atomically.
         
-        job_data["status"] = status.value
-        job_data["updated_at"] = datetime.utcnow().isoformat()
-        if error:
-            job_data["error"] = error
+        Validation, the update, the timeline push and TTL refresh all run in
+        one server-side script, so concurrent writers cannot lose updates.
+        Allowed transitions: pending -> processing | failed,
+        processing -> completed | failed.
         
-        self.redis_client.setex(
-            f"{self.job_prefix}{job_id}",
-            86400 * 7,
-            json.dumps(job_data),
-        )
-        logger.info("job_status_updated", job_id=job_id, status=status.value)
+        Args:
+            job_id: Job identifier
+            status: New status
+            event: Timeline event name (``status_changed`` if omitted)
+            message: Timeline event message
+            metadata: Timeline event metadata
+            error: Error message to store on the job
+            
+        Returns:
+            Updated job data
+            
+        Raises:
+            ValueError: If the job does not exist
+            InvalidTransitionError: If the transition is not allowed
+        """
+        status = JobStatus(status).value
+        now = datetime.utcnow()
+        if not event:
+            # Every status change bumps the version and is published to subscribers
+            event, message = "status_changed", f"Status changed to {status}"
+        events = [encode_event(now, event, message or "", metadata, status)]
+        try:
+            result = await self._transition(
+                keys=[*self._event_keys(job_id), f"{self.index_prefix}created", *self._status_indexes()],
+                args=[status, now.isoformat(), JOB_TTL_SECONDS, error or "", *events],
+            )
+        except redis.ResponseError as e:
+            reason = str(e)
+            if reason.startswith("NOT_FOUND"):
+                raise ValueError(f"Job {job_id} not found")
+            if reason.startswith("INVALID_TRANSITION"):
+                raise InvalidTransitionError(f"Job {job_id}: {reason.split(' ', 1)[1]}")
+            if reason.startswith("WRONGTYPE") and await self._migrate_legacy(job_id):
+                return await self.transition(job_id, status, event, message, metadata, error)
+            raise
+        
+        job_data = self._decode(dict(zip(result[::2], result[1::2])))
+        logger.info("job_status_updated", job_id=job_id, status=status)
+        return job_data
+    
+    async def update_job_status(
+        self,
+        job_id: str,
+        status: JobStatus,
+        error: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Update job status, recorded as a ``status_changed`` timeline event."""
+        return await self.transition(job_id, status, error=error)
     
-    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get job data."""
-        data = self.redis_client.get(f"{self.job_prefix}{job_id}")
-        if data:
-            return json.loads(data)
-        return None
+        key = f"{self.job_prefix}{job_id}"
+        try:
+            job_data = await self.redis_client.hgetall(key)
+        except redis.ResponseError:
+            # Record written before jobs were stored as hashes
+            data = await self.redis_client.get(key)
+            return json.loads(data) if data else None
+        return self._decode(job_data) if job_data else None
+    
+    @staticmethod
+    def _decode(job_data: Dict[str, str]) -> Dict[str, Any]:
+        job_data["prompt_version"] = job_data.get("prompt_version") or None
+        job_data["version"] = int(job_data.get("version") or 0)
+        return job_data
+    
+    async def _migrate_legacy(self, job_id: str) -> bool:
+        """
+        Convert a JSON-string job record to a hash in place.
+        
+        Returns:
+            True if the record was converted (or already had been)
+        """
+        key = f"{self.job_prefix}{job_id}"
+        async with self.redis_client.pipeline() as pipe:
+            try:
+                await pipe.watch(key)
+                if await pipe.type(key) != "string":
+                    return await pipe.exists(key) > 0
+                job_data = json.loads(await pipe.get(key))
+                ttl = await pipe.ttl(key)
+                pipe.multi()
+                pipe.delete(key)
+                pipe.hset(key, mapping={k: v for k, v in job_data.items() if v is not None})
+                pipe.expire(key, ttl if ttl > 0 else JOB_TTL_SECONDS)
+                await pipe.execute()
+            except redis.WatchError:
+                pass
+        logger.info("job_record_migrated", job_id=job_id)
+        return True
+    
+    def _status_index(self, status: str) -> str:
+        return f"{self.index_prefix}status:{status}"
+    
+    def _status_indexes(self) -> List[str]:
+        return [self._status_index(status) for status in STATUS_ORDER]
+    
+    def _event_keys(self, job_id: str) -> List[str]:
+        """Script keys: job hash, timeline list, event channel."""
+        return [
+            f"{self.job_prefix}{job_id}",
+            f"{self.timeline_prefix}{job_id}",
+            f"{self.channel_prefix}{job_id}",
+        ]
     
-    def add_timeline_event(
+    async def write_events(self, job_id: str, events: List[bytes], client: Optional[Pipeline] = None):
+        """
+        Append serialized timeline events (oldest first), assigning versions.
+        
+        Args:
+            job_id: Job identifier
+            events: Events from ``codec.encode_event``
+            client: Pipeline to queue the write on (default: execute now)
+        """
+        await self._append_events(
+            keys=self._event_keys(job_id),
+            args=[JOB_TTL_SECONDS, *events],
+            client=client,
+        )
+    
+    async def add_timeline_event(
         self,
         job_id: str,
         event: str,
@@ -86,31 +252,172 @@ class JobTracker:
         metadata: Optional[Dict[str, Any]] = None,
     ):
         """Add timeline event."""
-        event_data = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "event": event,
-            "message": message,
-            "metadata": metadata or {},
-        }
-        self.redis_client.lpush(
-            f"{self.timeline_prefix}{job_id}",
-            json.dumps(event_data),
-        )
-        self.redis_client.expire(f"{self.timeline_prefix}{job_id}", 86400 * 7)
-        logger.debug("timeline_event_added", job_id=job_id, event=event)
+        await self.write_events(job_id, [encode_event(datetime.utcnow(), event, message, metadata)])
+        logger.debug("timeline_event_added", job_id=job_id, timeline_event=event)
     
-    def get_timeline(self, job_id: str) -> List[TimelineEvent]:
+    async def get_timeline(self, job_id: str) -> List[TimelineEvent]:
         """Get job timeline."""
-        events_json = self.redis_client.lrange(f"{self.timeline_prefix}{job_id}", 0, -1)
+        entries = await self.binary_client.lrange(f"{self.timeline_prefix}{job_id}", 0, -1)
+        return self._parse_timeline(entries)
+    
+    async def get_jobs(
+        self,
+        job_ids: List[str],
+        timeline_limit: Optional[int] = None,
+    ) -> Dict[str, Tuple[Dict[str, Any], List[TimelineEvent]]]:
+        """
+        Get several jobs and their timelines in one pipelined round trip.
+        
+        Args:
+            job_ids: Job identifiers
+            timeline_limit: Most recent events to return per job (None for
+                the full timeline, 0 to skip timelines)
+            
+        Returns:
+            Job ID -> (job data, timeline) for the jobs that exist
+        """
+        pipe = self.binary_client.pipeline(transaction=False)
+        for job_id in job_ids:
+            pipe.hgetall(f"{self.job_prefix}{job_id}")
+            if timeline_limit != 0:
+                end = -1 if timeline_limit is None else timeline_limit - 1
+                pipe.lrange(f"{self.timeline_prefix}{job_id}", 0, end)
+        results = iter(await pipe.execute(raise_on_error=False))
+        
+        jobs = {}
+        for job_id in job_ids:
+            job_data = next(results)
+            entries = next(results) if timeline_limit != 0 else []
+            if isinstance(job_data, redis.ResponseError):
+                # Record written before jobs were stored as hashes
+                job_data = await self.get_job(job_id)
+            elif job_data:
+                job_data = self._decode({k.decode(): v.decode() for k, v in job_data.items()})
+            if job_data:
+                jobs[job_id] = (job_data, self._parse_timeline(entries))
+        return jobs
+    
+    async def list_jobs(
+        self,
+        cv_id: Optional[str] = None,
+        status: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List jobs newest first from the sorted-set indexes.
+        
+        The CV index is used when ``cv_id`` is given (with ``status`` applied
+        as a filter), otherwise the status or creation index.
+        
+        Args:
+            cv_id: Only jobs for this CV
+            status: Only jobs with this status
+            created_after: Only jobs created at or after this time (naive = UTC)
+            created_before: Only jobs created before this time (naive = UTC)
+            cursor: ``next_cursor`` from the previous page
+            limit: Maximum jobs to return
+            
+        Returns:
+            (job data list, cursor for the next page or None)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        if cv_id:
+            index = f"{self.index_prefix}cv:{cv_id}"
+        elif status:
+            index = self._status_index(status)
+        else:
+            index = f"{self.index_prefix}created"
+        
+        min_score = time.time() - JOB_TTL_SECONDS
+        if created_after:
+            min_score = max(min_score, self._timestamp(created_after))
+        max_score = "+inf"
+        before = self._timestamp(created_before) if created_before else None
+        if before is not None:
+            max_score = f"({before!r}"
+        after = self._decode_cursor(cursor) if cursor else None
+        if after and (before is None or after[0] < before):
+            max_score = repr(after[0])
+        
+        jobs: List[Dict[str, Any]] = []
+        last = None
+        offset = 0
+        while len(jobs) < limit:
+            page = await self.redis_client.zrevrangebyscore(
+                index, max_score, min_score, start=offset, num=limit, withscores=True
+            )
+            offset += len(page)
+            entries = page
+            if after:
+                # Entries with the cursor's score sort by job ID, descending
+                entries = [(job_id, score) for job_id, score in page if score < after[0] or job_id < after[1]]
+            found = await self.get_jobs([job_id for job_id, _ in entries], timeline_limit=0) if entries else {}
+            for job_id, score in entries:
+                # Skip entries whose job has expired but not been trimmed yet
+                if job_id not in found or (status and found[job_id][0]["status"] != status):
+                    continue
+                jobs.append(found[job_id][0])
+                last = (score, job_id)
+                if len(jobs) == limit:
+                    break
+            if len(page) < limit:
+                break
+        
+        next_cursor = self._encode_cursor(*last) if last and len(jobs) == limit else None
+        return jobs, next_cursor
+    
+    @staticmethod
+    def _timestamp(value: datetime) -> float:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    
+    @staticmethod
+    def _encode_cursor(score: float, job_id: str) -> str:
+        return base64.urlsafe_b64encode(f"{score!r}:{job_id}".encode()).decode()
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[float, str]:
+        try:
+            score, job_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":", 1)
+            return float(score), job_id
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError("Invalid cursor")
+    
+    async def get_events_since(self, job_id: str, since: int = 0) -> List[Dict[str, Any]]:
+        """
+        Raw timeline events newer than a version, oldest first.
+        
+        Args:
+            job_id: Job identifier
+            since: Last version the caller has seen (0 for all events)
+        """
+        events = []
+        for entry in await self.binary_client.lrange(f"{self.timeline_prefix}{job_id}", 0, -1):
+            event_data = decode_event(entry)
+            if since and event_data.get("seq", 0) <= since:
+                break  # Newest first, so the rest is older
+            events.append(event_data)
+        events.reverse()
+        return events
+    
+    @staticmethod
+    def _parse_timeline(entries: List[bytes]) -> List[TimelineEvent]:
+        """Decode a timeline list (newest first) into chronological events."""
         events = []
-        for event_json in reversed(events_json):  # Reverse to get chronological order
-            event_data = json.loads(event_json)
+        for entry in reversed(entries):  # Reverse to get chronological order
+            _, timestamp, event, message, metadata, _ = decode_event_fields(entry)
             events.append(
                 TimelineEvent(
-                    timestamp=datetime.fromisoformat(event_data["timestamp"]),
-                    event=event_data["event"],
-                    message=event_data["message"],
-                    metadata=event_data.get("metadata"),
+                    timestamp=timestamp,
+                    event=event,
+                    message=message,
+                    metadata=metadata,
                 )
             )
         return events
@@ -0,0 +1,121 @@
+"""Per-client sliding-window rate limiting in Redis."""
+import math
+import time
+from typing import NamedTuple
+from cv_analyzer.core.redis_pool import redis_client
+
+# Sliding window counter: the previous fixed window's count, weighted by how
+# much of it still overlaps the sliding window, plus the current window's.
+# KEYS: current window counter, previous window counter
+# ARGV: limit, window (ms), elapsed time in the current window (ms), cost
+# Returns {allowed (0/1), current count, previous count}
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[4])
+local used = previous * (window - tonumber(ARGV[3])) / window + current
+if used + cost > limit then
+    return {0, current, previous}
+end
+current = redis.call('INCRBY', KEYS[1], cost)
+redis.call('PEXPIRE', KEYS[1], window * 2)
+return {1, current, previous}
+"""
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimitPolicy(NamedTuple):
+    """A limit of ``limit`` requests per ``window_seconds``."""
+    limit: int
+    window_seconds: int
+    
+    @classmethod
+    def parse(cls, value: str) -> "RateLimitPolicy":
+        """
+        Parse a policy such as ``"60/minute"`` or ``"1000/3600"``.
+        
+        Raises:
+            ValueError: The policy is malformed
+        """
+        limit, _, period = value.partition("/")
+        period = period.strip()
+        try:
+            policy = cls(int(limit), PERIODS[period] if period in PERIODS else int(period))
+        except ValueError:
+            policy = None
+        if policy is None or policy.limit < 1 or policy.window_seconds < 1:
+            raise ValueError(f"Invalid rate limit policy: {value}")
+        return policy
+
+
+class RateLimitResult(NamedTuple):
+    """Outcome of a rate limit check."""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_seconds: int  # Until the current window ends
+    retry_after_seconds: int  # Until the request would be allowed (0 if it was)
+
+
+class RateLimiter:
+    """
+    Sliding-window rate limits shared by all API processes.
+    
+    Each (policy, client) pair has one counter per fixed window under
+    ``ratelimit:{policy:client}:{window}``. A request is allowed if the
+    current window's count plus the overlapping share of the previous
+    window's count stays within the limit. Checking and counting is one
+    script call, so concurrent requests cannot both take the last slot.
+    """
+    
+    def __init__(self):
+        self.redis_client = redis_client
+        self.key_prefix = "ratelimit:"
+        self._script = self.redis_client.register_script(SLIDING_WINDOW_SCRIPT)
+    
+    async def hit(self, name: str, client: str, policy: RateLimitPolicy, cost: int = 1) -> RateLimitResult:
+        """
+        Count a request against a policy, unless it would exceed it.
+        
+        Args:
+            name: Policy name (endpoints sharing a name share the limit)
+            client: Client key
+            policy: Limit to apply
+            cost: Requests to count
+        
+        Returns:
+            Whether the request is allowed, with header values
+        """
+        window_ms = policy.window_seconds * 1000
+        now_ms = int(time.time() * 1000)
+        window, elapsed_ms = divmod(now_ms, window_ms)
+        prefix = f"{self.key_prefix}{{{name}:{client}}}:"
+        allowed, current, previous = await self._script(
+            keys=[f"{prefix}{window}", f"{prefix}{window - 1}"],
+            args=[policy.limit, window_ms, elapsed_ms, cost],
+        )
+        
+        used = previous * (window_ms - elapsed_ms) / window_ms + current
+        remaining_ms = window_ms - elapsed_ms
+        retry_after_ms = 0
+        if not allowed:
+            free = policy.limit - cost - current
+            if free >= 0:
+                # Enough of the previous window slides out within this one
+                retry_after_ms = remaining_ms - free * window_ms / previous
+            else:
+                # This window's count must slide out of the next one
+                retry_after_ms = remaining_ms + window_ms * (1 - (policy.limit - cost) / current)
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=policy.limit,
+            remaining=max(math.floor(policy.limit - used), 0),
+            reset_seconds=math.ceil(remaining_ms / 1000),
+            retry_after_seconds=max(math.ceil(retry_after_ms / 1000), 1) if not allowed else 0,
+        )
+
+
+rate_limiter = RateLimiter()
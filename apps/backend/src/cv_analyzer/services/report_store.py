@@ -0,0 +1,99 @@
+"""Analysis report store: PostgreSQL with a Redis read-through cache."""
+import time
+from typing import Optional
+import redis
+from sqlalchemy import select
+from cv_analyzer.core.config import settings
+from cv_analyzer.core.database import database
+from cv_analyzer.core.logging import get_logger
+from cv_analyzer.core.metrics import report_cache_requests_total, report_fetch_duration_seconds
+from cv_analyzer.core.redis_pool import redis_client
+from cv_analyzer.core.report_schema import analysis_reports, REPORT_CACHE_PREFIX
+from cv_analyzer.models.schemas import AnalysisReport
+
+logger = get_logger(__name__)
+
+# Cache a report only if no new report for the CV was stored since it was
+# read from PostgreSQL, so a slow read cannot overwrite the invalidation.
+# KEYS: cache key, the CV's report version
+# ARGV: version seen before the query, report JSON, TTL (seconds)
+CACHE_IF_CURRENT_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+
+class ReportStore:
+    """
+    Read access to stored analysis reports.
+    
+    Reports are cached in Redis as validated ``AnalysisReport`` JSON under
+    ``report:cv:{cv_id}`` (latest report) and ``report:cv:{cv_id}:job:{job_id}``,
+    so a cache hit is returned without touching PostgreSQL or re-validating.
+    The worker deletes both keys and increments ``report:cv:{cv_id}:version``
+    after storing a new report for the CV; a report read before that is not
+    cached.
+    """
+    
+    def __init__(self):
+        self.redis_client = redis_client
+        self.cache_prefix = REPORT_CACHE_PREFIX
+        self._cache_if_current = self.redis_client.register_script(CACHE_IF_CURRENT_SCRIPT)
+    
+    async def get_report_json(self, cv_id: str, job_id: Optional[str] = None) -> Optional[str]:
+        """
+        Get a report as JSON.
+        
+        Args:
+            cv_id: CV identifier
+            job_id: A specific job's report (default: the CV's latest report)
+        
+        Returns:
+            ``AnalysisReport`` JSON, or None if there is no such report
+        """
+        version_key = f"{self.cache_prefix}cv:{cv_id}:version"
+        key = f"{self.cache_prefix}cv:{cv_id}"
+        if job_id:
+            key = f"{key}:job:{job_id}"
+        
+        start = time.perf_counter()
+        try:
+            cached, version = await self.redis_client.mget(key, version_key)
+        except redis.RedisError as e:
+            logger.warning("report_cache_unavailable", error=str(e))
+            cached = version = None
+        if cached:
+            report_cache_requests_total.labels(result="hit").inc()
+            report_fetch_duration_seconds.labels(source="cache").observe(time.perf_counter() - start)
+            return cached
+        report_cache_requests_total.labels(result="miss").inc()
+        
+        report = await self._load(cv_id, job_id)
+        report_fetch_duration_seconds.labels(source="database").observe(time.perf_counter() - start)
+        if report is None:
+            return None
+        
+        report_json = AnalysisReport.model_validate(report).model_dump_json()
+        try:
+            await self._cache_if_current(
+                keys=[key, version_key],
+                args=[version or "0", report_json, settings.report_cache_ttl_seconds],
+            )
+        except redis.RedisError as e:
+            logger.warning("report_cache_unavailable", error=str(e))
+        return report_json
+    
+    async def _load(self, cv_id: str, job_id: Optional[str]) -> Optional[dict]:
+        query = select(analysis_reports.c.report).where(analysis_reports.c.cv_id == cv_id)
+        if job_id:
+            query = query.where(analysis_reports.c.job_id == job_id)
+        else:
+            query = query.order_by(analysis_reports.c.generated_at.desc()).limit(1)
+        async with database.connection() as connection:
+            return (await connection.execute(query)).scalar_one_or_none()
+
+
+report_store = ReportStore()
@@ -0,0 +1,236 @@
+"""Retention engine for expired CVs and orphaned objects."""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from minio.error import S3Error
+from cv_analyzer.core.config import settings
+from cv_analyzer.core.logging import configure_logging, get_logger
+from cv_analyzer.core.metrics import (
+    retention_objects_deleted_total,
+    retention_bytes_reclaimed_total,
+    retention_delete_failures_total,
+)
+from cv_analyzer.core.redis_pool import close_redis
+from cv_analyzer.services.cv_registry import cv_registry
+from cv_analyzer.services.storage import storage_service
+from cv_analyzer.services.upload_sessions import upload_sessions
+
+logger = get_logger(__name__)
+
+# S3 DeleteObjects accepts at most 1000 keys per request
+MAX_DELETE_BATCH = 1000
+
+# Expired CVs fetched from the expiry index per round trip
+EXPIRED_SCAN_BATCH = 100
+
+# (kind, object name, size in bytes)
+Candidate = Tuple[str, str, int]
+
+
+class RetentionEngine:
+    """
+    Deletes CVs past their retention period and objects nothing refers to.
+    
+    Candidates come from:
+    
+    - the registry's expiry index: each expired CV is released, and its blob
+      is deleted once no other CV references it, together with any derived
+      objects under ``{prefix}{cv_id}/`` for ``retention_derived_prefixes``
+    - ``uploads/``: staged direct uploads never completed
+    - ``blobs/``: blobs with no references (e.g. left by a failed delete)
+    - ``cvs/``: objects from before the registry existed that were never
+      registered
+    
+    Listing-based sources only consider objects older than a grace period so
+    uploads in flight are left alone.
+    
+    Before that, resumable uploads whose session has expired have their
+    MinIO multipart upload aborted, which frees the chunks received so far
+    (they are not listed as objects until the upload completes). Deletes go out in ``DeleteObjects``
+    batches paced to ``max_deletes_per_second``. Just before each delete,
+    blob candidates are rechecked and locked in the registry, so a CV
+    registered after a blob was picked either keeps it or stores it again.
+    
+    The registry is async; object storage is called directly, since the
+    engine runs as its own process with nothing else on the event loop.
+    """
+    
+    def __init__(self, batch_size: Optional[int] = None, max_deletes_per_second: Optional[float] = None):
+        self.batch_size = min(batch_size or settings.retention_batch_size, MAX_DELETE_BATCH)
+        self.max_deletes_per_second = max_deletes_per_second or settings.retention_max_deletes_per_second
+        self._batch: List[Candidate] = []
+        self._next_delete_at = 0.0
+        self._stats: Dict[str, int] = {}
+    
+    async def run(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Run one retention pass.
+        
+        Args:
+            now: Current time (defaults to now, UTC)
+        
+        Returns:
+            Counts of expired CVs, deleted objects, reclaimed bytes, failed
+            deletes and aborted multipart uploads
+        """
+        now = now or datetime.now(timezone.utc)
+        grace_cutoff = now - timedelta(hours=settings.staged_upload_retention_hours)
+        retention_cutoff = now - timedelta(days=settings.cv_retention_days)
+        session_cutoff = now - timedelta(seconds=settings.resumable_upload_ttl_seconds)
+        self._stats = {
+            "cvs_expired": 0,
+            "objects_deleted": 0,
+            "bytes_reclaimed": 0,
+            "delete_failures": 0,
+            "multipart_aborted": 0,
+        }
+        
+        await self._abort_abandoned_multipart_uploads(session_cutoff)
+        sources = (
+            self._expired_cvs(now),
+            self._stale_uploads(grace_cutoff),
+            self._unreferenced_blobs(grace_cutoff),
+            self._unregistered_cvs(retention_cutoff),
+        )
+        for source in sources:
+            async for candidate in source:
+                self._batch.append(candidate)
+                if len(self._batch) >= self.batch_size:
+                    await self._flush()
+            # Later sources list prefixes this one may have deleted from
+            await self._flush()
+        
+        logger.info("retention_run_completed", **self._stats)
+        return dict(self._stats)
+    
+    async def _abort_abandoned_multipart_uploads(self, cutoff: datetime):
+        """Abort resumable uploads started before ``cutoff`` whose session is gone."""
+        uploads = storage_service.list_multipart_uploads("uploads/", older_than=cutoff)
+        for page in self._pages(uploads):
+            # The session outlives the upload's last chunk by its TTL, so a live one means in progress
+            active = await upload_sessions.exists_many([object_name.split("/", 1)[1] for object_name, _ in page])
+            for (object_name, multipart_upload_id), exists in zip(page, active):
+                if exists:
+                    continue
+                await self._wait_for_rate_limit()
+                try:
+                    storage_service.abort_multipart_upload(object_name, multipart_upload_id)
+                except S3Error:
+                    retention_delete_failures_total.inc()
+                    self._stats["delete_failures"] += 1
+                    continue
+                finally:
+                    self._next_delete_at = time.monotonic() + 1 / self.max_deletes_per_second
+                retention_objects_deleted_total.labels(kind="multipart").inc()
+                self._stats["multipart_aborted"] += 1
+    
+    async def _expired_cvs(self, now: datetime) -> AsyncIterator[Candidate]:
+        """Release expired CVs and yield the objects they leave unreferenced."""
+        while True:
+            cv_ids = await cv_registry.expired(now, EXPIRED_SCAN_BATCH)
+            if not cv_ids:
+                return
+            for cv_id in cv_ids:
+                # Also drops the CV from the expiry index, so the loop advances
+                released = await cv_registry.release(cv_id)
+                self._stats["cvs_expired"] += 1
+                if released and not released["sha256"]:
+                    yield "cv", released["object_name"], released["size_bytes"]
+                elif released and released["remaining_refs"] == 0:
+                    yield "blob", storage_service.blob_object_name(released["sha256"]), released["size_bytes"]
+                for prefix in settings.retention_derived_prefixes:
+                    for object_name, size in storage_service.list_objects(f"{prefix}{cv_id}/"):
+                        yield "derived", object_name, size
+    
+    async def _stale_uploads(self, cutoff: datetime) -> AsyncIterator[Candidate]:
+        for object_name, size in storage_service.list_objects("uploads/", older_than=cutoff):
+            yield "staged", object_name, size
+    
+    async def _unreferenced_blobs(self, cutoff: datetime) -> AsyncIterator[Candidate]:
+        for page in self._pages(storage_service.list_objects("blobs/", older_than=cutoff)):
+            refs = await cv_registry.get_blob_refs_many([name.rsplit("/", 1)[-1] for name, _ in page])
+            for (object_name, size), count in zip(page, refs):
+                if count == 0:
+                    yield "blob", object_name, size
+    
+    async def _unregistered_cvs(self, cutoff: datetime) -> AsyncIterator[Candidate]:
+        for page in self._pages(storage_service.list_objects("cvs/", older_than=cutoff)):
+            registered = await cv_registry.registered_many([name.split("/", 1)[1] for name, _ in page])
+            for (object_name, size), exists in zip(page, registered):
+                if not exists:
+                    yield "cv", object_name, size
+    
+    def _pages(self, objects: Iterator[Tuple[str, Any]]) -> Iterator[List[Tuple[str, Any]]]:
+        """Group a listing so Redis lookups are batched."""
+        page = []
+        for obj in objects:
+            page.append(obj)
+            if len(page) >= self.batch_size:
+                yield page
+                page = []
+        if page:
+            yield page
+    
+    async def _flush(self):
+        """Delete the pending batch, waiting first if the rate limit requires it."""
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        
+        await self._wait_for_rate_limit()
+        
+        # Recheck blob references and lock the blobs against new ones until deleted
+        blobs = [object_name.rsplit("/", 1)[-1] for kind, object_name, _ in batch if kind == "blob"]
+        locked = set(await cv_registry.lock_unreferenced_blobs(blobs))
+        if len(locked) < len(blobs):
+            logger.info("retention_blobs_referenced", skipped=len(blobs) - len(locked))
+            batch = [
+                candidate for candidate in batch
+                if candidate[0] != "blob" or candidate[1].rsplit("/", 1)[-1] in locked
+            ]
+        try:
+            failed = set(storage_service.remove_objects([object_name for _, object_name, _ in batch]))
+        finally:
+            await cv_registry.unlock_blobs(list(locked))
+        self._next_delete_at = time.monotonic() + len(batch) / self.max_deletes_per_second
+        
+        for kind, object_name, size in batch:
+            if object_name in failed:
+                retention_delete_failures_total.inc()
+                self._stats["delete_failures"] += 1
+                continue
+            retention_objects_deleted_total.labels(kind=kind).inc()
+            retention_bytes_reclaimed_total.labels(kind=kind).inc(size)
+            self._stats["objects_deleted"] += 1
+            self._stats["bytes_reclaimed"] += size
+        logger.info("retention_batch_deleted", objects=len(batch) - len(failed), failed=len(failed))
+    
+    async def _wait_for_rate_limit(self):
+        """Sleep until the previous deletes' share of ``max_deletes_per_second`` has passed."""
+        delay = self._next_delete_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def main():
+    """Command-line entrypoint: ``python -m cv_analyzer.services.retention``."""
+    parser = argparse.ArgumentParser(description="Delete CVs and objects past their retention period.")
+    parser.add_argument("--batch-size", type=int, help="Objects per delete request")
+    parser.add_argument("--max-deletes-per-second", type=float, help="Delete rate limit")
+    args = parser.parse_args()
+    
+    configure_logging(settings.service_name, settings.debug)
+    asyncio.run(_run(RetentionEngine(args.batch_size, args.max_deletes_per_second)))
+
+
+async def _run(engine: RetentionEngine):
+    try:
+        await engine.run()
+    finally:
+        await close_redis()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,137 @@
 """MinIO storage service."""
+import asyncio
+import contextvars
+import functools
+import hashlib
 import io
-from typing import Optional
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import unquote
+from typing import Optional, BinaryIO, Callable, Dict, Any, Iterator, List, Tuple, TypeVar
+import certifi
+import urllib3
 from minio import Minio
+from minio.commonconfig import CopySource
+from minio.datatypes import Part, PostPolicy
+from minio.deleteobjects import DeleteObject
 from minio.error import S3Error
 from cv_analyzer.core.config import settings
 from cv_analyzer.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# S3 multipart parts must be at least 5 MiB (except the last one)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+# Read size when hashing a local spool before upload
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# MinIO client defaults, kept when sizing its connection pool
+HTTP_TIMEOUT_SECONDS = 300
+
+T = TypeVar("T")
+
+
+class FileTooLargeError(ValueError):
+    """Raised when a streamed upload exceeds the configured size limit."""
+    
+    def __init__(self, max_size: int):
+        super().__init__(f"File exceeds {max_size} bytes")
+        self.max_size = max_size
+
+
+class HashingReader:
+    """
+    File-like wrapper that hashes and counts bytes as they are read.
+    
+    Raises FileTooLargeError as soon as more than ``max_size`` bytes have
+    been read, which aborts an in-flight MinIO upload.
+    """
+    
+    def __init__(self, raw: BinaryIO, max_size: Optional[int] = None):
+        self.raw = raw
+        self.max_size = max_size
+        self.size = 0
+        self._hash = hashlib.sha256()
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.size += len(data)
+        if self.max_size is not None and self.size > self.max_size:
+            raise FileTooLargeError(self.max_size)
+        self._hash.update(data)
+        return data
+    
+    @property
+    def sha256(self) -> str:
+        """Hex digest of the bytes read so far."""
+        return self._hash.hexdigest()
+
 
 class StorageService:
-    """Service for file storage in MinIO."""
+    """
+    Service for file storage in MinIO.
+    
+    The MinIO client is blocking. Async callers run its calls through
+    ``to_thread``, on a pool of ``minio_max_workers`` threads with as many
+    pooled HTTP connections, so slow object storage never blocks the event
+    loop and cannot tie up more threads than that.
+    """
     
     def __init__(self):
-        self.client = Minio(
-            settings.minio_endpoint,
-            access_key=settings.minio_access_key,
-            secret_key=settings.minio_secret_key,
-            secure=settings.minio_secure,
-        )
-        self._ensure_bucket()
+        self._client: Optional[Minio] = None
+        self._client_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=settings.minio_max_workers, thread_name_prefix="minio")
+    
+    @property
+    def client(self) -> Minio:
+        """The MinIO client, connected on first use."""
+        if self._client is None:
+            self.connect()
+        return self._client
+    
+    def connect(self):
+        """
+        Create the MinIO client and make sure the bucket exists.
+        
+        Runs once, on startup or on the first storage call, so importing the
+        module does not need MinIO to be reachable.
+        """
+        with self._client_lock:
+            if self._client is not None:
+                return
+            client = Minio(
+                settings.minio_endpoint,
+                access_key=settings.minio_access_key,
+                secret_key=settings.minio_secret_key,
+                secure=settings.minio_secure,
+                http_client=urllib3.PoolManager(
+                    timeout=urllib3.util.Timeout(connect=HTTP_TIMEOUT_SECONDS, read=HTTP_TIMEOUT_SECONDS),
+                    maxsize=settings.minio_max_workers,
+                    cert_reqs="CERT_REQUIRED",
+                    ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+                    retries=urllib3.Retry(total=5, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+                ),
+            )
+            self._ensure_bucket(client)
+            self._client = client
+    
+    async def to_thread(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run a blocking storage call on the storage thread pool.
+        
+        Usage: ``await storage_service.to_thread(storage_service.stat_file, cv_id)``
+        """
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
     
-    def _ensure_bucket(self):
+    def _ensure_bucket(self, client: Minio):
         """Ensure bucket exists."""
         try:
-            if not self.client.bucket_exists(settings.minio_bucket):
-                self.client.make_bucket(settings.minio_bucket)
+            if not client.bucket_exists(settings.minio_bucket):
+                client.make_bucket(settings.minio_bucket)
                 logger.info("created_bucket", bucket=settings.minio_bucket)
         except S3Error as e:
             logger.error("bucket_creation_failed", error=str(e))
@@ -58,17 +164,321 @@ class StorageService:
             logger.error("file_upload_failed", file_id=file_id, error=str(e))
             raise
     
-    def download_file(self, file_id: str) -> bytes:
+    def upload_stream(
+        self,
+        object_name: str,
+        stream: BinaryIO,
+        content_type: str,
+        max_size: Optional[int] = None,
+        length: int = -1,
+    ) -> Dict[str, Any]:
+        """
+        Stream a file to MinIO part by part.
+        
+        At most one part is held in memory at a time. The size limit is
+        enforced while reading, so oversized uploads are aborted (including
+        any started multipart upload) as soon as the limit is crossed.
+        
+        Args:
+            object_name: Destination object key
+            stream: Binary file-like object to read from
+            content_type: MIME type
+            max_size: Maximum accepted size in bytes
+            length: Content length if known, -1 otherwise
+            
+        Returns:
+            Object name, size in bytes and SHA-256 hex digest
+        """
+        reader = HashingReader(stream, max_size)
+        part_size = max(settings.upload_part_size_mb * 1024 * 1024, MIN_PART_SIZE)
+        try:
+            self.client.put_object(
+                settings.minio_bucket,
+                object_name,
+                reader,
+                length=length,
+                content_type=content_type,
+                part_size=part_size,
+                num_parallel_uploads=1,
+            )
+        except FileTooLargeError:
+            logger.warning("file_upload_rejected", object_name=object_name, size=reader.size, max_size=max_size)
+            raise
+        except S3Error as e:
+            logger.error("file_upload_failed", object_name=object_name, error=str(e))
+            raise
+        
+        logger.info("file_uploaded", object_name=object_name, size=reader.size)
+        return {"object_name": object_name, "size": reader.size, "sha256": reader.sha256}
+    
+    @staticmethod
+    def blob_object_name(sha256: str) -> str:
+        """Object key of content-addressed blob."""
+        return f"blobs/{sha256}"
+    
+    def object_exists(self, object_name: str) -> bool:
+        """Check whether an object exists (HEAD request, no download)."""
+        try:
+            self.client.stat_object(settings.minio_bucket, object_name)
+            return True
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                return False
+            raise
+    
+    def hash_stream(self, stream: BinaryIO, max_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Hash a seekable stream from its current position, then rewind it.
+        
+        Lets a caller reference the content's blob before deciding whether
+        it needs uploading (see ``put_blob``).
+        
+        Args:
+            stream: Seekable binary file-like object
+            max_size: Maximum accepted size in bytes
+            
+        Returns:
+            Size and SHA-256 of the content
+        
+        Raises:
+            FileTooLargeError: The content exceeds ``max_size``
+        """
+        start = stream.tell()
+        reader = HashingReader(stream, max_size)
+        while reader.read(HASH_CHUNK_SIZE):
+            pass
+        stream.seek(start)
+        return {"size": reader.size, "sha256": reader.sha256}
+    
+    def put_blob(self, stream: BinaryIO, sha256: str, size: int, content_type: str) -> bool:
+        """
+        Upload hashed content under its SHA-256 key unless it is already stored.
+        
+        Content that is already stored is never sent to MinIO again.
+        
+        Args:
+            stream: Binary file-like object positioned at the content
+            sha256: SHA-256 from ``hash_stream``
+            size: Content length
+            content_type: MIME type
+            
+        Returns:
+            True if an identical blob already existed
+        """
+        object_name = self.blob_object_name(sha256)
+        deduplicated = self.object_exists(object_name)
+        if not deduplicated:
+            self.upload_stream(object_name, stream, content_type, length=size)
+        logger.info("blob_stored", object_name=object_name, size=size, deduplicated=deduplicated)
+        return deduplicated
+    
+    def promote_staged(self, staging_name: str, sha256: str) -> bool:
+        """
+        Move a staged upload to its content-addressed key.
+        
+        Uses a server-side copy; the staging object is removed either way.
+        
+        Args:
+            staging_name: Object key of the staged upload
+            sha256: Verified SHA-256 of the staged content
+            
+        Returns:
+            True if an identical blob already existed
+        """
+        object_name = self.blob_object_name(sha256)
+        deduplicated = self.object_exists(object_name)
+        try:
+            if not deduplicated:
+                self.client.copy_object(
+                    settings.minio_bucket,
+                    object_name,
+                    CopySource(settings.minio_bucket, staging_name),
+                )
+            self.client.remove_object(settings.minio_bucket, staging_name)
+        except S3Error as e:
+            logger.error("blob_promote_failed", staging_name=staging_name, error=str(e))
+            raise
+        logger.info("blob_promoted", object_name=object_name, deduplicated=deduplicated)
+        return deduplicated
+    
+    def presigned_upload(
+        self,
+        object_name: str,
+        content_type: str,
+        max_size: int,
+        expires_seconds: int = 900,
+    ) -> Dict[str, Any]:
+        """
+        Get a presigned POST form for uploading straight to MinIO.
+        
+        The signed policy pins the object key and content type and bounds the
+        body size, so MinIO itself rejects anything else.
+        
+        Args:
+            object_name: Object key the client must upload to
+            content_type: Required MIME type
+            max_size: Maximum accepted size in bytes
+            expires_seconds: Form expiration time
+            
+        Returns:
+            Form URL, form fields to send with the file and expiry time
+        """
+        expires_at = datetime.utcnow() + timedelta(seconds=expires_seconds)
+        policy = PostPolicy(settings.minio_bucket, expires_at)
+        policy.add_equals_condition("key", object_name)
+        policy.add_equals_condition("Content-Type", content_type)
+        policy.add_content_length_range_condition(1, max_size)
+        try:
+            fields = self.client.presigned_post_policy(policy)
+        except S3Error as e:
+            logger.error("presigned_upload_failed", object_name=object_name, error=str(e))
+            raise
+        
+        scheme = "https" if settings.minio_secure else "http"
+        endpoint = settings.minio_public_endpoint or settings.minio_endpoint
+        return {
+            "url": f"{scheme}://{endpoint}/{settings.minio_bucket}",
+            "fields": {**fields, "key": object_name, "Content-Type": content_type},
+            "expires_at": expires_at,
+        }
+    
+    def create_multipart_upload(self, object_name: str, content_type: str) -> str:
+        """
+        Start a multipart upload that is fed part by part by the client.
+        
+        Returns:
+            MinIO multipart upload ID
+        """
+        try:
+            return self.client._create_multipart_upload(
+                settings.minio_bucket,
+                object_name,
+                {"Content-Type": content_type},
+            )
+        except S3Error as e:
+            logger.error("multipart_create_failed", object_name=object_name, error=str(e))
+            raise
+    
+    def upload_part(self, object_name: str, multipart_upload_id: str, part_number: int, data: bytes) -> str:
+        """
+        Upload one part of a multipart upload.
+        
+        Re-uploading a part number replaces the earlier part.
+        
+        Returns:
+            ETag of the stored part
+        """
+        try:
+            return self.client._upload_part(
+                settings.minio_bucket,
+                object_name,
+                data,
+                None,
+                multipart_upload_id,
+                part_number,
+            )
+        except S3Error as e:
+            logger.error("multipart_part_failed", object_name=object_name, part_number=part_number, error=str(e))
+            raise
+    
+    def complete_multipart_upload(self, object_name: str, multipart_upload_id: str, etags: Dict[int, str]):
+        """
+        Assemble uploaded parts into the final object.
+        
+        Args:
+            object_name: Object key
+            multipart_upload_id: MinIO multipart upload ID
+            etags: Part number -> ETag for every part
+        """
+        parts = [Part(number, etags[number]) for number in sorted(etags)]
+        try:
+            self.client._complete_multipart_upload(
+                settings.minio_bucket,
+                object_name,
+                multipart_upload_id,
+                parts,
+            )
+        except S3Error as e:
+            logger.error("multipart_complete_failed", object_name=object_name, error=str(e))
+            raise
+        logger.info("multipart_completed", object_name=object_name, parts=len(parts))
+    
+    def abort_multipart_upload(self, object_name: str, multipart_upload_id: str):
+        """Discard a multipart upload and the parts stored so far."""
+        try:
+            self.client._abort_multipart_upload(settings.minio_bucket, object_name, multipart_upload_id)
+        except S3Error as e:
+            if e.code == "NoSuchUpload":
+                return
+            logger.error("multipart_abort_failed", object_name=object_name, error=str(e))
+            raise
+        logger.info("multipart_aborted", object_name=object_name)
+    
+    def list_multipart_uploads(self, prefix: str, older_than: Optional[datetime] = None) -> Iterator[Tuple[str, str]]:
+        """
+        List multipart uploads that were started but neither completed nor aborted.
+    
+        Args:
+            prefix: Key prefix
+            older_than: Only uploads initiated before this time
+                (timezone-aware)
+    
+        Yields:
+            Object name and MinIO multipart upload ID
+        """
+        key_marker = upload_id_marker = None
+        try:
+            while True:
+                result = self.client._list_multipart_uploads(
+                    settings.minio_bucket,
+                    prefix=prefix,
+                    key_marker=key_marker,
+                    upload_id_marker=upload_id_marker,
+                )
+                for upload in result.uploads:
+                    if older_than is not None and upload.initiated_time and upload.initiated_time >= older_than:
+                        continue
+                    yield upload.object_name, upload.upload_id
+                if not result.is_truncated:
+                    return
+                key_marker, upload_id_marker = result.next_key_marker, result.next_upload_id_marker
+        except S3Error as e:
+            logger.error("multipart_list_failed", prefix=prefix, error=str(e))
+            raise
+    
+    def hash_object(self, object_name: str) -> str:
+        """
+        Compute the SHA-256 of a stored object.
+        
+        The object is streamed through the hash in chunks and never held in
+        memory as a whole.
+        """
+        digest = hashlib.sha256()
+        try:
+            response = self.client.get_object(settings.minio_bucket, object_name)
+            try:
+                for chunk in response.stream(HASH_CHUNK_SIZE):
+                    digest.update(chunk)
+            finally:
+                response.close()
+                response.release_conn()
+        except S3Error as e:
+            logger.error("object_hash_failed", object_name=object_name, error=str(e))
+            raise
+        return digest.hexdigest()
+    
+    def download_file(self, file_id: str, object_name: Optional[str] = None) -> bytes:
         """
         Download file from MinIO.
         
         Args:
             file_id: File identifier
+            object_name: Resolved object key (defaults to ``cvs/{file_id}``)
             
         Returns:
             File content as bytes
         """
-        object_name = f"cvs/{file_id}"
+        object_name = object_name or f"cvs/{file_id}"
         try:
             response = self.client.get_object(settings.minio_bucket, object_name)
             data = response.read()
@@ -80,14 +490,45 @@ class StorageService:
             logger.error("file_download_failed", file_id=file_id, error=str(e))
             raise
     
-    def delete_file(self, file_id: str):
+    def stat_file(self, file_id: str, object_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get file metadata from MinIO without downloading it.
+        
+        Args:
+            file_id: File identifier
+            object_name: Resolved object key (defaults to ``cvs/{file_id}``)
+            
+        Returns:
+            Object name, size, content type and original filename, or None
+            if the object does not exist
+        """
+        object_name = object_name or f"cvs/{file_id}"
+        try:
+            stat = self.client.stat_object(settings.minio_bucket, object_name)
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                return None
+            logger.error("file_stat_failed", file_id=file_id, error=str(e))
+            raise
+        
+        user_metadata = {k.lower(): v for k, v in (stat.metadata or {}).items()}
+        filename = user_metadata.get("x-amz-meta-filename")
+        return {
+            "object_name": object_name,
+            "size_bytes": stat.size,
+            "content_type": stat.content_type,
+            "filename": unquote(filename) if filename else None,
+        }
+    
+    def delete_file(self, file_id: str, object_name: Optional[str] = None):
         """
         Delete file from MinIO.
         
         Args:
             file_id: File identifier
+            object_name: Resolved object key (defaults to ``cvs/{file_id}``)
         """
-        object_name = f"cvs/{file_id}"
+        object_name = object_name or f"cvs/{file_id}"
         try:
             self.client.remove_object(settings.minio_bucket, object_name)
             logger.info("file_deleted", file_id=file_id, object_name=object_name)
@@ -95,6 +536,47 @@ class StorageService:
             logger.error("file_delete_failed", file_id=file_id, error=str(e))
             raise
     
+    def list_objects(self, prefix: str, older_than: Optional[datetime] = None) -> Iterator[Tuple[str, int]]:
+        """
+        List objects under a prefix.
+        
+        Args:
+            prefix: Key prefix
+            older_than: Only objects last modified before this time
+                (timezone-aware)
+            
+        Yields:
+            Object name and size in bytes
+        """
+        try:
+            for obj in self.client.list_objects(settings.minio_bucket, prefix=prefix, recursive=True):
+                if older_than is not None and obj.last_modified and obj.last_modified >= older_than:
+                    continue
+                yield obj.object_name, obj.size or 0
+        except S3Error as e:
+            logger.error("object_list_failed", prefix=prefix, error=str(e))
+            raise
+    
+    def remove_objects(self, object_names: List[str]) -> List[str]:
+        """
+        Delete objects with a single multi-object delete request.
+        
+        Args:
+            object_names: Object keys (at most 1000)
+            
+        Returns:
+            Keys that could not be deleted
+        """
+        failed = []
+        errors = self.client.remove_objects(
+            settings.minio_bucket,
+            (DeleteObject(name) for name in object_names),
+        )
+        for error in errors:
+            logger.error("object_delete_failed", object_name=error.name, error=error.message)
+            failed.append(error.name)
+        return failed
+    
     def get_presigned_url(self, file_id: str, expires_seconds: int = 3600) -> str:
         """
         Get presigned URL for file access.
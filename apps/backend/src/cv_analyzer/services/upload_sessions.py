@@ -0,0 +1,136 @@
+"""Direct-upload session store."""
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+from cv_analyzer.core.logging import get_logger
+from cv_analyzer.core.redis_pool import redis_client
+
+logger = get_logger(__name__)
+
+# Time after the presigned form expires during which completion is still accepted
+COMPLETION_GRACE_SECONDS = 300
+
+# Set the completing flag only while the session still exists, so a claim
+# racing the session's expiry cannot recreate it without a TTL.
+# KEYS: session hash
+# Returns 1 if claimed, 0 if already claimed or expired
+CLAIM_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+return redis.call('HSETNX', KEYS[1], 'completing', 1)
+"""
+
+
+class UploadSessionStore:
+    """
+    Pending direct-to-MinIO uploads kept in Redis.
+    
+    A session records what the client was allowed to upload (staging key,
+    filename, content type, size limit) between issuing the presigned form
+    and the completion call. Sessions expire shortly after the form does.
+    
+    Resumable sessions additionally carry the declared size, chunk size and
+    MinIO multipart upload ID; the ETag of each received chunk is kept under
+    ``upload:{upload_id}:parts`` and every chunk extends the expiry.
+    """
+    
+    def __init__(self):
+        self.redis_client = redis_client
+        self.session_prefix = "upload:"
+        self._claim_script = self.redis_client.register_script(CLAIM_SCRIPT)
+    
+    async def create(
+        self,
+        upload_id: str,
+        filename: str,
+        content_type: str,
+        object_name: str,
+        max_size: int,
+        expires_seconds: int,
+        size_bytes: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        multipart_upload_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Record a new upload session."""
+        session = {
+            "upload_id": upload_id,
+            "filename": filename,
+            "content_type": content_type,
+            "object_name": object_name,
+            "max_size": max_size,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        if multipart_upload_id:
+            session.update(
+                size_bytes=size_bytes,
+                chunk_size=chunk_size,
+                multipart_upload_id=multipart_upload_id,
+            )
+        key = f"{self.session_prefix}{upload_id}"
+        pipe = self.redis_client.pipeline()
+        pipe.hset(key, mapping=session)
+        pipe.expire(key, expires_seconds + COMPLETION_GRACE_SECONDS)
+        await pipe.execute()
+        logger.info("upload_session_created", upload_id=upload_id, object_name=object_name)
+        return session
+    
+    async def get(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        """Get an upload session, or None if unknown or expired."""
+        session = await self.redis_client.hgetall(f"{self.session_prefix}{upload_id}")
+        if not session:
+            return None
+        for field in ("max_size", "size_bytes", "chunk_size"):
+            if field in session:
+                session[field] = int(session[field])
+        return session
+    
+    async def record_part(self, upload_id: str, part_number: int, etag: str, ttl_seconds: int):
+        """Store a received chunk's ETag and extend the session's expiry."""
+        key = f"{self.session_prefix}{upload_id}"
+        parts_key = f"{key}:parts"
+        pipe = self.redis_client.pipeline()
+        pipe.hset(parts_key, part_number, etag)
+        pipe.expire(parts_key, ttl_seconds)
+        pipe.expire(key, ttl_seconds)
+        await pipe.execute()
+    
+    async def get_parts(self, upload_id: str) -> Dict[int, str]:
+        """Part number -> ETag of every chunk received so far."""
+        parts = await self.redis_client.hgetall(f"{self.session_prefix}{upload_id}:parts")
+        return {int(number): etag for number, etag in parts.items()}
+    
+    async def claim(self, upload_id: str) -> bool:
+        """
+        Mark a session as being completed.
+        
+        Returns:
+            False if another request already claimed it or the session expired
+        """
+        return bool(await self._claim_script(keys=[f"{self.session_prefix}{upload_id}"]))
+    
+    async def unclaim(self, upload_id: str):
+        """Allow completion to be retried after a transient failure."""
+        await self.redis_client.hdel(f"{self.session_prefix}{upload_id}", "completing")
+    
+    async def forget_multipart(self, upload_id: str):
+        """Turn an assembled resumable session into a plain staged upload."""
+        key = f"{self.session_prefix}{upload_id}"
+        pipe = self.redis_client.pipeline()
+        pipe.hdel(key, "multipart_upload_id")
+        pipe.delete(f"{key}:parts")
+        await pipe.execute()
+    
+    async def exists_many(self, upload_ids: List[str]) -> List[bool]:
+        """Whether each upload still has a session, in one round trip."""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for upload_id in upload_ids:
+            pipe.exists(f"{self.session_prefix}{upload_id}")
+        return [bool(exists) for exists in await pipe.execute()]
+    
+    async def delete(self, upload_id: str):
+        """Remove a finished or abandoned session."""
+        key = f"{self.session_prefix}{upload_id}"
+        await self.redis_client.delete(key, f"{key}:parts")
+
+
+upload_sessions = UploadSessionStore()
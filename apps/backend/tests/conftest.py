@@ -0,0 +1,151 @@
+"""Shared fixtures for backend tests."""
+import types
+from datetime import datetime, timedelta, timezone
+import fakeredis
+import pytest
+from minio.deleteobjects import DeleteError
+from minio.error import S3Error
+
+
+@pytest.fixture
+def redis_server():
+    """An empty in-memory Redis server (with Lua scripting)."""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def fake_redis(redis_server):
+    """Client decoding replies to text, like ``redis_pool.redis_client``."""
+    return fakeredis.aioredis.FakeRedis(server=redis_server, decode_responses=True)
+
+
+@pytest.fixture
+def fake_binary_redis(redis_server):
+    """Client returning bytes, like ``redis_pool.binary_redis_client``."""
+    return fakeredis.aioredis.FakeRedis(server=redis_server)
+
+
+class FakeMinio:
+    """In-memory stand-in for the MinIO client calls the services make."""
+    
+    def __init__(self):
+        self.objects = {}  # Object name -> (data, content type, last modified)
+        self.fail_deletes = set()
+        self.puts = []
+        self.multipart = {}  # Upload ID -> (object name, initiated)
+        self.parts = {}  # Upload ID -> {part number: data}
+    
+    @staticmethod
+    def _missing(object_name: str) -> S3Error:
+        return S3Error("NoSuchKey", "Object does not exist", object_name, "request", "host", None)
+    
+    def bucket_exists(self, bucket_name):
+        return True
+    
+    def put_object(self, bucket_name, object_name, data, length, content_type="application/octet-stream", part_size=0, **kwargs):
+        content = bytearray()
+        while length < 0 or len(content) < length:
+            chunk = data.read((part_size or 65536) if length < 0 else length - len(content))
+            if not chunk:
+                break
+            content.extend(chunk)
+        self.puts.append(object_name)
+        self.objects[object_name] = (bytes(content), content_type, datetime.now(timezone.utc))
+    
+    def stat_object(self, bucket_name, object_name):
+        if object_name not in self.objects:
+            raise self._missing(object_name)
+        data, content_type, last_modified = self.objects[object_name]
+        return types.SimpleNamespace(
+            object_name=object_name,
+            size=len(data),
+            content_type=content_type,
+            last_modified=last_modified,
+            metadata={},
+        )
+    
+    def copy_object(self, bucket_name, object_name, source):
+        if source.object_name not in self.objects:
+            raise self._missing(source.object_name)
+        data, content_type, _ = self.objects[source.object_name]
+        self.objects[object_name] = (data, content_type, datetime.now(timezone.utc))
+    
+    def remove_object(self, bucket_name, object_name):
+        self.objects.pop(object_name, None)
+    
+    def remove_objects(self, bucket_name, delete_object_list):
+        errors = []
+        for delete_object in delete_object_list:
+            name = delete_object._name
+            if name in self.fail_deletes:
+                errors.append(DeleteError("InternalError", "Delete failed", name, None))
+            else:
+                self.objects.pop(name, None)
+        return iter(errors)
+    
+    def list_objects(self, bucket_name, prefix=None, recursive=False):
+        for name, (data, _, last_modified) in sorted(self.objects.items()):
+            if name.startswith(prefix or ""):
+                yield types.SimpleNamespace(object_name=name, size=len(data), last_modified=last_modified)
+    
+    def _create_multipart_upload(self, bucket_name, object_name, headers):
+        upload_id = f"mp-{len(self.multipart) + 1}"
+        self.multipart[upload_id] = (object_name, datetime.now(timezone.utc))
+        return upload_id
+    
+    def _put_object(self, bucket_name, object_name, data, headers, query_params=None):
+        self.puts.append(object_name)
+        self.objects[object_name] = (bytes(data), headers["Content-Type"], datetime.now(timezone.utc))
+    
+    def _upload_part(self, bucket_name, object_name, data, headers, upload_id, part_number):
+        self.parts.setdefault(upload_id, {})[part_number] = bytes(data)
+        return f"etag-{part_number}"
+    
+    def _complete_multipart_upload(self, bucket_name, object_name, upload_id, parts):
+        received = self.parts.pop(upload_id)
+        data = b"".join(received[part.part_number] for part in parts)
+        del self.multipart[upload_id]
+        self.puts.append(object_name)
+        self.objects[object_name] = (data, "application/octet-stream", datetime.now(timezone.utc))
+        return types.SimpleNamespace(
+            bucket_name=bucket_name,
+            object_name=object_name,
+            version_id=None,
+            etag="etag",
+            http_headers={},
+            location=None,
+        )
+    
+    def _abort_multipart_upload(self, bucket_name, object_name, upload_id):
+        if self.multipart.get(upload_id, (None,))[0] != object_name:
+            raise S3Error("NoSuchUpload", "Upload does not exist", object_name, "request", "host", None)
+        del self.multipart[upload_id]
+        self.parts.pop(upload_id, None)
+    
+    def _list_multipart_uploads(self, bucket_name, prefix=None, key_marker=None, upload_id_marker=None, **kwargs):
+        uploads = [
+            types.SimpleNamespace(object_name=object_name, upload_id=upload_id, initiated_time=initiated)
+            for upload_id, (object_name, initiated) in sorted(self.multipart.items(), key=lambda item: item[1])
+            if object_name.startswith(prefix or "")
+        ]
+        return types.SimpleNamespace(uploads=uploads, is_truncated=False, next_key_marker=None, next_upload_id_marker=None)
+    
+    def age(self, object_name: str, seconds: float):
+        """Make an object look ``seconds`` older."""
+        data, content_type, last_modified = self.objects[object_name]
+        self.objects[object_name] = (data, content_type, last_modified - timedelta(seconds=seconds))
+    
+    def age_multipart(self, upload_id: str, seconds: float):
+        """Make a multipart upload look started ``seconds`` earlier."""
+        object_name, initiated = self.multipart[upload_id]
+        self.multipart[upload_id] = (object_name, initiated - timedelta(seconds=seconds))
+
+
+@pytest.fixture
+def fake_minio(monkeypatch):
+    """Empty fake MinIO behind the shared ``storage_service``."""
+    from cv_analyzer.services.storage import storage_service
+    
+    minio = FakeMinio()
+    monkeypatch.setattr(storage_service, "_client", minio)
+    return minio
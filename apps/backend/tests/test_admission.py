@@ -0,0 +1,115 @@
+"""Tests for queue-depth-aware admission control."""
+import pytest
+from fastapi import HTTPException
+from prometheus_client import REGISTRY
+from cv_analyzer.api import common
+from cv_analyzer.core.config import settings
+from cv_analyzer.models.schemas import JobPriority
+from cv_analyzer.services import admission
+from cv_analyzer.services.admission import AdmissionController, QueueEstimate, QueueOverloadedError
+
+
+class StubQueue:
+    """Queue service reporting a fixed size and drain rate."""
+    queue_name = "test_queue"
+    
+    def __init__(self, size: int, drain_rate: float):
+        self.size = size
+        self.drain_rate = drain_rate
+    
+    async def get_drain_stats(self):
+        return self.size, self.drain_rate
+
+
+@pytest.fixture(autouse=True)
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "admission_control_enabled", True)
+    monkeypatch.setattr(settings, "admission_min_queue_depth", 100)
+    monkeypatch.setattr(settings, "admission_max_queue_depth", {"high": 5000, "normal": 2000, "low": 1000})
+    monkeypatch.setattr(settings, "admission_max_wait_seconds", {"high": 3600.0, "normal": 1800.0, "low": 600.0})
+    monkeypatch.setattr(settings, "admission_retry_after_seconds", 60)
+
+
+def use_queue(monkeypatch, size: int, drain_rate: float):
+    monkeypatch.setattr(admission, "queue_service", StubQueue(size, drain_rate))
+
+
+def test_wait_seconds():
+    """Test the wait estimate counts the jobs ahead at the drain rate."""
+    assert QueueEstimate(0, 0.0).wait_seconds() == 0.0
+    assert QueueEstimate(50, 0.0).wait_seconds() is None
+    assert QueueEstimate(50, 10.0).wait_seconds() == 5.0
+    assert QueueEstimate(50, 10.0).wait_seconds(25) == 7.5
+
+
+async def test_admits_short_queue_without_drain_rate(monkeypatch):
+    """Test batches are admitted below the minimum depth even with no drain rate."""
+    use_queue(monkeypatch, 50, 0.0)
+    estimate = await AdmissionController().admit(50, JobPriority.LOW)
+    assert estimate == QueueEstimate(50, 0.0)
+
+
+async def test_rejects_over_queue_depth(monkeypatch):
+    """Test Retry-After is the time to drain the excess over the depth limit."""
+    use_queue(monkeypatch, 950, 10.0)
+    with pytest.raises(QueueOverloadedError) as raised:
+        await AdmissionController().admit(100, JobPriority.LOW)
+    
+    assert raised.value.priority == JobPriority.LOW
+    assert raised.value.retry_after_seconds == 5
+    assert raised.value.estimated_wait_seconds == 104.9
+    assert REGISTRY.get_sample_value(
+        "admission_rejections_total", {"priority": "low", "reason": "queue_depth"}
+    ) >= 1
+
+
+async def test_depth_limit_depends_on_priority(monkeypatch):
+    """Test a queue too deep for low priority jobs still admits higher ones."""
+    use_queue(monkeypatch, 1500, 10.0)
+    with pytest.raises(QueueOverloadedError):
+        await AdmissionController().admit(1, JobPriority.LOW)
+    assert (await AdmissionController().admit(1, JobPriority.NORMAL)).size == 1500
+
+
+async def test_depth_rejection_without_drain_rate(monkeypatch):
+    """Test depth rejections fall back to the configured Retry-After."""
+    use_queue(monkeypatch, 1000, 0.0)
+    with pytest.raises(QueueOverloadedError) as raised:
+        await AdmissionController().admit(1, JobPriority.LOW)
+    assert raised.value.retry_after_seconds == 60
+    assert raised.value.estimated_wait_seconds is None
+
+
+async def test_rejects_over_wait_time(monkeypatch):
+    """Test the last job of a batch must start within the class's maximum wait."""
+    use_queue(monkeypatch, 580, 1.0)
+    await AdmissionController().admit(20, JobPriority.LOW)  # last job waits 599s
+    
+    with pytest.raises(QueueOverloadedError) as raised:
+        await AdmissionController().admit(30, JobPriority.LOW)  # last job waits 609s
+    assert raised.value.retry_after_seconds == 9
+    assert raised.value.estimated_wait_seconds == 609.0
+
+
+async def test_retry_after_is_at_least_one_second(monkeypatch):
+    """Test fractional Retry-After values round up to whole seconds."""
+    use_queue(monkeypatch, 990, 10.0)
+    with pytest.raises(QueueOverloadedError) as raised:
+        await AdmissionController().admit(11, JobPriority.LOW)
+    assert raised.value.retry_after_seconds == 1
+
+
+async def test_disabled_admits_everything(monkeypatch):
+    """Test nothing is rejected with admission control disabled."""
+    monkeypatch.setattr(settings, "admission_control_enabled", False)
+    use_queue(monkeypatch, 100000, 1.0)
+    assert (await AdmissionController().admit(1000, JobPriority.LOW)).size == 100000
+
+
+async def test_api_rejects_with_429_and_retry_after(monkeypatch):
+    """Test the endpoints turn a rejection into 429 with Retry-After."""
+    use_queue(monkeypatch, 950, 10.0)
+    with pytest.raises(HTTPException) as raised:
+        await common.admit(100, JobPriority.LOW)
+    assert raised.value.status_code == 429
+    assert raised.value.headers == {"Retry-After": "5"}
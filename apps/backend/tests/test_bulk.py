@@ -0,0 +1,281 @@
+"""Tests for bulk upload file handling and bulk analysis."""
+import io
+import types
+import zipfile
+import pytest
+from fastapi import HTTPException, UploadFile
+from cv_analyzer.api import bulk, common
+from cv_analyzer.api.bulk import BulkUploadMember
+from cv_analyzer.core.codec import decode_message
+from cv_analyzer.core.config import settings
+from cv_analyzer.models.schemas import BulkAnalyzeRequest
+from cv_analyzer.services import cv_registry as cv_registry_module
+from cv_analyzer.services import job_tracker as job_tracker_module
+from cv_analyzer.services import queue as queue_module
+from cv_analyzer.services.admission import QueueEstimate
+from cv_analyzer.services.cv_registry import CVRegistry
+from cv_analyzer.services.job_tracker import JobTracker
+from cv_analyzer.services.queue import QueueService
+from cv_analyzer.services.storage import FileTooLargeError
+
+
+class StubStore:
+    """Replacement for ``store_cv`` that reads the stream like storage does."""
+    
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.stored = {}
+    
+    async def __call__(self, stream, filename, content_type, size):
+        data = stream.read()
+        if self.error:
+            raise self.error
+        self.stored[filename] = data
+        return {"cv_id": f"cv-{len(self.stored)}", "size_bytes": len(data), "sha256": "ab" * 32, "deduplicated": False}
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = StubStore()
+    monkeypatch.setattr(bulk, "store_cv", store)
+    return store
+
+
+def zip_upload(members: dict) -> UploadFile:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return UploadFile(buffer, size=len(buffer.getvalue()), filename="cvs.zip")
+
+
+def plain_member(filename: str = "cv.pdf", data: bytes = b"%PDF-1.4") -> BulkUploadMember:
+    return BulkUploadMember(filename, "application/pdf", len(data), lambda: io.BytesIO(data))
+
+
+def test_members_expand_zip_archives():
+    """Test zip uploads are replaced by their files, skipping folders and archiver metadata."""
+    archives = []
+    files = [
+        UploadFile(io.BytesIO(b"text"), size=4, filename="a.txt"),
+        zip_upload({"cvs/": b"", "cvs/b.pdf": b"%PDF", "__MACOSX/cvs/._b.pdf": b"", "cvs/.DS_Store": b""}),
+    ]
+    members = bulk._bulk_upload_members(files, archives)
+    
+    assert [(member.filename, member.content_type, member.size) for member in members] == [
+        ("a.txt", "application/octet-stream", 4),
+        ("cvs/b.pdf", "application/pdf", 4),
+    ]
+    assert len(archives) == 1
+    with members[1].open_stream() as stream:
+        assert stream.read() == b"%PDF"
+
+
+def test_members_report_invalid_zip():
+    """Test an upload named .zip that is not an archive gets an error entry."""
+    members = bulk._bulk_upload_members([UploadFile(io.BytesIO(b"nope"), size=4, filename="cvs.zip")], [])
+    assert members[0].error == "Invalid zip archive"
+    assert bulk._bulk_member_error(members[0]) == "Invalid zip archive"
+
+
+def test_member_error_checks_type_and_size(monkeypatch):
+    """Test members are validated by extension and declared size."""
+    monkeypatch.setattr(settings, "max_file_size_mb", 1)
+    assert bulk._bulk_member_error(plain_member()) is None
+    assert "File type not allowed" in bulk._bulk_member_error(plain_member("cv.exe"))
+    too_large = BulkUploadMember("cv.pdf", "application/pdf", 1024 * 1024 + 1, None)
+    assert bulk._bulk_member_error(too_large) == "File too large. Max size: 1MB"
+
+
+async def test_store_member(store):
+    """Test a member is stored from its stream."""
+    result = await bulk._store_bulk_member(plain_member(), False, None, None)
+    assert result.cv_id == "cv-1"
+    assert result.size_bytes == 8
+    assert result.job_id is None
+    assert result.error is None
+    assert store.stored == {"cv.pdf": b"%PDF-1.4"}
+
+
+async def test_store_member_too_large(monkeypatch):
+    """Test content over the size limit is reported on the member."""
+    monkeypatch.setattr(bulk, "store_cv", StubStore(FileTooLargeError(10)))
+    result = await bulk._store_bulk_member(plain_member(), False, None, None)
+    assert result.cv_id is None
+    assert result.error == f"File too large. Max size: {settings.max_file_size_mb}MB"
+
+
+async def test_store_member_corrupt_zip_member(store):
+    """Test a zip member failing its CRC check is reported as unreadable."""
+    upload = zip_upload({"cv.pdf": b"%PDF-1.4 original"})
+    data = upload.file.getvalue().replace(b"original", b"tampered")
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    member = BulkUploadMember("cv.pdf", "application/pdf", 17, lambda: archive.open("cv.pdf"))
+    
+    result = await bulk._store_bulk_member(member, False, None, None)
+    assert result.error.startswith("Unreadable zip member")
+    assert store.stored == {}
+
+
+async def test_store_member_storage_failure(monkeypatch):
+    """Test an unexpected storage error fails only that member."""
+    monkeypatch.setattr(bulk, "store_cv", StubStore(ConnectionError("MinIO unreachable")))
+    result = await bulk._store_bulk_member(plain_member(), False, None, None)
+    assert result.error == "Upload failed"
+
+
+async def test_store_member_enqueues_analysis(store, monkeypatch):
+    """Test analysis is enqueued for a stored member when requested."""
+    enqueued = []
+    
+    async def enqueue(analyses):
+        enqueued.extend(analyses)
+        return [{"job_id": "job-1"}]
+    
+    monkeypatch.setattr(bulk, "enqueue_analyses", enqueue)
+    result = await bulk._store_bulk_member(plain_member(), True, "openai", "v2")
+    assert result.job_id == "job-1"
+    assert result.error is None
+    assert [(cv_id, provider, version) for cv_id, _, provider, version in enqueued] == [("cv-1", "openai", "v2")]
+
+
+async def test_store_member_enqueue_failure_keeps_cv(store, monkeypatch):
+    """Test a stored member whose job could not be enqueued keeps its CV ID."""
+    async def enqueue(analyses):
+        raise ConnectionError("Redis unreachable")
+    
+    monkeypatch.setattr(bulk, "enqueue_analyses", enqueue)
+    result = await bulk._store_bulk_member(plain_member(), True, None, None)
+    assert result.cv_id == "cv-1"
+    assert result.job_id is None
+    assert result.error == "Stored, but the analysis could not be queued"
+
+
+@pytest.fixture
+def analysis_backend(monkeypatch, fake_redis, fake_binary_redis, fake_minio):
+    """Queue, job tracker and CV registry on fake Redis and MinIO, with admission always granted."""
+    monkeypatch.setattr(queue_module, "binary_redis_client", fake_binary_redis)
+    monkeypatch.setattr(job_tracker_module, "redis_client", fake_redis)
+    monkeypatch.setattr(job_tracker_module, "binary_redis_client", fake_binary_redis)
+    monkeypatch.setattr(cv_registry_module, "redis_client", fake_redis)
+    backend = types.SimpleNamespace(
+        queue=QueueService(),
+        tracker=JobTracker(),
+        registry=CVRegistry(),
+        admitted=[],
+    )
+    monkeypatch.setattr(common, "queue_service", backend.queue)
+    monkeypatch.setattr(common, "job_tracker", backend.tracker)
+    monkeypatch.setattr(bulk, "cv_registry", backend.registry)
+    
+    async def admit(job_count, priority):
+        backend.admitted.append(job_count)
+        return QueueEstimate(size=0, drain_rate=2.0)
+    
+    monkeypatch.setattr(bulk, "admit", admit)
+    return backend
+
+
+async def register_cvs(registry: CVRegistry, *cv_ids: str):
+    for n, cv_id in enumerate(cv_ids):
+        sha256 = f"{n:064x}"
+        await registry.register(cv_id, f"{cv_id}.pdf", "application/pdf", 8, f"blobs/{sha256}", sha256)
+
+
+async def queued_messages(queue: QueueService):
+    """Queued job messages in dequeue order."""
+    return [decode_message(raw) for raw in reversed(await queue.redis_client.lrange(queue.queue_name, 0, -1))]
+
+
+async def test_enqueue_analyses_writes_chunks(analysis_backend, monkeypatch):
+    """Test jobs go out in one transaction per chunk, each with its tracker record."""
+    monkeypatch.setattr(settings, "bulk_analyze_chunk_size", 2)
+    await register_cvs(analysis_backend.registry, "cv-1", "cv-2")
+    cv_metadata = await analysis_backend.registry.get_many(["cv-1", "cv-2"])
+    pipelines = []
+    pipeline = analysis_backend.queue.redis_client.pipeline
+    monkeypatch.setattr(
+        analysis_backend.queue.redis_client,
+        "pipeline",
+        lambda *args, **kwargs: pipelines.append(kwargs) or pipeline(*args, **kwargs),
+    )
+    analyses = [
+        (cv_id, metadata, provider, "v1")
+        for cv_id, metadata in zip(["cv-1", "cv-2"], cv_metadata)
+        for provider in ("openai", "anthropic")
+    ] + [("cv-1", cv_metadata[0], "openai", "v2")]
+    
+    jobs = await common.enqueue_analyses(analyses)
+    
+    assert len(pipelines) == 3
+    assert [(job["cv_id"], job["provider"], job["prompt_version"]) for job in jobs] == [
+        (cv_id, provider, version) for cv_id, _, provider, version in analyses
+    ]
+    messages = await queued_messages(analysis_backend.queue)
+    assert [message["job_id"] for message in messages] == [job["job_id"] for job in jobs]
+    assert messages[0]["metadata"]["object_name"] == cv_metadata[0]["object_name"]
+    records = await analysis_backend.tracker.get_jobs([job["job_id"] for job in jobs], timeline_limit=0)
+    assert [records[job["job_id"]][0]["status"] for job in jobs] == ["pending"] * 5
+
+
+async def test_bulk_analyze_crosses_and_deduplicates(analysis_backend):
+    """Test repeated CVs, providers and prompt versions produce each combination once."""
+    await register_cvs(analysis_backend.registry, "cv-1", "cv-2")
+    request = BulkAnalyzeRequest(
+        cv_ids=["cv-1", "cv-2", "cv-1"],
+        providers=["openai", "anthropic", "openai"],
+        prompt_versions=["v1", "v2", "v1"],
+    )
+    
+    response = await bulk.bulk_analyze_cv(request)
+    
+    combinations = [(job.cv_id, job.provider, job.prompt_version) for job in response.jobs]
+    assert combinations == [
+        (cv_id, provider, version)
+        for cv_id in ("cv-1", "cv-2")
+        for provider in ("openai", "anthropic")
+        for version in ("v1", "v2")
+    ]
+    assert analysis_backend.admitted == [8]
+    assert [job.estimated_wait_seconds for job in response.jobs[:3]] == [0.0, 0.5, 1.0]
+    assert len(await queued_messages(analysis_backend.queue)) == 8
+    assert response.not_found == []
+
+
+async def test_bulk_analyze_reports_not_found(analysis_backend):
+    """Test unknown CVs are listed in ``not_found`` and the others still get jobs."""
+    await register_cvs(analysis_backend.registry, "cv-1")
+    
+    response = await bulk.bulk_analyze_cv(BulkAnalyzeRequest(cv_ids=["missing", "cv-1", "gone"]))
+    
+    assert [job.cv_id for job in response.jobs] == ["cv-1"]
+    assert response.jobs[0].provider == settings.default_provider
+    assert response.not_found == ["missing", "gone"]
+    assert analysis_backend.admitted == [1]
+
+
+async def test_bulk_analyze_all_not_found(analysis_backend):
+    """Test a request whose CVs are all unknown creates no jobs."""
+    response = await bulk.bulk_analyze_cv(BulkAnalyzeRequest(cv_ids=["missing"]))
+    
+    assert response.jobs == []
+    assert response.not_found == ["missing"]
+    assert await queued_messages(analysis_backend.queue) == []
+
+
+async def test_bulk_analyze_rejects_too_many_jobs(analysis_backend, monkeypatch):
+    """Test the job count after removing duplicates is checked against ``bulk_analyze_max_jobs``."""
+    monkeypatch.setattr(settings, "bulk_analyze_max_jobs", 4)
+    await register_cvs(analysis_backend.registry, "cv-1", "cv-2")
+    
+    request = BulkAnalyzeRequest(cv_ids=["cv-1", "cv-2", "cv-2"], providers=["openai", "anthropic", "openai"])
+    response = await bulk.bulk_analyze_cv(request)
+    assert len(response.jobs) == 4
+    
+    request = BulkAnalyzeRequest(cv_ids=["cv-1", "cv-2", "cv-3"], providers=["openai", "anthropic"])
+    with pytest.raises(HTTPException) as error:
+        await bulk.bulk_analyze_cv(request)
+    assert error.value.status_code == 400
+    assert error.value.detail == "Too many jobs. Max: 4"
+    assert analysis_backend.admitted == [4]
@@ -0,0 +1,124 @@
+"""Tests for the CV index and blob reference counting."""
+import threading
+import time
+from datetime import datetime, timezone
+import pytest
+from cv_analyzer.services import cv_registry as cv_registry_module
+from cv_analyzer.services.cv_registry import (
+    CVRegistry,
+    BlobDeletingError,
+    BLOB_DELETE_LOCK_SECONDS,
+    LEGACY_LOOKUP_CONCURRENCY,
+)
+from cv_analyzer.services.storage import storage_service
+
+SHA256 = "ab" * 32
+
+
+@pytest.fixture
+def registry(monkeypatch, fake_redis):
+    monkeypatch.setattr(cv_registry_module, "redis_client", fake_redis)
+    return CVRegistry()
+
+
+async def register(registry: CVRegistry, cv_id: str, sha256: str = SHA256):
+    return await registry.register(
+        cv_id=cv_id,
+        filename="cv.pdf",
+        content_type="application/pdf",
+        size_bytes=5,
+        object_name=f"blobs/{sha256}",
+        sha256=sha256,
+    )
+
+
+async def test_register_references_blob(registry):
+    """Test each CV takes a reference on its blob and gets a retention deadline."""
+    await register(registry, "cv-1")
+    await register(registry, "cv-2")
+    
+    assert await registry.get_blob_refs(SHA256) == 2
+    assert (await registry.get("cv-1"))["size_bytes"] == 5
+    assert await registry.redis_client.zrange("cvs:expiry", 0, -1) == ["cv-1", "cv-2"]
+
+
+async def test_release_drops_last_reference(registry):
+    """Test releasing CVs counts references down and removes the count at zero."""
+    await register(registry, "cv-1")
+    await register(registry, "cv-2")
+    
+    released = await registry.release("cv-1")
+    assert released == {"sha256": SHA256, "remaining_refs": 1, "object_name": f"blobs/{SHA256}", "size_bytes": 5}
+    assert (await registry.release("cv-2"))["remaining_refs"] == 0
+    assert not await registry.redis_client.exists(f"blob:refs:{SHA256}", "cv:cv-1", "cv:cv-2")
+    assert await registry.redis_client.zcard("cvs:expiry") == 0
+    assert await registry.release("cv-2") is None
+
+
+async def test_release_without_blob_hash(registry):
+    """Test CVs registered without a hash release without touching reference counts."""
+    await registry.register("cv-1", "cv.pdf", "application/pdf", 5, "cvs/cv-1/cv.pdf")
+    released = await registry.release("cv-1")
+    assert released["sha256"] == ""
+    assert released["remaining_refs"] == 0
+
+
+async def test_lock_skips_referenced_blobs(registry):
+    """Test only blobs nobody references are locked for deletion."""
+    unreferenced = "cd" * 32
+    await register(registry, "cv-1")
+    
+    assert await registry.lock_unreferenced_blobs([SHA256, unreferenced]) == [unreferenced]
+    assert not await registry.redis_client.exists(f"blob:deleting:{SHA256}")
+    assert 0 < await registry.redis_client.pttl(f"blob:deleting:{unreferenced}") <= BLOB_DELETE_LOCK_SECONDS * 1000
+
+
+async def test_register_refuses_locked_blob(registry):
+    """Test a CV cannot reference a blob locked for deletion until it is unlocked."""
+    await register(registry, "cv-1")
+    await registry.release("cv-1")
+    assert await registry.lock_unreferenced_blobs([SHA256]) == [SHA256]
+    
+    with pytest.raises(BlobDeletingError):
+        await register(registry, "cv-2")
+    assert not await registry.redis_client.exists("cv:cv-2", f"blob:refs:{SHA256}")
+    assert await registry.redis_client.zcard("cvs:expiry") == 0
+    
+    await registry.unlock_blobs([SHA256])
+    await register(registry, "cv-2")
+    assert await registry.get_blob_refs(SHA256) == 1
+
+
+async def test_get_many_backfills_legacy_cvs(registry, fake_minio):
+    """Test CVs missing from the index are resolved from storage and registered, in request order."""
+    await register(registry, "cv-1")
+    fake_minio.objects["cvs/legacy"] = (b"%PDF-1.4", "application/pdf", datetime.now(timezone.utc))
+    
+    records = await registry.get_many(["legacy", "missing", "cv-1"])
+    
+    assert [record and record["cv_id"] for record in records] == ["legacy", None, "cv-1"]
+    assert records[0]["object_name"] == "cvs/legacy"
+    assert records[0]["size_bytes"] == 8
+    assert await registry.registered_many(["legacy", "missing"]) == [True, False]
+
+
+async def test_get_many_bounds_concurrent_storage_lookups(registry, monkeypatch):
+    """Test legacy lookups run concurrently, at most ``LEGACY_LOOKUP_CONCURRENCY`` at once."""
+    running, peak = [], []
+    lock = threading.Lock()
+    
+    def stat_file(cv_id):
+        with lock:
+            running.append(cv_id)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(cv_id)
+        return None
+    
+    monkeypatch.setattr(storage_service, "stat_file", stat_file)
+    
+    records = await registry.get_many([f"missing-{n}" for n in range(3 * LEGACY_LOOKUP_CONCURRENCY)])
+    
+    assert records == [None] * (3 * LEGACY_LOOKUP_CONCURRENCY)
+    assert max(peak) == LEGACY_LOOKUP_CONCURRENCY
@@ -0,0 +1,263 @@
+"""Tests for job event fan-out, the event stream and long-polling."""
+import asyncio
+import pytest
+from cv_analyzer.api import main
+from cv_analyzer.core.codec import decode_event
+from cv_analyzer.core.config import settings
+from cv_analyzer.models.schemas import JobStatus
+from cv_analyzer.services import job_events
+from cv_analyzer.services import job_tracker as job_tracker_module
+from cv_analyzer.services.job_events import JobEventHub
+from cv_analyzer.services.job_tracker import JobTracker
+
+
+@pytest.fixture
+def tracker(monkeypatch, fake_redis, fake_binary_redis):
+    monkeypatch.setattr(job_tracker_module, "redis_client", fake_redis)
+    monkeypatch.setattr(job_tracker_module, "binary_redis_client", fake_binary_redis)
+    tracker = JobTracker()
+    monkeypatch.setattr(main, "job_tracker", tracker)
+    return tracker
+
+
+@pytest.fixture
+async def hub(monkeypatch, fake_binary_redis):
+    monkeypatch.setattr(job_events, "binary_redis_client", fake_binary_redis)
+    monkeypatch.setattr(job_events, "RECONNECT_DELAY_SECONDS", 0)
+    hub = JobEventHub()
+    monkeypatch.setattr(main, "job_event_hub", hub)
+    yield hub
+    await hub.close()
+
+
+class FakeRequest:
+    """Request whose client disconnects when ``disconnected`` is set."""
+    
+    def __init__(self):
+        self.disconnected = False
+    
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+async def until(predicate, timeout: float = 2.0):
+    """Wait for the hub's reader task to make ``predicate()`` true."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def subscribers(redis_client, job_id: str) -> int:
+    [(_, count)] = await redis_client.pubsub_numsub(f"job-events:{job_id}")
+    return count
+
+
+def stream_queue(hub: JobEventHub, job_id: str) -> asyncio.Queue:
+    [queue] = hub._streams[f"job-events:{job_id}"]
+    return queue
+
+
+def sse_seq(frame: str) -> int:
+    return int(frame.split("\n", 1)[0].removeprefix("id: "))
+
+
+async def test_subscribers_receive_published_events(hub, fake_redis):
+    """Test a message reaches every stream of its job and none of another's."""
+    async with hub.subscribe("job-1") as first, hub.subscribe("job-1") as second, hub.subscribe("job-2") as other:
+        await fake_redis.publish("job-events:job-1", "event")
+        await until(lambda: not first.empty() and not second.empty())
+        
+        assert first.get_nowait() == b"event"
+        assert second.get_nowait() == b"event"
+        assert other.empty()
+
+
+async def test_last_stream_closing_unsubscribes(hub, fake_redis):
+    """Test the channel is kept while any stream is open and dropped after the last."""
+    async with hub.subscribe("job-1"):
+        async with hub.subscribe("job-1"):
+            assert await subscribers(fake_redis, "job-1") == 1
+        assert await subscribers(fake_redis, "job-1") == 1
+    
+    assert await subscribers(fake_redis, "job-1") == 0
+    assert hub._streams == {}
+
+
+async def test_lagging_stream_gets_resync_marker(hub, fake_redis, monkeypatch):
+    """Test a full queue is replaced by a single ``None`` marker."""
+    monkeypatch.setattr(job_events, "STREAM_QUEUE_SIZE", 2)
+    async with hub.subscribe("job-1") as queue:
+        for n in range(3):
+            await fake_redis.publish("job-events:job-1", f"event-{n}")
+        await until(lambda: queue.qsize() == 1 and queue._queue[0] is None)
+        
+        await fake_redis.publish("job-events:job-1", "event-3")
+        await until(lambda: queue.qsize() == 2)
+        assert [queue.get_nowait(), queue.get_nowait()] == [None, b"event-3"]
+
+
+async def test_reader_failure_resubscribes_and_marks_streams(hub, fake_redis):
+    """Test a failed read restores subscriptions and tells streams to resync."""
+    async with hub.subscribe("job-1") as queue:
+        get_message = hub._pubsub.get_message
+        failures = []
+        
+        async def failing_get_message(**kwargs):
+            if not failures:
+                failures.append(True)
+                raise ConnectionError("connection lost")
+            return await get_message(**kwargs)
+        
+        hub._pubsub.get_message = failing_get_message
+        await until(lambda: not queue.empty())
+        assert queue.get_nowait() is None
+        
+        await fake_redis.publish("job-events:job-1", "event")
+        await until(lambda: not queue.empty())
+        assert queue.get_nowait() == b"event"
+
+
+async def test_subscribe_restarts_a_dead_reader(hub, fake_redis):
+    """Test a new stream starts a reader when the previous one has stopped."""
+    async with hub.subscribe("job-1"):
+        hub._reader.cancel()
+        await asyncio.gather(hub._reader, return_exceptions=True)
+    
+    async with hub.subscribe("job-1") as queue:
+        assert not hub._reader.done()
+        await fake_redis.publish("job-events:job-1", "event")
+        await until(lambda: not queue.empty())
+        assert queue.get_nowait() == b"event"
+
+
+async def test_stream_resumes_after_last_event_id(hub, tracker):
+    """Test a reconnecting client only gets events after the one it last saw."""
+    await tracker.create_job("job-1", "cv-1", "openai")
+    await tracker.transition("job-1", JobStatus.PROCESSING)
+    await tracker.transition("job-1", JobStatus.COMPLETED)
+    
+    frames = [frame async for frame in main._job_event_stream(FakeRequest(), "job-1", 1, terminal=True)]
+    
+    assert frames[0] == "retry: 3000\n\n"
+    assert [sse_seq(frame) for frame in frames[1:]] == [2, 3]
+
+
+async def test_stream_fills_a_gap_from_the_timeline(hub, tracker):
+    """Test an event that skips ahead makes the stream re-read the missed ones."""
+    await tracker.create_job("job-1", "cv-1", "openai")
+    stream = main._job_event_stream(FakeRequest(), "job-1", 0, terminal=False)
+    assert await anext(stream) == "retry: 3000\n\n"
+    assert sse_seq(await anext(stream)) == 1
+    
+    await tracker.transition("job-1", JobStatus.PROCESSING)
+    await tracker.add_timeline_event("job-1", "analysis_started", "Started")
+    queue = stream_queue(hub, "job-1")
+    await until(lambda: queue.qsize() == 2)
+    assert decode_event(queue.get_nowait())["seq"] == 2  # Lost in transit
+    
+    assert [sse_seq(await anext(stream)), sse_seq(await anext(stream))] == [2, 3]
+    await stream.aclose()
+
+
+async def test_lagging_stream_resyncs_from_the_timeline(hub, tracker, monkeypatch):
+    """Test a stream whose queue overflowed re-reads the timeline without duplicates."""
+    monkeypatch.setattr(job_events, "STREAM_QUEUE_SIZE", 1)
+    await tracker.create_job("job-1", "cv-1", "openai")
+    stream = main._job_event_stream(FakeRequest(), "job-1", 0, terminal=False)
+    await anext(stream)
+    assert sse_seq(await anext(stream)) == 1
+    
+    await tracker.transition("job-1", JobStatus.PROCESSING)
+    await tracker.transition("job-1", JobStatus.COMPLETED)
+    queue = stream_queue(hub, "job-1")
+    await until(lambda: queue.qsize() == 1 and queue._queue[0] is None)
+    
+    frames = [frame async for frame in stream]
+    assert [sse_seq(frame) for frame in frames] == [2, 3]
+
+
+async def test_stream_ends_and_unsubscribes_on_disconnect(hub, tracker, fake_redis, monkeypatch):
+    """Test a disconnected client ends the stream at its next check and frees the channel."""
+    monkeypatch.setattr(settings, "sse_heartbeat_seconds", 0.01)
+    await tracker.create_job("job-1", "cv-1", "openai")
+    request = FakeRequest()
+    stream = main._job_event_stream(request, "job-1", 0, terminal=False)
+    await anext(stream)
+    await anext(stream)
+    assert await subscribers(fake_redis, "job-1") == 1
+    
+    assert await anext(stream) == ": heartbeat\n\n"
+    request.disconnected = True
+    assert [frame async for frame in stream] == []
+    
+    assert await subscribers(fake_redis, "job-1") == 0
+    assert hub._streams == {}
+
+
+async def test_closed_stream_unsubscribes(hub, tracker, fake_redis):
+    """Test closing the response mid-stream releases the subscription."""
+    await tracker.create_job("job-1", "cv-1", "openai")
+    stream = main._job_event_stream(FakeRequest(), "job-1", 0, terminal=False)
+    await anext(stream)
+    
+    await stream.aclose()
+    
+    assert await subscribers(fake_redis, "job-1") == 0
+    assert hub._streams == {}
+
+
+async def test_wait_returns_early_on_change(hub, tracker):
+    """Test a status change wakes a long-poll well before its timeout."""
+    await tracker.create_job("job-1", "cv-1", "openai")
+    waiter = asyncio.create_task(main._wait_for_job_change("job-1", since=1, timeout=30))
+    await until(lambda: "job-events:job-1" in hub._streams)
+    
+    await tracker.transition("job-1", JobStatus.PROCESSING)
+    job = await asyncio.wait_for(waiter, timeout=2)
+    
+    assert job["status"] == "processing"
+    assert job["version"] == 2
+    assert hub._streams == {}
+
+
+async def test_wait_times_out_with_current_state(hub, tracker):
+    """Test a job that does not change is returned as it is once the wait ends."""
+    await tracker.create_job("job-1", "cv-1", "openai")
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    
+    job = await main._wait_for_job_change("job-1", since=1, timeout=0.2)
+    
+    assert loop.time() - started >= 0.2
+    assert job["status"] == "pending"
+    assert job["version"] == 1
+
+
+@pytest.mark.parametrize("since", [1, 5])
+async def test_wait_holds_while_since_is_current(hub, tracker, since):
+    """Test ``since`` at or past the job's version waits instead of answering at once."""
+    await tracker.create_job("job-1", "cv-1", "openai")
+    waiter = asyncio.create_task(main._wait_for_job_change("job-1", since=since, timeout=30))
+    await until(lambda: "job-events:job-1" in hub._streams)
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+    
+    await tracker.transition("job-1", JobStatus.FAILED, error="Provider timed out")
+    job = await asyncio.wait_for(waiter, timeout=2)
+    assert job["status"] == "failed"
+
+
+async def test_wait_answers_at_once_when_behind_or_final(hub, tracker):
+    """Test a stale ``since`` or a finished job returns without waiting."""
+    await tracker.create_job("job-1", "cv-1", "openai")
+    await tracker.transition("job-1", JobStatus.PROCESSING)
+    
+    job = await asyncio.wait_for(main._wait_for_job_change("job-1", since=1, timeout=30), timeout=1)
+    assert job["version"] == 2
+    
+    await tracker.transition("job-1", JobStatus.COMPLETED)
+    job = await asyncio.wait_for(main._wait_for_job_change("job-1", since=10, timeout=30), timeout=1)
+    assert job["status"] == "completed"
+    
+    assert await main._wait_for_job_change("missing", since=0, timeout=30) is None
@@ -0,0 +1,257 @@
+"""Tests for atomic job status transitions and job lookups."""
+import json
+import string
+import pytest
+from fastapi import HTTPException
+from cv_analyzer.api import main
+from cv_analyzer.core.codec import decode_event
+from cv_analyzer.core.config import settings
+from cv_analyzer.models.schemas import JobStatus, JobStatusBulkRequest
+from cv_analyzer.services import job_tracker as job_tracker_module
+from cv_analyzer.services.job_tracker import JobTracker, InvalidTransitionError
+
+
+@pytest.fixture(params=["msgpack", "json"])
+def tracker(request, monkeypatch, fake_redis, fake_binary_redis):
+    monkeypatch.setattr(settings, "redis_wire_format", request.param)
+    monkeypatch.setattr(job_tracker_module, "redis_client", fake_redis)
+    monkeypatch.setattr(job_tracker_module, "binary_redis_client", fake_binary_redis)
+    return JobTracker()
+
+
+async def stored_events(tracker: JobTracker, job_id: str):
+    """Timeline entries as stored, oldest first."""
+    entries = await tracker.binary_client.lrange(f"timeline:{job_id}", 0, -1)
+    return [decode_event(entry) for entry in reversed(entries)]
+
+
+async def test_transitions_update_status_indexes_and_timeline(tracker):
+    """Test each transition moves the job between indexes and appends a numbered event."""
+    await tracker.create_job("job-1", "cv-1", "openai")
+    
+    job = await tracker.transition("job-1", JobStatus.PROCESSING)
+    assert job["status"] == "processing"
+    assert job["version"] == 2
+    assert await tracker.redis_client.zrange("jobs:index:status:pending", 0, -1) == []
+    assert await tracker.redis_client.zrange("jobs:index:status:processing", 0, -1) == ["job-1"]
+    
+    job = await tracker.transition("job-1", JobStatus.COMPLETED, "analysis_completed", "Done", {"score": 80})
+    assert job["status"] == "completed"
+    assert job["version"] == 3
+    assert await tracker.redis_client.zrange("jobs:index:status:completed", 0, -1) == ["job-1"]
+    
+    events = await stored_events(tracker, "job-1")
+    assert [(event["seq"], event["event"]) for event in events] == [
+        (1, "job_created"),
+        (2, "status_changed"),
+        (3, "analysis_completed"),
+    ]
+    assert events[1]["status"] == "processing"
+    assert events[2]["metadata"] == {"score": 80}
+
+
+async def test_transition_stores_error(tracker):
+    """Test a failure message is stored on the job."""
+    await tracker.create_job("job-1", "cv-1", "openai")
+    job = await tracker.transition("job-1", JobStatus.FAILED, error="Provider timed out")
+    assert job["status"] == "failed"
+    assert job["error"] == "Provider timed out"
+
+
+async def test_invalid_transition_changes_nothing(tracker):
+    """Test a disallowed transition raises and leaves the job as it was."""
+    await tracker.create_job("job-1", "cv-1", "openai")
+    await tracker.transition("job-1", JobStatus.FAILED)
+    
+    with pytest.raises(InvalidTransitionError, match="failed -> processing"):
+        await tracker.transition("job-1", JobStatus.PROCESSING)
+    job = await tracker.get_job("job-1")
+    assert job["status"] == "failed"
+    assert job["version"] == 2
+    assert len(await stored_events(tracker, "job-1")) == 2
+
+
+async def test_transition_of_missing_job(tracker):
+    """Test transitioning an unknown job raises ValueError."""
+    with pytest.raises(ValueError, match="not found"):
+        await tracker.transition("missing", JobStatus.PROCESSING)
+    assert not await tracker.redis_client.exists("job:missing", "timeline:missing")
+
+
+@pytest.mark.parametrize("version", [126, 65534, 70000])
+async def test_sequence_numbers_of_every_size(tracker, version):
+    """Test the script encodes one-, three- and five-byte sequence numbers."""
+    await tracker.create_job("job-1", "cv-1", "openai")
+    await tracker.redis_client.hset("job:job-1", "version", version)
+    await tracker.transition("job-1", JobStatus.PROCESSING)
+    await tracker.transition("job-1", JobStatus.COMPLETED)
+    
+    events = await stored_events(tracker, "job-1")
+    assert [event["seq"] for event in events[1:]] == [version + 1, version + 2]
+    assert [event["status"] for event in events[1:]] == ["processing", "completed"]
+
+
+async def test_transition_migrates_legacy_record(tracker):
+    """Test a job stored as a JSON string is converted to a hash before transitioning."""
+    legacy = {"job_id": "job-1", "cv_id": "cv-1", "status": "pending", "provider": "openai", "prompt_version": None}
+    await tracker.redis_client.set("job:job-1", json.dumps(legacy), ex=600)
+    
+    job = await tracker.transition("job-1", JobStatus.PROCESSING)
+    assert job["status"] == "processing"
+    assert job["cv_id"] == "cv-1"
+    assert await tracker.redis_client.type("job:job-1") == "hash"
+
+
+def new_jobs(job_ids, cv_id="cv-1"):
+    return [{"job_id": job_id, "cv_id": cv_id, "provider": "openai", "prompt_version": None} for job_id in job_ids]
+
+
+async def page_through(tracker: JobTracker, limit: int, **filters):
+    """Follow ``next_cursor`` to the end; returns the job IDs of each page."""
+    pages, cursor = [], None
+    while True:
+        jobs, cursor = await tracker.list_jobs(cursor=cursor, limit=limit, **filters)
+        pages.append([job["job_id"] for job in jobs])
+        if cursor is None:
+            return pages
+        assert len(pages) < 20, "cursor does not advance"
+
+
+async def test_list_jobs_pages_through_equal_scores(tracker):
+    """Test jobs created in one batch (equal index scores) are each listed exactly once."""
+    await tracker.create_jobs(new_jobs([f"job-{n:02d}" for n in range(7)]))
+    await tracker.create_jobs(new_jobs(["later-1", "later-2"]))
+    
+    pages = await page_through(tracker, limit=3)
+    
+    assert [len(page) for page in pages] == [3, 3, 3, 0]
+    listed = [job_id for page in pages for job_id in page]
+    assert listed == await tracker.redis_client.zrevrange("jobs:index:created", 0, -1)
+    assert len(set(listed)) == 9
+    assert listed[:2] == ["later-2", "later-1"]
+
+
+async def test_list_jobs_last_page_has_no_cursor(tracker):
+    """Test a page shorter than the limit ends the listing."""
+    await tracker.create_jobs(new_jobs(["job-1", "job-2", "job-3"]))
+    
+    jobs, cursor = await tracker.list_jobs(limit=5)
+    
+    assert [job["job_id"] for job in jobs] == ["job-3", "job-2", "job-1"]
+    assert cursor is None
+
+
+async def test_list_jobs_by_status_pages_through_ties(tracker):
+    """Test the status index pages like the creation index and skips other statuses."""
+    await tracker.create_jobs(new_jobs([f"job-{n}" for n in range(6)]))
+    for job_id in ("job-0", "job-2", "job-3", "job-5"):
+        await tracker.transition(job_id, JobStatus.PROCESSING)
+    
+    pages = await page_through(tracker, limit=2, status="processing")
+    assert [job_id for page in pages for job_id in page] == ["job-5", "job-3", "job-2", "job-0"]
+    
+    pages = await page_through(tracker, limit=2, status="pending")
+    assert [job_id for page in pages for job_id in page] == ["job-4", "job-1"]
+
+
+async def test_list_jobs_by_cv_and_status(tracker):
+    """Test the CV index filtered by status pages past non-matching jobs without repeats."""
+    await tracker.create_jobs(new_jobs([f"job-{n}" for n in range(8)]))
+    await tracker.create_jobs(new_jobs(["other-1", "other-2"], cv_id="cv-2"))
+    for job_id in ("job-1", "job-4", "job-6", "job-7", "other-1"):
+        await tracker.transition(job_id, JobStatus.PROCESSING)
+    
+    pages = await page_through(tracker, limit=2, cv_id="cv-1", status="processing")
+    assert [job_id for page in pages for job_id in page] == ["job-7", "job-6", "job-4", "job-1"]
+    
+    pages = await page_through(tracker, limit=3, cv_id="cv-2")
+    assert pages == [["other-2", "other-1"]]
+
+
+async def test_list_jobs_cursor_round_trip(tracker):
+    """Test the cursor encodes the last job's score and ID, which may contain colons."""
+    score = 1718000000.123456
+    cursor = tracker._encode_cursor(score, "job:with:colons")
+    
+    assert tracker._decode_cursor(cursor) == (score, "job:with:colons")
+    assert set(cursor) <= set(string.ascii_letters + string.digits + "-_=")
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "bm8tY29sb24=", "YWJjOmpvYi0x"])
+async def test_list_jobs_rejects_invalid_cursor(tracker, cursor):
+    """Test a malformed cursor raises ValueError."""
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        await tracker.list_jobs(cursor=cursor)
+
+
+async def test_get_jobs_keeps_request_order_and_skips_missing(tracker, monkeypatch):
+    """Test one pipeline reads every job, in request order, leaving out unknown IDs."""
+    await tracker.create_jobs(new_jobs(["job-1", "job-2", "job-3"]))
+    await tracker.transition("job-2", JobStatus.PROCESSING)
+    pipelines = []
+    pipeline = tracker.binary_client.pipeline
+    monkeypatch.setattr(tracker.binary_client, "pipeline", lambda **kwargs: pipelines.append(kwargs) or pipeline(**kwargs))
+    
+    jobs = await tracker.get_jobs(["job-3", "missing", "job-1", "job-2"])
+    
+    assert len(pipelines) == 1
+    assert list(jobs) == ["job-3", "job-1", "job-2"]
+    job_data, timeline = jobs["job-2"]
+    assert job_data["status"] == "processing"
+    assert job_data["version"] == 2
+    assert [event.event for event in timeline] == ["job_created", "status_changed"]
+
+
+async def test_get_jobs_timeline_limit(tracker):
+    """Test ``timeline_limit`` returns the newest events, and 0 skips timelines."""
+    await tracker.create_job("job-1", "cv-1", "openai")
+    await tracker.transition("job-1", JobStatus.PROCESSING)
+    await tracker.transition("job-1", JobStatus.COMPLETED, "analysis_completed", "Done")
+    
+    _, timeline = (await tracker.get_jobs(["job-1"], timeline_limit=2))["job-1"]
+    assert [event.event for event in timeline] == ["status_changed", "analysis_completed"]
+    
+    job_data, timeline = (await tracker.get_jobs(["job-1"], timeline_limit=0))["job-1"]
+    assert job_data["status"] == "completed"
+    assert timeline == []
+
+
+async def test_get_jobs_reads_legacy_records(tracker):
+    """Test a job stored as a JSON string is read alongside hash records."""
+    legacy = {"job_id": "job-0", "cv_id": "cv-1", "status": "completed", "provider": "openai", "prompt_version": None}
+    await tracker.redis_client.set("job:job-0", json.dumps(legacy), ex=600)
+    await tracker.create_job("job-1", "cv-1", "openai")
+    
+    jobs = await tracker.get_jobs(["job-0", "job-1", "missing"], timeline_limit=0)
+    
+    assert list(jobs) == ["job-0", "job-1"]
+    assert jobs["job-0"][0]["status"] == "completed"
+
+
+async def test_get_job_statuses_reports_found_and_missing(tracker, monkeypatch):
+    """Test the bulk endpoint keeps request order, drops repeats and lists unknown IDs."""
+    monkeypatch.setattr(main, "job_tracker", tracker)
+    await tracker.create_jobs(new_jobs(["job-1", "job-2"]))
+    request = JobStatusBulkRequest(job_ids=["job-2", "gone", "job-1", "job-2"], timeline_limit=1)
+    
+    response = await main.get_job_statuses(request)
+    
+    assert [job.job_id for job in response.jobs] == ["job-2", "job-1"]
+    assert [len(job.timeline) for job in response.jobs] == [1, 1]
+    assert response.not_found == ["gone"]
+    
+    response = await main.get_job_statuses(JobStatusBulkRequest(job_ids=["job-1"], include_timeline=False))
+    assert response.jobs[0].timeline == []
+
+
+async def test_get_job_statuses_rejects_too_many_ids(tracker, monkeypatch):
+    """Test more distinct IDs than ``bulk_status_max_jobs`` is a 400."""
+    monkeypatch.setattr(main, "job_tracker", tracker)
+    monkeypatch.setattr(settings, "bulk_status_max_jobs", 2)
+    
+    response = await main.get_job_statuses(JobStatusBulkRequest(job_ids=["job-1", "job-1", "job-2"]))
+    assert response.not_found == ["job-1", "job-2"]
+    
+    with pytest.raises(HTTPException) as error:
+        await main.get_job_statuses(JobStatusBulkRequest(job_ids=["job-1", "job-2", "job-3"]))
+    assert error.value.status_code == 400
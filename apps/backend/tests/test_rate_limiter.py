@@ -0,0 +1,177 @@
+"""Tests for sliding-window rate limiting."""
+import types
+import pytest
+from fastapi import HTTPException
+from starlette.responses import Response
+from cv_analyzer.api import rate_limit
+from cv_analyzer.core.config import settings
+from cv_analyzer.services import rate_limiter as rate_limiter_module
+from cv_analyzer.services.rate_limiter import RateLimiter, RateLimitPolicy
+
+# Start of a fixed one-minute window, in seconds
+WINDOW_START = 60 * 1_000_000
+
+
+class Clock:
+    """Settable replacement for ``time.time``."""
+    
+    def __init__(self, now: float):
+        self.now = now
+    
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(WINDOW_START)
+    monkeypatch.setattr(rate_limiter_module, "time", types.SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture
+def limiter(monkeypatch, fake_redis):
+    monkeypatch.setattr(rate_limiter_module, "redis_client", fake_redis)
+    return RateLimiter()
+
+
+def test_parse_named_and_numeric_periods():
+    """Test policies parse with a named period or a number of seconds."""
+    assert RateLimitPolicy.parse("60/minute") == RateLimitPolicy(60, 60)
+    assert RateLimitPolicy.parse("5/second") == RateLimitPolicy(5, 1)
+    assert RateLimitPolicy.parse("1000/3600") == RateLimitPolicy(1000, 3600)
+    assert RateLimitPolicy.parse("10/ day") == RateLimitPolicy(10, 86400)
+
+
+@pytest.mark.parametrize("value", ["0/minute", "10/0", "10/fortnight", "10", "ten/minute"])
+def test_parse_rejects_malformed_policies(value):
+    """Test malformed policies raise ValueError."""
+    with pytest.raises(ValueError, match="Invalid rate limit policy"):
+        RateLimitPolicy.parse(value)
+
+
+async def test_hit_allows_up_to_limit(limiter, clock):
+    """Test requests are counted until the limit and rejections are not counted."""
+    policy = RateLimitPolicy(3, 60)
+    results = [await limiter.hit("upload", "ip:1", policy) for _ in range(4)]
+    
+    assert [result.allowed for result in results] == [True, True, True, False]
+    assert [result.remaining for result in results] == [2, 1, 0, 0]
+    assert results[0].reset_seconds == 60
+    assert results[0].retry_after_seconds == 0
+    assert await limiter.redis_client.get(f"ratelimit:{{upload:ip:1}}:{WINDOW_START // 60}") == "3"
+
+
+async def test_hit_counts_policies_and_clients_separately(limiter, clock):
+    """Test each (policy, client) pair has its own counter."""
+    policy = RateLimitPolicy(1, 60)
+    assert (await limiter.hit("upload", "ip:1", policy)).allowed
+    assert (await limiter.hit("upload", "ip:2", policy)).allowed
+    assert (await limiter.hit("analyze", "ip:1", policy)).allowed
+    assert not (await limiter.hit("upload", "ip:1", policy)).allowed
+
+
+async def test_hit_weights_previous_window(limiter, clock):
+    """Test the previous window counts in proportion to its overlap."""
+    policy = RateLimitPolicy(10, 60)
+    for _ in range(10):
+        await limiter.hit("upload", "ip:1", policy)
+    
+    # Halfway into the next window half of the previous count remains
+    clock.now = WINDOW_START + 90
+    results = [await limiter.hit("upload", "ip:1", policy) for _ in range(6)]
+    assert [result.allowed for result in results] == [True] * 5 + [False]
+    assert results[-1].reset_seconds == 30
+
+
+async def test_retry_after_when_previous_window_slides_out(limiter, clock):
+    """Test Retry-After is when enough of the previous window has slid out."""
+    policy = RateLimitPolicy(10, 60)
+    for _ in range(10):
+        await limiter.hit("upload", "ip:1", policy)
+    clock.now = WINDOW_START + 90
+    for _ in range(5):
+        await limiter.hit("upload", "ip:1", policy)
+    
+    # 10 * 30/60 + 5 = 10 used; one slot frees once 1/10 of the window passes
+    result = await limiter.hit("upload", "ip:1", policy)
+    assert not result.allowed
+    assert result.retry_after_seconds == 6
+    
+    clock.now += result.retry_after_seconds - 1
+    assert not (await limiter.hit("upload", "ip:1", policy)).allowed
+    clock.now += 1
+    assert (await limiter.hit("upload", "ip:1", policy)).allowed
+
+
+async def test_retry_after_when_current_window_is_full(limiter, clock):
+    """Test Retry-After reaches into the next window when this one alone is full."""
+    policy = RateLimitPolicy(10, 60)
+    for _ in range(10):
+        await limiter.hit("upload", "ip:1", policy)
+    
+    # The next window must slide past 1/10 of this one's 10 requests
+    result = await limiter.hit("upload", "ip:1", policy)
+    assert not result.allowed
+    assert result.retry_after_seconds == 66
+    
+    clock.now += result.retry_after_seconds - 1
+    assert not (await limiter.hit("upload", "ip:1", policy)).allowed
+    clock.now += 1
+    assert (await limiter.hit("upload", "ip:1", policy)).allowed
+
+
+@pytest.fixture
+def policies(monkeypatch, limiter):
+    """Rate limit settings for ``rate_limited`` dependencies built by the test."""
+    monkeypatch.setattr(rate_limit, "rate_limiter", limiter)
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    policies = {}
+    monkeypatch.setattr(settings, "rate_limit_policies", policies)
+    return policies
+
+
+def client_request(host: str = "10.0.0.1"):
+    return types.SimpleNamespace(client=types.SimpleNamespace(host=host))
+
+
+def test_rate_limited_rejects_malformed_policy_when_built(policies):
+    """Test a bad policy fails when the dependency is built, not on a request."""
+    policies["upload"] = "60/fortnight"
+    with pytest.raises(ValueError, match="60/fortnight"):
+        rate_limit.rate_limited("upload")
+
+
+async def test_rate_limited_parses_policy_once(policies, clock, monkeypatch):
+    """Test requests reuse the policy parsed when the dependency was built."""
+    policies["upload"] = "2/minute"
+    check = rate_limit.rate_limited("upload")
+    
+    def parse(value):
+        raise AssertionError("policy parsed per request")
+    
+    monkeypatch.setattr(RateLimitPolicy, "parse", parse)
+    response = Response()
+    await check(client_request(), response)
+    await check(client_request(), response)
+    
+    assert response.headers["RateLimit-Policy"] == "2;w=60"
+    assert response.headers["RateLimit-Remaining"] == "0"
+    with pytest.raises(HTTPException) as error:
+        await check(client_request(), Response())
+    assert error.value.status_code == 429
+    assert error.value.headers["Retry-After"] == str(60 + 30)
+
+
+async def test_rate_limited_without_policy_or_when_disabled(policies, clock, monkeypatch):
+    """Test endpoints without a policy, or with rate limiting off, are never limited."""
+    policies["upload"] = "1/minute"
+    unlimited = rate_limit.rate_limited("analyze")
+    limited = rate_limit.rate_limited("upload")
+    monkeypatch.setattr(settings, "rate_limit_enabled", False)
+    
+    for _ in range(3):
+        await unlimited(client_request(), Response())
+        await limited(client_request(), Response())
+    
+    assert await rate_limit.rate_limiter.redis_client.keys("ratelimit:*") == []
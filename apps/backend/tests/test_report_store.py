@@ -0,0 +1,68 @@
+"""Tests for the report read-through cache."""
+import json
+import pytest
+from cv_analyzer.core.config import settings
+from cv_analyzer.services import report_store as report_store_module
+from cv_analyzer.services.report_store import ReportStore
+
+REPORT = {
+    "cv_id": "cv-1",
+    "job_id": "job-1",
+    "provider": "openai",
+    "prompt_version": "v1",
+    "scores": [],
+    "summary": "Solid backend experience",
+    "improvement_plan": "Add metrics to achievements",
+    "raw_analysis": {},
+    "generated_at": "2026-01-01T00:00:00",
+}
+
+
+@pytest.fixture
+def store(monkeypatch, fake_redis):
+    monkeypatch.setattr(report_store_module, "redis_client", fake_redis)
+    store = ReportStore()
+    store.loads = 0
+    
+    async def load(cv_id, job_id):
+        store.loads += 1
+        return REPORT
+    
+    monkeypatch.setattr(store, "_load", load)
+    return store
+
+
+async def test_caches_report_after_load(store):
+    """Test a loaded report is cached and later reads skip the database."""
+    report_json = await store.get_report_json("cv-1")
+    assert json.loads(report_json)["summary"] == REPORT["summary"]
+    assert 0 < await store.redis_client.ttl("report:cv:cv-1") <= settings.report_cache_ttl_seconds
+    
+    assert await store.get_report_json("cv-1") == report_json
+    assert store.loads == 1
+
+
+async def test_job_reports_are_cached_separately(store):
+    """Test a specific job's report has its own cache key."""
+    await store.get_report_json("cv-1", "job-1")
+    assert await store.redis_client.exists("report:cv:cv-1:job:job-1")
+    assert not await store.redis_client.exists("report:cv:cv-1")
+
+
+async def test_does_not_cache_report_superseded_during_load(store, monkeypatch):
+    """Test a report stored while the database was read blocks caching the stale one."""
+    async def load(cv_id, job_id):
+        # The worker stores a newer report and bumps the version meanwhile
+        await store.redis_client.incr("report:cv:cv-1:version")
+        return REPORT
+    
+    monkeypatch.setattr(store, "_load", load)
+    assert await store.get_report_json("cv-1") is not None
+    assert not await store.redis_client.exists("report:cv:cv-1")
+
+
+async def test_caches_when_version_unchanged(store):
+    """Test an existing version that did not change during the load still allows caching."""
+    await store.redis_client.set("report:cv:cv-1:version", 3)
+    await store.get_report_json("cv-1")
+    assert await store.redis_client.exists("report:cv:cv-1")
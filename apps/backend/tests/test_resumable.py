@@ -0,0 +1,147 @@
+"""Tests for the resumable upload endpoints."""
+import httpx
+import pytest
+from fastapi import FastAPI
+from cv_analyzer.api import resumable
+from cv_analyzer.core.config import settings
+from cv_analyzer.services import upload_sessions as upload_sessions_module
+from cv_analyzer.services.upload_sessions import UploadSessionStore
+
+# A 10-byte upload in 4-byte chunks: offsets 0, 4 and 8 (2 bytes)
+SIZE = 10
+CHUNK_SIZE = 4
+
+
+class StubStorage:
+    """Storage service recording multipart parts in memory."""
+    
+    def __init__(self):
+        self.parts = {}
+    
+    async def to_thread(self, func, *args, **kwargs):
+        return func(*args, **kwargs)
+    
+    def create_multipart_upload(self, object_name: str, content_type: str) -> str:
+        return "multipart-1"
+    
+    def upload_part(self, object_name: str, multipart_upload_id: str, part_number: int, data: bytes) -> str:
+        self.parts[part_number] = data
+        return f"etag-{part_number}"
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    storage = StubStorage()
+    monkeypatch.setattr(resumable, "storage_service", storage)
+    return storage
+
+
+@pytest.fixture
+async def sessions(monkeypatch, fake_redis):
+    monkeypatch.setattr(upload_sessions_module, "redis_client", fake_redis)
+    sessions = UploadSessionStore()
+    monkeypatch.setattr(resumable, "upload_sessions", sessions)
+    await sessions.create(
+        upload_id="upload-1",
+        filename="cv.pdf",
+        content_type="application/pdf",
+        object_name="uploads/upload-1",
+        max_size=settings.max_file_size_mb * 1024 * 1024,
+        expires_seconds=60,
+        size_bytes=SIZE,
+        chunk_size=CHUNK_SIZE,
+        multipart_upload_id="multipart-1",
+    )
+    return sessions
+
+
+@pytest.fixture
+async def client(storage, sessions):
+    app = FastAPI()
+    app.include_router(resumable.router)
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+def chunk_url(offset: int) -> str:
+    return f"{settings.api_prefix}/cv/uploads/upload-1/chunks?offset={offset}"
+
+
+async def test_chunks_in_any_order(client, storage):
+    """Test chunks are accepted in any order and progress reports the gaps."""
+    response = await client.put(chunk_url(8), content=b"ij")
+    assert response.status_code == 200
+    assert response.json()["missing_offsets"] == [0, 4]
+    assert response.json()["received_bytes"] == 2
+    
+    response = await client.put(chunk_url(0), content=b"abcd")
+    assert response.json()["missing_offsets"] == [4]
+    assert response.json()["received_bytes"] == 6
+    assert storage.parts == {3: b"ij", 1: b"abcd"}
+
+
+async def test_retried_chunk_replaces_previous(client, storage, sessions):
+    """Test sending a chunk again keeps only the latest copy."""
+    await client.put(chunk_url(4), content=b"efgh")
+    await client.put(chunk_url(4), content=b"EFGH")
+    assert storage.parts == {2: b"EFGH"}
+    assert await sessions.get_parts("upload-1") == {2: "etag-2"}
+
+
+@pytest.mark.parametrize("offset", [1, 6, 12])
+async def test_rejects_misaligned_or_out_of_range_offset(client, storage, offset):
+    """Test offsets must be chunk multiples within the declared size."""
+    response = await client.put(chunk_url(offset), content=b"abcd")
+    assert response.status_code == 400
+    assert storage.parts == {}
+
+
+async def test_rejects_short_chunk(client, storage):
+    """Test a chunk shorter than the chunk size is rejected."""
+    response = await client.put(chunk_url(0), content=b"abc")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Chunk at offset 0 must be 4 bytes"
+    assert storage.parts == {}
+
+
+async def test_last_chunk_must_be_remainder(client, storage):
+    """Test the last chunk holds exactly the remaining bytes."""
+    response = await client.put(chunk_url(8), content=b"ijkl")
+    assert response.status_code == 413
+    assert (await client.put(chunk_url(8), content=b"i")).status_code == 400
+    assert storage.parts == {}
+
+
+async def test_rejects_oversized_chunk_without_content_length(client, storage):
+    """Test a streamed body is cut off once it exceeds the chunk size."""
+    async def body():
+        yield b"ab"
+        yield b"cd"
+        yield b"ef"
+    
+    response = await client.put(chunk_url(0), content=body())
+    assert response.status_code == 413
+    assert storage.parts == {}
+
+
+async def test_rejects_chunks_while_completing(client, sessions):
+    """Test no chunks are accepted once completion has claimed the session."""
+    assert await sessions.claim("upload-1")
+    response = await client.put(chunk_url(0), content=b"abcd")
+    assert response.status_code == 409
+
+
+async def test_unknown_session(client):
+    """Test chunks for an unknown upload get 404."""
+    response = await client.put(f"{settings.api_prefix}/cv/uploads/missing/chunks?offset=0", content=b"abcd")
+    assert response.status_code == 404
+
+
+async def test_create_rejects_oversized_upload(client, monkeypatch):
+    """Test a resumable upload larger than the maximum file size is refused up front."""
+    monkeypatch.setattr(settings, "rate_limit_enabled", False)
+    response = await client.post(
+        f"{settings.api_prefix}/cv/uploads",
+        json={"filename": "cv.pdf", "size_bytes": settings.max_file_size_mb * 1024 * 1024 + 1},
+    )
+    assert response.status_code == 400
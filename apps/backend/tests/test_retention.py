@@ -0,0 +1,259 @@
+"""Tests for the retention engine."""
+from datetime import datetime, timedelta, timezone
+import fakeredis
+import pytest
+from minio.error import S3Error
+from cv_analyzer.core.config import settings
+from cv_analyzer.services import cv_registry as cv_registry_module
+from cv_analyzer.services import retention
+from cv_analyzer.services import upload_sessions as upload_sessions_module
+from cv_analyzer.services.cv_registry import CVRegistry
+from cv_analyzer.services.retention import RetentionEngine
+from cv_analyzer.services.upload_sessions import UploadSessionStore
+
+SHA_A = "a" * 64
+SHA_B = "b" * 64
+SHA_C = "c" * 64
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+@pytest.fixture
+def registry(monkeypatch, fake_redis):
+    monkeypatch.setattr(cv_registry_module, "redis_client", fake_redis)
+    registry = CVRegistry()
+    monkeypatch.setattr(retention, "cv_registry", registry)
+    return registry
+
+
+@pytest.fixture
+def sessions(monkeypatch, fake_redis):
+    monkeypatch.setattr(upload_sessions_module, "redis_client", fake_redis)
+    sessions = UploadSessionStore()
+    monkeypatch.setattr(retention, "upload_sessions", sessions)
+    return sessions
+
+
+@pytest.fixture
+def engine(registry, sessions, fake_minio):
+    return RetentionEngine(batch_size=10, max_deletes_per_second=10000)
+
+
+def put(minio, object_name: str, age_seconds: float = 0, data: bytes = b"%PDF"):
+    """Store an object last modified ``age_seconds`` ago."""
+    last_modified = datetime.now(timezone.utc) - timedelta(seconds=age_seconds)
+    minio.objects[object_name] = (data, "application/pdf", last_modified)
+
+
+async def register(registry: CVRegistry, cv_id: str, sha256: str = None, age_days: float = 0):
+    """Register a CV uploaded ``age_days`` ago, against a blob or a legacy ``cvs/`` object."""
+    object_name = f"blobs/{sha256}" if sha256 else f"cvs/{cv_id}"
+    uploaded_at = datetime.utcnow() - timedelta(days=age_days)
+    await registry.register(cv_id, f"{cv_id}.pdf", "application/pdf", 4, object_name, sha256, uploaded_at)
+
+
+async def flush(engine: RetentionEngine, batch):
+    """Delete one batch outside a full run."""
+    engine._stats = {"cvs_expired": 0, "objects_deleted": 0, "bytes_reclaimed": 0, "delete_failures": 0}
+    engine._batch = batch
+    await engine._flush()
+    return engine._stats
+
+
+async def test_expired_cvs_release_blobs_and_derived_objects(registry, engine, fake_minio):
+    """Test expired CVs are released, and their blob goes only with its last reference."""
+    expired = settings.cv_retention_days + 1
+    put(fake_minio, f"blobs/{SHA_A}")
+    put(fake_minio, "cvs/legacy")
+    put(fake_minio, "reports/cv-old/report.json")
+    put(fake_minio, "derived/cv-old/page-1.png")
+    put(fake_minio, "reports/cv-new/report.json")
+    await register(registry, "cv-old", SHA_A, age_days=expired)
+    await register(registry, "cv-new", SHA_A)
+    await register(registry, "legacy", age_days=expired)
+    
+    stats = await engine.run()
+    
+    assert stats["cvs_expired"] == 2
+    assert sorted(fake_minio.objects) == [f"blobs/{SHA_A}", "reports/cv-new/report.json"]
+    assert await registry.registered_many(["cv-old", "cv-new", "legacy"]) == [False, True, False]
+    assert await registry.get_blob_refs(SHA_A) == 1
+    
+    stats = await engine.run(now=datetime.now(timezone.utc) + timedelta(days=expired))
+    
+    assert stats["cvs_expired"] == 1
+    assert stats["objects_deleted"] == 2
+    assert fake_minio.objects == {}
+
+
+async def test_stale_uploads_past_grace_period(engine, fake_minio):
+    """Test staged uploads are deleted only once older than the grace period."""
+    grace = settings.staged_upload_retention_hours * HOUR
+    put(fake_minio, "uploads/abandoned", age_seconds=grace + HOUR)
+    put(fake_minio, "uploads/in-flight", age_seconds=grace - HOUR)
+    
+    stats = await engine.run()
+    
+    assert list(fake_minio.objects) == ["uploads/in-flight"]
+    assert stats["objects_deleted"] == 1
+    assert stats["bytes_reclaimed"] == 4
+
+
+async def test_unreferenced_blobs_past_grace_period(registry, engine, fake_minio):
+    """Test a blob is deleted when no CV references it and it is not brand new."""
+    grace = settings.staged_upload_retention_hours * HOUR
+    put(fake_minio, f"blobs/{SHA_A}", age_seconds=grace + HOUR)
+    put(fake_minio, f"blobs/{SHA_B}", age_seconds=grace + HOUR)
+    put(fake_minio, f"blobs/{SHA_C}", age_seconds=grace - HOUR)
+    await register(registry, "cv-1", SHA_B)
+    
+    await engine.run()
+    
+    assert sorted(fake_minio.objects) == [f"blobs/{SHA_B}", f"blobs/{SHA_C}"]
+
+
+async def test_unregistered_cvs_past_retention(registry, engine, fake_minio):
+    """Test legacy ``cvs/`` objects nobody registered are deleted after the retention period."""
+    retention_age = settings.cv_retention_days * DAY
+    put(fake_minio, "cvs/orphan", age_seconds=retention_age + DAY)
+    put(fake_minio, "cvs/registered", age_seconds=retention_age + DAY)
+    put(fake_minio, "cvs/recent", age_seconds=retention_age - DAY)
+    await register(registry, "registered")
+    
+    await engine.run()
+    
+    assert sorted(fake_minio.objects) == ["cvs/recent", "cvs/registered"]
+
+
+async def test_flush_locks_deletes_then_unlocks(registry, engine, fake_minio, redis_server, monkeypatch):
+    """Test blobs are locked for exactly the duration of the delete request."""
+    put(fake_minio, f"blobs/{SHA_A}")
+    put(fake_minio, "uploads/abandoned")
+    locks = fakeredis.FakeRedis(server=redis_server)
+    calls = []
+    lock_unreferenced_blobs = registry.lock_unreferenced_blobs
+    unlock_blobs = registry.unlock_blobs
+    remove_objects = fake_minio.remove_objects
+    
+    async def lock(sha256s):
+        calls.append(("lock", sha256s))
+        return await lock_unreferenced_blobs(sha256s)
+    
+    def remove(bucket_name, delete_object_list):
+        delete_objects = list(delete_object_list)
+        names = [delete_object._name for delete_object in delete_objects]
+        calls.append(("remove", names, bool(locks.exists(f"blob:deleting:{SHA_A}"))))
+        return remove_objects(bucket_name, delete_objects)
+    
+    async def unlock(sha256s):
+        calls.append(("unlock", sha256s))
+        await unlock_blobs(sha256s)
+    
+    monkeypatch.setattr(registry, "lock_unreferenced_blobs", lock)
+    monkeypatch.setattr(registry, "unlock_blobs", unlock)
+    monkeypatch.setattr(fake_minio, "remove_objects", remove)
+    
+    stats = await flush(engine, [("blob", f"blobs/{SHA_A}", 4), ("staged", "uploads/abandoned", 4)])
+    
+    assert stats["objects_deleted"] == 2
+    assert calls == [
+        ("lock", [SHA_A]),
+        ("remove", [f"blobs/{SHA_A}", "uploads/abandoned"], True),
+        ("unlock", [SHA_A]),
+    ]
+    assert fake_minio.objects == {}
+    assert not locks.exists(f"blob:deleting:{SHA_A}")
+
+
+async def test_flush_skips_blob_referenced_again(registry, engine, fake_minio):
+    """Test a blob picked as unreferenced survives if a CV references it before the delete."""
+    put(fake_minio, f"blobs/{SHA_A}")
+    await register(registry, "cv-1", SHA_A)
+    
+    stats = await flush(engine, [("blob", f"blobs/{SHA_A}", 4)])
+    
+    assert stats["objects_deleted"] == 0
+    assert f"blobs/{SHA_A}" in fake_minio.objects
+    assert not await registry.redis_client.exists(f"blob:deleting:{SHA_A}")
+
+
+async def test_partial_delete_failure_unlocks_and_counts(registry, engine, fake_minio):
+    """Test objects the delete request failed on are counted and their locks released."""
+    for sha256 in (SHA_A, SHA_B):
+        put(fake_minio, f"blobs/{sha256}", age_seconds=2 * DAY)
+    fake_minio.fail_deletes.add(f"blobs/{SHA_B}")
+    
+    stats = await engine.run()
+    
+    assert list(fake_minio.objects) == [f"blobs/{SHA_B}"]
+    assert stats["objects_deleted"] == 1
+    assert stats["delete_failures"] == 1
+    assert await registry.redis_client.keys("blob:deleting:*") == []
+    
+    fake_minio.fail_deletes.clear()
+    await engine.run()
+    assert fake_minio.objects == {}
+
+
+async def test_delete_request_error_unlocks(registry, engine, fake_minio, monkeypatch):
+    """Test a failed delete request still releases the blob locks."""
+    put(fake_minio, f"blobs/{SHA_A}")
+    
+    def remove_objects(bucket_name, delete_object_list):
+        raise ConnectionError("connection reset")
+    
+    monkeypatch.setattr(fake_minio, "remove_objects", remove_objects)
+    
+    with pytest.raises(ConnectionError):
+        await flush(engine, [("blob", f"blobs/{SHA_A}", 4)])
+    assert await registry.redis_client.keys("blob:deleting:*") == []
+    assert f"blobs/{SHA_A}" in fake_minio.objects
+
+
+async def start_resumable(sessions: UploadSessionStore, minio, upload_id: str, age_seconds: float) -> str:
+    """Start a multipart upload ``age_seconds`` ago with its session, as the resumable API does."""
+    multipart_upload_id = minio._create_multipart_upload("bucket", f"uploads/{upload_id}", {})
+    minio.age_multipart(multipart_upload_id, age_seconds)
+    await sessions.create(
+        upload_id, "cv.pdf", "application/pdf", f"uploads/{upload_id}", 10 * 2**20,
+        settings.resumable_upload_ttl_seconds, size_bytes=10 * 2**20, chunk_size=5 * 2**20,
+        multipart_upload_id=multipart_upload_id,
+    )
+    return multipart_upload_id
+
+
+async def test_abandoned_multipart_uploads_are_aborted(sessions, engine, fake_minio):
+    """Test multipart uploads whose session expired are aborted, and live or recent ones kept."""
+    ttl = settings.resumable_upload_ttl_seconds
+    abandoned = await start_resumable(sessions, fake_minio, "abandoned", age_seconds=ttl + HOUR)
+    await sessions.delete("abandoned")  # Expired
+    active = await start_resumable(sessions, fake_minio, "active", age_seconds=ttl + HOUR)
+    starting = fake_minio._create_multipart_upload("bucket", "uploads/starting", {})  # Session not written yet
+    
+    stats = await engine.run()
+    
+    assert abandoned not in fake_minio.multipart
+    assert set(fake_minio.multipart) == {active, starting}
+    assert stats["multipart_aborted"] == 1
+
+
+async def test_multipart_abort_failure_is_counted(sessions, engine, fake_minio, monkeypatch):
+    """Test an abort MinIO rejects is counted and the pass carries on."""
+    ttl = settings.resumable_upload_ttl_seconds
+    for upload_id in ("first", "second"):
+        await start_resumable(sessions, fake_minio, upload_id, age_seconds=ttl + HOUR)
+        await sessions.delete(upload_id)
+    abort = fake_minio._abort_multipart_upload
+    
+    def abort_second_only(bucket_name, object_name, upload_id):
+        if object_name == "uploads/first":
+            raise S3Error("AccessDenied", "Access denied", object_name, "request", "host", None)
+        abort(bucket_name, object_name, upload_id)
+    
+    monkeypatch.setattr(fake_minio, "_abort_multipart_upload", abort_second_only)
+    
+    stats = await engine.run()
+    
+    assert [object_name for object_name, _ in fake_minio.multipart.values()] == ["uploads/first"]
+    assert stats["multipart_aborted"] == 1
+    assert stats["delete_failures"] == 1
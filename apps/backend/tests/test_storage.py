@@ -0,0 +1,118 @@
+"""Tests for streaming uploads to object storage."""
+import functools
+import hashlib
+import io
+import types
+import pytest
+from minio import Minio
+from cv_analyzer.services.storage import storage_service, FileTooLargeError, HashingReader, MIN_PART_SIZE
+
+SMALL = b"%PDF-1.4 curriculum vitae"
+LARGE = bytes(range(256)) * (3 * MIN_PART_SIZE // 256)  # Three parts
+
+
+@pytest.fixture
+def minio(monkeypatch, fake_minio):
+    """Fake MinIO behind the real ``Minio.put_object``, so large bodies go through multipart uploads."""
+    monkeypatch.setattr(fake_minio, "_base_url", types.SimpleNamespace(is_aws_host=False), raising=False)
+    monkeypatch.setattr(fake_minio, "put_object", functools.partial(Minio.put_object, fake_minio))
+    return fake_minio
+
+
+class Unseekable(io.RawIOBase):
+    """Request body that can only be read forwards."""
+    
+    def __init__(self, data: bytes):
+        self._data = io.BytesIO(data)
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        return self._data.readinto(buffer)
+
+
+def test_hashing_reader_hashes_as_it_reads():
+    """Test the digest and size track exactly the bytes read so far."""
+    reader = HashingReader(io.BytesIO(SMALL))
+    
+    assert reader.read(8) == SMALL[:8]
+    assert reader.size == 8
+    assert reader.sha256 == hashlib.sha256(SMALL[:8]).hexdigest()
+    
+    assert reader.read() == SMALL[8:]
+    assert reader.read() == b""
+    assert reader.size == len(SMALL)
+    assert reader.sha256 == hashlib.sha256(SMALL).hexdigest()
+
+
+def test_hashing_reader_rejects_past_limit():
+    """Test the read that crosses ``max_size`` raises, and one that reaches it does not."""
+    reader = HashingReader(io.BytesIO(SMALL), max_size=len(SMALL))
+    assert reader.read() == SMALL
+    
+    reader = HashingReader(io.BytesIO(SMALL), max_size=10)
+    reader.read(10)
+    with pytest.raises(FileTooLargeError):
+        reader.read(1)
+
+
+@pytest.mark.parametrize("data", [SMALL, LARGE], ids=["single-part", "multipart"])
+def test_upload_stream_hashes_while_uploading(minio, data):
+    """Test the body is read once, forwards, and hashed on the way to MinIO."""
+    stream = Unseekable(data)
+    
+    result = storage_service.upload_stream("uploads/cv-1", stream, "application/pdf", max_size=len(data))
+    
+    assert result == {"object_name": "uploads/cv-1", "size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+    assert minio.objects["uploads/cv-1"][0] == data
+    assert minio.multipart == {}
+
+
+@pytest.mark.parametrize("data", [SMALL, LARGE], ids=["single-part", "multipart"])
+def test_upload_stream_over_limit_leaves_nothing(minio, data):
+    """Test an oversized body raises FileTooLargeError with no object or multipart upload left behind."""
+    created = []
+    create = minio._create_multipart_upload
+    minio._create_multipart_upload = lambda *args: created.append(args) or create(*args)
+    
+    with pytest.raises(FileTooLargeError):
+        storage_service.upload_stream("uploads/cv-1", Unseekable(data), "application/pdf", max_size=len(data) - 1)
+    
+    assert minio.objects == {}
+    assert minio.multipart == {}
+    assert minio.parts == {}
+    assert len(created) == (1 if data is LARGE else 0)
+
+
+def test_hash_stream_rewinds():
+    """Test hashing leaves the stream where it started, ready for the upload."""
+    stream = io.BytesIO(b"header" + SMALL)
+    stream.seek(6)
+    
+    assert storage_service.hash_stream(stream) == {"size": len(SMALL), "sha256": hashlib.sha256(SMALL).hexdigest()}
+    assert stream.tell() == 6
+    with pytest.raises(FileTooLargeError):
+        storage_service.hash_stream(stream, max_size=len(SMALL) - 1)
+
+
+def test_put_blob_uploads_new_content(minio):
+    """Test content not stored yet is uploaded under its SHA-256."""
+    sha256 = hashlib.sha256(SMALL).hexdigest()
+    
+    assert storage_service.put_blob(io.BytesIO(SMALL), sha256, len(SMALL), "application/pdf") is False
+    
+    assert minio.puts == [f"blobs/{sha256}"]
+    assert minio.objects[f"blobs/{sha256}"][:2] == (SMALL, "application/pdf")
+
+
+def test_put_blob_skips_stored_content(minio):
+    """Test content whose blob exists is not sent again and is reported as deduplicated."""
+    sha256 = hashlib.sha256(SMALL).hexdigest()
+    storage_service.put_blob(io.BytesIO(SMALL), sha256, len(SMALL), "application/pdf")
+    stream = io.BytesIO(SMALL)
+    
+    assert storage_service.put_blob(stream, sha256, len(SMALL), "application/pdf") is True
+    
+    assert minio.puts == [f"blobs/{sha256}"]
+    assert stream.tell() == 0
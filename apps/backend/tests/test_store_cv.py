@@ -0,0 +1,92 @@
+"""Tests for storing uploaded CVs against content-addressed blobs."""
+import hashlib
+import io
+import pytest
+from cv_analyzer.api import common
+from cv_analyzer.services import cv_registry as cv_registry_module
+from cv_analyzer.services.cv_registry import CVRegistry
+
+CONTENT = b"%PDF-1.4 curriculum vitae"
+SHA256 = hashlib.sha256(CONTENT).hexdigest()
+BLOB = f"blobs/{SHA256}"
+
+
+class Unseekable(io.RawIOBase):
+    """Request body that can only be read forwards."""
+    
+    def __init__(self, data: bytes):
+        self._data = io.BytesIO(data)
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        return self._data.readinto(buffer)
+
+
+@pytest.fixture
+def registry(monkeypatch, fake_redis):
+    monkeypatch.setattr(cv_registry_module, "redis_client", fake_redis)
+    registry = CVRegistry()
+    monkeypatch.setattr(common, "cv_registry", registry)
+    return registry
+
+
+async def retention_deletes_blob(registry: CVRegistry, minio):
+    """What RetentionEngine._flush does to an unreferenced blob."""
+    assert await registry.lock_unreferenced_blobs([SHA256]) == [SHA256]
+    minio.remove_object("bucket", BLOB)
+    await registry.unlock_blobs([SHA256])
+
+
+@pytest.mark.parametrize("stream", [io.BytesIO, Unseekable])
+async def test_store_deduplicates(registry, fake_minio, stream):
+    """Test identical content is stored once and referenced by both CVs."""
+    first = await common.store_cv(stream(CONTENT), "a.pdf", "application/pdf", len(CONTENT))
+    second = await common.store_cv(stream(CONTENT), "b.pdf", "application/pdf", len(CONTENT))
+    
+    assert not first["deduplicated"]
+    assert second["deduplicated"]
+    assert first["object_name"] == second["object_name"] == BLOB
+    assert fake_minio.objects[BLOB][0] == CONTENT
+    assert [name for name in fake_minio.objects if name.startswith("uploads/")] == []
+    assert await registry.get_blob_refs(SHA256) == 2
+
+
+@pytest.mark.parametrize("stream", [io.BytesIO, Unseekable])
+async def test_retention_between_hash_and_reference(registry, fake_minio, monkeypatch, stream):
+    """Test a blob deleted after the upload was hashed but before it was referenced is stored again."""
+    # The only CV referencing the blob expires, leaving it to retention
+    first = await common.store_cv(io.BytesIO(CONTENT), "a.pdf", "application/pdf", len(CONTENT))
+    await registry.release(first["cv_id"])
+    
+    register = registry.register
+    
+    async def register_after_retention(**kwargs):
+        await retention_deletes_blob(registry, fake_minio)
+        return await register(**kwargs)
+    
+    monkeypatch.setattr(registry, "register", register_after_retention)
+    cv = await common.store_cv(stream(CONTENT), "b.pdf", "application/pdf", len(CONTENT))
+    
+    assert not cv["deduplicated"]
+    assert fake_minio.objects[BLOB][0] == CONTENT
+    assert await registry.get_blob_refs(SHA256) == 1
+
+
+async def test_referenced_blob_is_not_locked(registry, fake_minio):
+    """Test retention skips a blob once a stored CV references it."""
+    await common.store_cv(io.BytesIO(CONTENT), "a.pdf", "application/pdf", len(CONTENT))
+    assert await registry.lock_unreferenced_blobs([SHA256]) == []
+
+
+async def test_failed_upload_releases_reference(registry, fake_minio, monkeypatch):
+    """Test the reference taken before the upload is dropped if the upload fails."""
+    def put_object(*args, **kwargs):
+        raise ConnectionError("MinIO unreachable")
+    
+    monkeypatch.setattr(fake_minio, "put_object", put_object)
+    with pytest.raises(ConnectionError):
+        await common.store_cv(io.BytesIO(CONTENT), "a.pdf", "application/pdf", len(CONTENT))
+    assert await registry.get_blob_refs(SHA256) == 0
+    assert await registry.redis_client.zcard("cvs:expiry") == 0
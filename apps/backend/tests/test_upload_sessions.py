@@ -0,0 +1,52 @@
+"""Tests for the direct-upload session store."""
+import pytest
+from cv_analyzer.services import upload_sessions as upload_sessions_module
+from cv_analyzer.services.upload_sessions import UploadSessionStore
+
+
+@pytest.fixture
+def sessions(monkeypatch, fake_redis):
+    monkeypatch.setattr(upload_sessions_module, "redis_client", fake_redis)
+    return UploadSessionStore()
+
+
+async def create_session(sessions: UploadSessionStore, upload_id: str = "upload-1"):
+    return await sessions.create(
+        upload_id=upload_id,
+        filename="cv.pdf",
+        content_type="application/pdf",
+        object_name=f"uploads/{upload_id}",
+        max_size=1024,
+        expires_seconds=60,
+    )
+
+
+async def test_claim_is_exclusive(sessions):
+    """Test only the first of concurrent completions claims the session."""
+    await create_session(sessions)
+    assert await sessions.claim("upload-1")
+    assert not await sessions.claim("upload-1")
+    assert (await sessions.get("upload-1"))["completing"] == "1"
+
+
+async def test_unclaim_allows_retry(sessions):
+    """Test a completion that failed transiently can be retried."""
+    await create_session(sessions)
+    assert await sessions.claim("upload-1")
+    await sessions.unclaim("upload-1")
+    assert await sessions.claim("upload-1")
+
+
+async def test_claim_does_not_recreate_expired_session(sessions):
+    """Test claiming an expired session fails without leaving a key behind."""
+    await create_session(sessions)
+    await sessions.delete("upload-1")
+    assert not await sessions.claim("upload-1")
+    assert not await sessions.redis_client.exists("upload:upload-1")
+
+
+async def test_claim_keeps_session_expiry(sessions):
+    """Test the claim leaves the session's TTL in place."""
+    await create_session(sessions)
+    await sessions.claim("upload-1")
+    assert await sessions.redis_client.ttl("upload:upload-1") > 0
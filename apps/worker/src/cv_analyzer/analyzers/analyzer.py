@@ -1,8 +1,9 @@
 """CV analysis orchestrator."""
 import json
-from typing import Dict, Any
+from typing import Dict, Any, BinaryIO, List, Union
 from cv_analyzer.parsers.cv_parser import CVParser
-from cv_analyzer.parsers.prompts import get_prompt
+from cv_analyzer.parsers.prompts import get_prompt, uses_detected_skills, fill_detected_skills
+from cv_analyzer.parsers.skill_index import get_skill_index
 from cv_analyzer.providers.factory import get_provider
 from cv_analyzer.core.logging import get_logger
 
@@ -15,9 +16,25 @@ class CVAnalyzer:
     def __init__(self):
         self.parser = CVParser()
     
+    @staticmethod
+    def _merge_skills(detected: List[str], additional: Any) -> List[str]:
+        """
+        Append the model's extra skills to the detected ones.
+        
+        Non-string items are skipped and names are de-duplicated
+        case-insensitively, keeping the first spelling.
+        """
+        if not isinstance(additional, list):
+            additional = []
+        merged: Dict[str, str] = {}
+        for skill in detected + additional:
+            if isinstance(skill, str) and skill.strip():
+                merged.setdefault(skill.strip().casefold(), skill.strip())
+        return list(merged.values())
+    
     async def analyze(
         self,
-        cv_data: bytes,
+        cv_data: Union[bytes, BinaryIO],
         filename: str,
         provider_name: str,
         prompt_version: str = "v1",
@@ -26,7 +43,7 @@ class CVAnalyzer:
         Analyze CV.
         
         Args:
-            cv_data: CV file content
+            cv_data: CV file content (bytes or a seekable file-like object)
             filename: Original filename
             provider_name: AI provider name
             prompt_version: Prompt template version
@@ -38,8 +55,14 @@ class CVAnalyzer:
         logger.info("parsing_cv", filename=filename)
         parsed_cv = self.parser.parse(cv_data, filename)
         
+        # Deterministic skill extraction
+        detected_skills = get_skill_index().extract(parsed_cv["sections"])
+        skill_names = [entry["skill"] for entry in detected_skills]
+        
         # Get prompt template
         prompt_template = get_prompt(prompt_version)
+        skills_in_prompt = uses_detected_skills(prompt_template)
+        prompt_template = fill_detected_skills(prompt_template, skill_names)
         
         # Get AI provider
         provider = get_provider(provider_name)
@@ -78,11 +101,18 @@ class CVAnalyzer:
                     "improvement_plan": "See summary",
                 }
         
+        # Merge deterministic skills with those only the model found
+        if skills_in_prompt:
+            analysis_json["skills"] = self._merge_skills(
+                skill_names, analysis_json.pop("additional_skills", None)
+            )
+        
         # Combine results
         result = {
             "cv_metadata": {
                 "filename": filename,
                 "sections": parsed_cv["sections"],
+                "detected_skills": detected_skills,
             },
             "analysis": analysis_json,
             "provider": {
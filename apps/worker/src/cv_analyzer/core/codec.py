@@ -0,0 +1,124 @@
+"""Wire format for queue messages and timeline entries stored in Redis."""
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple, Union
+import msgpack
+from cv_analyzer.core.config import settings
+
+# First byte of every msgpack-encoded value. JSON values start with "{", so
+# both formats can be read side by side.
+FORMAT_VERSION = 1
+_VERSION_BYTE = bytes([FORMAT_VERSION])
+
+# Timeline entries are a msgpack array:
+# [seq, timestamp (epoch ms), event, message, metadata, status]
+# The array header and seq are added by the Redis script that assigns seq,
+# so callers pack the remaining fields only.
+
+EPOCH = datetime(1970, 1, 1)
+MILLISECOND = timedelta(milliseconds=1)
+
+
+def to_millis(value: datetime) -> int:
+    """Epoch milliseconds of a datetime (naive values are UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH) // MILLISECOND
+
+
+def from_millis(value: int) -> datetime:
+    """Naive UTC datetime from epoch milliseconds."""
+    return datetime.utcfromtimestamp(value / 1000)
+
+
+def _use_json() -> bool:
+    return settings.redis_wire_format == "json"
+
+
+def encode_message(data: Dict[str, Any]) -> bytes:
+    """
+    Encode a queue message.
+    
+    ``created_at`` (ISO string) is stored as epoch milliseconds.
+    """
+    if _use_json():
+        return json.dumps(data).encode()
+    data = dict(data, created_at=to_millis(datetime.fromisoformat(data["created_at"])))
+    return _VERSION_BYTE + msgpack.packb(data)
+
+
+def decode_message(raw: Union[bytes, str]) -> Dict[str, Any]:
+    """Decode a queue message in either format; ``created_at`` comes back as an ISO string."""
+    if _is_json(raw):
+        return json.loads(raw)
+    data = msgpack.unpackb(raw[1:])
+    data["created_at"] = from_millis(data["created_at"]).isoformat()
+    return data
+
+
+def encode_event(
+    timestamp: datetime,
+    event: str,
+    message: str,
+    metadata: Optional[Dict[str, Any]],
+    status: Optional[str] = None,
+) -> bytes:
+    """
+    Encode a timeline event, without its sequence number.
+    
+    Redis scripts complete the entry: msgpack events get the array header
+    and seq inserted after the version byte, JSON events get a "seq" key.
+    """
+    if _use_json():
+        event_data = {
+            "timestamp": timestamp.isoformat(),
+            "event": event,
+            "message": message,
+            "metadata": metadata or {},
+        }
+        if status:
+            event_data["status"] = status
+        return json.dumps(event_data).encode()
+    packer = msgpack.Packer()
+    return _VERSION_BYTE + b"".join(
+        packer.pack(value) for value in (to_millis(timestamp), event, message, metadata or {}, status)
+    )
+
+
+def decode_event_fields(raw: Union[bytes, str]) -> Tuple[int, datetime, str, str, Dict[str, Any], Optional[str]]:
+    """Decode a stored timeline entry into (seq, timestamp, event, message, metadata, status)."""
+    if _is_json(raw):
+        event_data = json.loads(raw)
+        return (
+            event_data.get("seq", 0),
+            datetime.fromisoformat(event_data["timestamp"]),
+            event_data["event"],
+            event_data["message"],
+            event_data.get("metadata") or {},
+            event_data.get("status"),
+        )
+    seq, millis, event, message, metadata, status = msgpack.unpackb(raw[1:])
+    return seq, from_millis(millis), event, message, metadata, status
+
+
+def decode_event(raw: Union[bytes, str]) -> Dict[str, Any]:
+    """Decode a stored timeline entry into its JSON-compatible form."""
+    seq, timestamp, event, message, metadata, status = decode_event_fields(raw)
+    event_data = {
+        "seq": seq,
+        "timestamp": timestamp.isoformat(),
+        "event": event,
+        "message": message,
+        "metadata": metadata,
+    }
+    if status:
+        event_data["status"] = status
+    return event_data
+
+
+def _is_json(raw: Union[bytes, str]) -> bool:
+    if raw[:1] == _VERSION_BYTE:
+        return False
+    if raw[:1] in (b"{", "{"):
+        return True
+    raise ValueError(f"Unknown wire format version: {raw[:1]!r}")
@@ -9,6 +9,8 @@ class Settings(BaseSettings):
     # Worker
     worker_name: str = "cv-analyzer-worker"
     poll_interval: int = 5  # seconds
+    timeline_buffer_max_events: int = 1000  # Buffered timeline events (0 writes through)
+    timeline_flush_interval_seconds: float = 0.5
     
     # MinIO
     minio_endpoint: str = "minio:9000"
@@ -22,6 +24,15 @@ class Settings(BaseSettings):
     redis_port: int = 6379
     redis_db: int = 0
     redis_queue_name: str = "cv_analysis_queue"
+    redis_wire_format: str = "msgpack"  # "json" keeps writing the old format until every reader is upgraded
+    queue_drain_window_seconds: int = 300  # Dequeues counted for the drain rate used by admission control
+    
+    # Local blob cache (0 disables)
+    blob_cache_dir: str = "/var/cache/cv-analyzer/blobs"
+    blob_cache_max_mb: int = 512
+    
+    # Downloads larger than this spill from memory to a temp file
+    download_spool_max_mb: int = 8
     
     # PostgreSQL
     postgres_host: str = "postgres"
@@ -29,12 +40,26 @@ class Settings(BaseSettings):
     postgres_user: str = "cvanalyzer"
     postgres_password: str = "cvanalyzer"
     postgres_db: str = "cvanalyzer"
+    database_pool_size: int = 10  # Connections kept open per process
+    database_max_overflow: int = 5  # Extra connections allowed under load
+    database_pool_timeout_seconds: float = 5.0  # Wait for a free connection before failing
+    database_pool_recycle_seconds: int = 1800
+    database_query_cache_size: int = 500  # SQLAlchemy compiled SQL cache, per engine
+    database_prepared_statement_cache_size: int = 256  # asyncpg prepared statements per connection; 0 behind PgBouncer (transaction mode)
+    
+    # Reports
+    report_batch_size: int = 50  # Reports per multi-row upsert
+    report_flush_interval_seconds: float = 0.1  # Longest a report waits in the queue before its batch is written
+    report_max_pending: int = 1000  # Queued reports while PostgreSQL is slow; beyond this the oldest fail
     
     # AI Providers
     openai_api_key: Optional[str] = None
     anthropic_api_key: Optional[str] = None
     default_provider: str = "openai"
     
+    # Parsing
+    skill_taxonomy_path: Optional[str] = None  # JSON {canonical: [aliases]}; bundled if unset
+    
     # MLflow
     mlflow_tracking_uri: str = "http://mlflow:5000"
     mlflow_experiment_name: str = "cv-analysis"
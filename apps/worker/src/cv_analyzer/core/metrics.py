@@ -47,3 +47,102 @@ cv_parse_duration_seconds = Histogram(
     "CV parsing duration",
     ["file_type"],
 )
+
+# Queue metrics
+queue_size = Gauge(
+    "queue_size",
+    "Current queue size",
+    ["queue_name"],
+)
+
+queue_enqueued_total = Counter(
+    "queue_enqueued_total",
+    "Total items enqueued",
+    ["queue_name"],
+)
+
+queue_dequeued_total = Counter(
+    "queue_dequeued_total",
+    "Total items dequeued",
+    ["queue_name"],
+)
+
+# Blob cache metrics
+blob_cache_requests_total = Counter(
+    "blob_cache_requests_total",
+    "Local blob cache lookups",
+    ["result"],  # hit/miss
+)
+
+blob_cache_bytes_saved_total = Counter(
+    "blob_cache_bytes_saved_total",
+    "Bytes served from the local blob cache instead of MinIO",
+)
+
+blob_cache_evictions_total = Counter(
+    "blob_cache_evictions_total",
+    "Blobs evicted from the local cache",
+)
+
+blob_cache_size_bytes = Gauge(
+    "blob_cache_size_bytes",
+    "Current size of the local blob cache",
+)
+
+# Timeline buffer metrics
+timeline_flush_duration_seconds = Histogram(
+    "timeline_flush_duration_seconds",
+    "Time to flush buffered timeline events to Redis",
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5],
+)
+
+timeline_events_dropped_total = Counter(
+    "timeline_events_dropped_total",
+    "Timeline events dropped because the buffer was full",
+)
+
+timeline_buffer_events = Gauge(
+    "timeline_buffer_events",
+    "Timeline events waiting to be flushed",
+)
+
+# Report store metrics
+report_batch_size = Histogram(
+    "report_batch_size",
+    "Reports written per PostgreSQL batch",
+    buckets=[1, 2, 5, 10, 25, 50, 100],
+)
+
+report_write_duration_seconds = Histogram(
+    "report_write_duration_seconds",
+    "Time to write a batch of reports to PostgreSQL",
+    buckets=[0.005, 0.01, 0.05, 0.1, 0.5, 1.0],
+)
+
+reports_dropped_total = Counter(
+    "reports_dropped_total",
+    "Reports dropped because the write queue was full",
+)
+
+# Database pool metrics
+db_pool_connections = Gauge(
+    "db_pool_connections",
+    "PostgreSQL pool connections by state",
+    ["state"],
+)
+
+db_pool_saturation = Gauge(
+    "db_pool_saturation",
+    "Checked-out PostgreSQL connections as a fraction of the pool maximum",
+)
+
+db_pool_checkout_duration_seconds = Histogram(
+    "db_pool_checkout_duration_seconds",
+    "Time to obtain a PostgreSQL connection from the pool",
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0],
+)
+
+db_pool_timeouts_total = Counter(
+    "db_pool_timeouts_total",
+    "PostgreSQL connection requests that timed out waiting for the pool",
+)
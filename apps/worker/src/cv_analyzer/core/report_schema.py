@@ -0,0 +1,21 @@
+"""Storage layout of analysis reports, shared by the API and worker."""
+from sqlalchemy import Column, DateTime, Index, MetaData, String, Table
+from sqlalchemy.dialects.postgresql import JSONB
+
+# Written by the worker's ReportWriter, read by the API's ReportStore
+metadata = MetaData()
+analysis_reports = Table(
+    "analysis_reports",
+    metadata,
+    Column("job_id", String, primary_key=True),
+    Column("cv_id", String, nullable=False),
+    Column("provider", String, nullable=False),
+    Column("prompt_version", String, nullable=False),
+    Column("report", JSONB, nullable=False),
+    Column("generated_at", DateTime, nullable=False),
+    Index("ix_analysis_reports_cv_id_generated_at", "cv_id", "generated_at"),
+)
+
+# Cached reports live under report:cv:{cv_id} and report:cv:{cv_id}:job:{job_id};
+# report:cv:{cv_id}:version counts the reports stored for the CV
+REPORT_CACHE_PREFIX = "report:"
@@ -1,6 +1,7 @@
 """Worker main entry point."""
 import asyncio
 import json
+import signal
 import time
 from datetime import datetime
 from opentelemetry import trace
@@ -10,6 +11,7 @@ from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExport
 from prometheus_client import start_http_server
 
 from cv_analyzer.core.config import settings
+from cv_analyzer.core.database import database
 from cv_analyzer.core.logging import configure_logging, get_logger
 from cv_analyzer.core.metrics import (
     jobs_processed_total,
@@ -17,13 +19,18 @@ from cv_analyzer.core.metrics import (
 )
 from cv_analyzer.services.storage import StorageService
 from cv_analyzer.services.queue import QueueService
-from cv_analyzer.services.job_tracker import JobTracker
+from cv_analyzer.services.job_tracker import JobTracker, InvalidTransitionError
 from cv_analyzer.services.mlflow_client import MLflowClient
+from cv_analyzer.services.cv_registry import CVRegistry
+from cv_analyzer.core.report_schema import metadata as report_metadata
+from cv_analyzer.services.report_store import ReportWriter, build_report
 
 storage_service = StorageService()
 queue_service = QueueService()
 job_tracker = JobTracker()
 mlflow_client = MLflowClient()
+cv_registry = CVRegistry()
+report_writer = ReportWriter()
 from cv_analyzer.analyzers.analyzer import CVAnalyzer
 
 # Configure logging
@@ -49,6 +56,9 @@ async def process_job(job_data: dict):
     cv_id = job_data["cv_id"]
     provider_name = job_data["provider"]
     prompt_version = job_data.get("prompt_version", "v1")
+    job_metadata = job_data.get("metadata") or {}
+    filename = job_metadata.get("filename")
+    object_name = job_metadata.get("object_name")
     
     with tracer.start_as_current_span("process_job") as span:
         span.set_attribute("job_id", job_id)
@@ -57,24 +67,37 @@ async def process_job(job_data: dict):
         
         start_time = time.time()
         
+        # Claim the job; redelivered jobs that already finished are skipped
         try:
-            # Update job status
-            job_tracker.update_job_status(job_id, "processing")
-            job_tracker.add_timeline_event(job_id, "processing_started", "Started processing CV")
+            job_tracker.transition(job_id, "processing", "processing_started", "Started processing CV")
+        except InvalidTransitionError as e:
+            logger.warning("job_skipped", job_id=job_id, reason=str(e))
+            return
+        
+        try:
+            # Resolve filename and blob key (jobs enqueued before they were carried in metadata)
+            if not filename or not object_name:
+                cv_metadata = cv_registry.get(cv_id) or {}
+                filename = filename or cv_metadata.get("filename") or f"{cv_id}.pdf"
+                object_name = object_name or cv_metadata.get("object_name")
             
             # Download CV from MinIO
-            logger.info("downloading_cv", cv_id=cv_id)
-            cv_data = storage_service.download_file(cv_id)
+            logger.info("downloading_cv", cv_id=cv_id, object_name=object_name)
+            cv_data = storage_service.download_file(cv_id, object_name=object_name)
             job_tracker.add_timeline_event(job_id, "cv_downloaded", "Downloaded CV from storage")
             
             # Analyze CV
             analyzer = CVAnalyzer()
-            result = await analyzer.analyze(
-                cv_data=cv_data,
-                filename=f"{cv_id}.pdf",  # TODO: Store filename in metadata
-                provider_name=provider_name,
-                prompt_version=prompt_version,
-            )
+            try:
+                result = await analyzer.analyze(
+                    cv_data=cv_data,
+                    filename=filename,
+                    provider_name=provider_name,
+                    prompt_version=prompt_version,
+                )
+            finally:
+                # Release the spooled temp file / cache memory map
+                cv_data.close()
             
             job_tracker.add_timeline_event(
                 job_id,
@@ -83,6 +106,10 @@ async def process_job(job_data: dict):
                 {"provider": provider_name, "tokens": result["provider"]["tokens_used"]},
             )
             
+            # Store report; the job only completes once it can be read
+            await report_writer.write(build_report(job_id, cv_id, provider_name, prompt_version, result))
+            job_tracker.add_timeline_event(job_id, "report_stored", "Stored analysis report")
+            
             # Log to MLflow
             logger.info("logging_to_mlflow", job_id=job_id)
             mlflow_client.log_run(
@@ -94,17 +121,13 @@ async def process_job(job_data: dict):
             )
             job_tracker.add_timeline_event(job_id, "mlflow_logged", "Logged experiment to MLflow")
             
-            # Store report (TODO: Store in database/storage)
-            # For now, we'll just mark as complete
-            
             # Trigger n8n webhook (if configured)
             if settings.n8n_webhook_url:
                 # TODO: Call n8n webhook
                 pass
             
             # Update job status
-            job_tracker.update_job_status(job_id, "completed")
-            job_tracker.add_timeline_event(job_id, "job_completed", "Job completed successfully")
+            job_tracker.transition(job_id, "completed", "job_completed", "Job completed successfully")
             
             duration = time.time() - start_time
             jobs_processed_total.labels(status="success", provider=provider_name).inc()
@@ -118,8 +141,7 @@ async def process_job(job_data: dict):
             
             logger.error("job_failed", job_id=job_id, error=error_msg, duration=duration)
             
-            job_tracker.update_job_status(job_id, "failed", error=error_msg)
-            job_tracker.add_timeline_event(job_id, "job_failed", f"Job failed: {error_msg}")
+            job_tracker.transition(job_id, "failed", "job_failed", f"Job failed: {error_msg}", error=error_msg)
             
             jobs_processed_total.labels(status="failed", provider=provider_name).inc()
             job_processing_duration_seconds.labels(provider=provider_name).observe(duration)
@@ -131,11 +153,34 @@ async def process_job(job_data: dict):
 async def worker_loop():
     """Main worker loop."""
     logger.info("worker_starting", service=settings.service_name)
+    # Create the reports table once here rather than on the write path
+    await database.ensure_schema(report_metadata)
+    
+    # On SIGTERM stop taking jobs, finish the current one, then flush the buffers
+    stopping = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopping.set)
+    flushers = [asyncio.create_task(report_writer.run())]
+    if job_tracker.timeline_buffer:
+        flushers.append(asyncio.create_task(
+            job_tracker.timeline_buffer.run(settings.timeline_flush_interval_seconds)
+        ))
     
-    while True:
+    try:
+        await _poll_jobs(stopping)
+    finally:
+        logger.info("worker_stopping")
+        for flusher in flushers:
+            flusher.cancel()
+        await asyncio.gather(*flushers, return_exceptions=True)
+        await database.close()
+
+
+async def _poll_jobs(stopping: asyncio.Event):
+    """Dequeue and process jobs one at a time until ``stopping`` is set."""
+    while not stopping.is_set():
         try:
-            # Dequeue job
-            job_data = queue_service.dequeue_job(timeout=settings.poll_interval)
+            # Dequeue job; the blocking BRPOP runs off the event loop so flushers keep running
+            job_data = await asyncio.to_thread(queue_service.dequeue_job, timeout=settings.poll_interval)
             
             if job_data:
                 await process_job(job_data)
@@ -144,7 +189,6 @@ async def worker_loop():
                 await asyncio.sleep(1)
                 
         except KeyboardInterrupt:
-            logger.info("worker_stopping")
             break
         except Exception as e:
             logger.error("worker_error", error=str(e))
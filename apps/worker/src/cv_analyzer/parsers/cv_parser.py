@@ -1,10 +1,11 @@
 """CV parsing utilities."""
 import io
-from typing import Dict, Any
+from typing import Dict, Any, Tuple, Union, BinaryIO
 from pathlib import Path
 import PyPDF2
-from docx import Document
 from cv_analyzer.core.logging import get_logger
+from cv_analyzer.parsers.docx_extractor import extract_docx_text
+from cv_analyzer.parsers.text_normalizer import PAGE_BREAK, normalize_text
 
 logger = get_logger(__name__)
 
@@ -13,12 +14,13 @@ class CVParser:
     """Parser for CV files (PDF, DOCX, TXT)."""
     
     @staticmethod
-    def parse(file_data: bytes, filename: str) -> Dict[str, Any]:
+    def parse(file_data: Union[bytes, BinaryIO], filename: str) -> Dict[str, Any]:
         """
         Parse CV file and extract text.
         
         Args:
-            file_data: File content as bytes
+            file_data: File content as bytes or a seekable binary file-like
+                object (read from the start, not closed)
             filename: Original filename
             
         Returns:
@@ -31,12 +33,13 @@ class CVParser:
         elif file_ext == ".docx":
             text = CVParser._parse_docx(file_data)
         elif file_ext == ".txt":
-            text = file_data.decode("utf-8", errors="ignore")
+            text = str(CVParser._as_stream(file_data).read(), "utf-8", errors="ignore")
         else:
             raise ValueError(f"Unsupported file type: {file_ext}")
         
         # Normalize text
-        normalized = CVParser._normalize_text(text)
+        normalized, normalization = CVParser._normalize_text(text)
+        logger.info("cv_text_normalized", filename=filename, **normalization)
         
         # Extract sections
         sections = CVParser._extract_sections(normalized)
@@ -45,48 +48,45 @@ class CVParser:
             "raw_text": text,
             "normalized_text": normalized,
             "sections": sections,
+            "normalization": normalization,
             "filename": filename,
         }
     
     @staticmethod
-    def _parse_pdf(file_data: bytes) -> str:
+    def _as_stream(file_data: Union[bytes, BinaryIO]) -> BinaryIO:
+        """Return a stream at offset 0; file-like objects are used as-is, not copied."""
+        if isinstance(file_data, (bytes, bytearray, memoryview)):
+            return io.BytesIO(file_data)
+        file_data.seek(0)
+        return file_data
+    
+    @staticmethod
+    def _parse_pdf(file_data: Union[bytes, BinaryIO]) -> str:
         """Extract text from PDF."""
         try:
-            pdf_file = io.BytesIO(file_data)
+            pdf_file = CVParser._as_stream(file_data)
             pdf_reader = PyPDF2.PdfReader(pdf_file)
             text_parts = []
             for page in pdf_reader.pages:
                 text_parts.append(page.extract_text())
-            return "\n".join(text_parts)
+            return PAGE_BREAK.join(text_parts)
         except Exception as e:
             logger.error("pdf_parse_failed", error=str(e))
             raise
     
     @staticmethod
-    def _parse_docx(file_data: bytes) -> str:
-        """Extract text from DOCX."""
+    def _parse_docx(file_data: Union[bytes, BinaryIO]) -> str:
+        """Extract text from DOCX (body, tables, text boxes, headers and footers)."""
         try:
-            doc_file = io.BytesIO(file_data)
-            doc = Document(doc_file)
-            text_parts = []
-            for paragraph in doc.paragraphs:
-                text_parts.append(paragraph.text)
-            return "\n".join(text_parts)
+            return extract_docx_text(CVParser._as_stream(file_data))
         except Exception as e:
             logger.error("docx_parse_failed", error=str(e))
             raise
     
     @staticmethod
-    def _normalize_text(text: str) -> str:
-        """Normalize text (remove extra whitespace, etc.)."""
-        # Remove excessive whitespace
-        lines = text.split("\n")
-        normalized_lines = []
-        for line in lines:
-            line = line.strip()
-            if line:
-                normalized_lines.append(line)
-        return "\n".join(normalized_lines)
+    def _normalize_text(text: str) -> Tuple[str, Dict[str, int]]:
+        """Normalize text and drop headers/footers repeated across pages."""
+        return normalize_text(text)
     
     @staticmethod
     def _extract_sections(text: str) -> Dict[str, str]:
@@ -0,0 +1,186 @@
+"""Streaming DOCX text extraction."""
+import io
+import re
+import zipfile
+from typing import BinaryIO, List, Union
+from xml.etree.ElementTree import iterparse
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_NS = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+DOCUMENT_PART = "word/document.xml"
+HEADER_PART_RE = re.compile(r"^word/header(\d*)\.xml$")
+FOOTER_PART_RE = re.compile(r"^word/footer(\d*)\.xml$")
+
+# Upper bounds protecting the worker against oversized or zip-bomb documents
+MAX_PART_BYTES = 32 * 1024 * 1024
+MAX_TEXT_CHARS = 2_000_000
+
+CELL_SEPARATOR = " | "
+
+_TEXT = W_NS + "t"
+_TAB = W_NS + "tab"
+_TAB_STOPS = W_NS + "tabs"  # Paragraph property listing tab stop positions
+_BREAKS = (W_NS + "br", W_NS + "cr")
+_PARAGRAPH = W_NS + "p"
+_CELL = W_NS + "tc"
+_ROW = W_NS + "tr"
+_FALLBACK = MC_NS + "Fallback"
+
+
+class _LimitedReader:
+    """File-like wrapper that refuses to read past a byte budget."""
+
+    def __init__(self, raw: BinaryIO, limit: int, name: str):
+        self.raw = raw
+        self.limit = limit
+        self.name = name
+        self.consumed = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.consumed += len(data)
+        if self.consumed > self.limit:
+            raise ValueError(f"DOCX part {self.name} exceeds {self.limit} bytes")
+        return data
+
+
+def _part_sort_key(match: "re.Match") -> int:
+    return int(match.group(1) or 0)
+
+
+def _extract_part(stream: BinaryIO, lines: List[str], max_chars: int) -> int:
+    """
+    Stream one WordprocessingML part and append its lines in document order.
+
+    Paragraphs become lines, table rows become cell texts joined by
+    ``CELL_SEPARATOR`` and text box paragraphs are emitted before the
+    paragraph that anchors them. Completed elements are detached from the
+    tree as soon as they are consumed so memory stays flat regardless of
+    document length.
+
+    Returns:
+        Number of characters appended
+    """
+    paragraphs: List[List[str]] = []  # stack of open paragraph buffers
+    cells: List[List[str]] = []  # stack of open table cell buffers
+    rows: List[List[str]] = []  # stack of open table row buffers
+    elements = []
+    fallback_depth = 0
+    chars = 0
+
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+
+        if event == "start":
+            elements.append(elem)
+            if tag == _FALLBACK:
+                # AlternateContent fallbacks duplicate the text box content
+                fallback_depth += 1
+            elif fallback_depth:
+                pass
+            elif tag == _PARAGRAPH:
+                paragraphs.append([])
+            elif tag == _CELL:
+                cells.append([])
+            elif tag == _ROW:
+                rows.append([])
+            continue
+
+        elements.pop()
+
+        if tag == _FALLBACK:
+            fallback_depth -= 1
+        elif fallback_depth:
+            pass
+        elif tag == _TEXT:
+            if elem.text and paragraphs:
+                paragraphs[-1].append(elem.text)
+        elif tag == _TAB:
+            # A w:tab is a tab character in a run, or a tab stop definition under w:pPr/w:tabs
+            if paragraphs and elements[-1].tag != _TAB_STOPS:
+                paragraphs[-1].append("\t")
+        elif tag in _BREAKS:
+            if paragraphs:
+                paragraphs[-1].append("\n")
+        elif tag == _PARAGRAPH:
+            text = "".join(paragraphs.pop())
+            if cells:
+                cells[-1].append(text)
+            else:
+                lines.append(text)
+                chars += len(text) + 1
+        elif tag == _CELL:
+            cell_text = " ".join(part for part in cells.pop() if part.strip())
+            if rows:
+                rows[-1].append(cell_text)
+        elif tag == _ROW:
+            row_text = CELL_SEPARATOR.join(cell for cell in rows.pop() if cell)
+            if cells:
+                # Nested table: the row belongs to the enclosing cell
+                cells[-1].append(row_text)
+            else:
+                lines.append(row_text)
+                chars += len(row_text) + 1
+
+        # Detach the finished element so the tree never grows
+        elem.clear()
+        if elements:
+            elements[-1].remove(elem)
+
+        if chars > max_chars:
+            raise ValueError(f"DOCX text exceeds {max_chars} characters")
+
+    return chars
+
+
+def extract_docx_text(
+    source: Union[bytes, BinaryIO],
+    include_headers_footers: bool = True,
+    max_part_bytes: int = MAX_PART_BYTES,
+    max_chars: int = MAX_TEXT_CHARS,
+) -> str:
+    """
+    Extract text from a DOCX file without building a full document model.
+
+    Headers come first, then the body (paragraphs, tables and text boxes in
+    document order), then footers.
+
+    Args:
+        source: DOCX content as bytes or a seekable binary file
+        include_headers_footers: Whether to include header/footer parts
+        max_part_bytes: Maximum uncompressed size of a single XML part
+        max_chars: Maximum number of extracted characters
+
+    Returns:
+        Extracted text, one paragraph or table row per line
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+
+    lines: List[str] = []
+    with zipfile.ZipFile(source) as archive:
+        names = archive.namelist()
+        if DOCUMENT_PART not in names:
+            raise ValueError("Not a DOCX file: missing word/document.xml")
+
+        parts = [DOCUMENT_PART]
+        if include_headers_footers:
+            headers = [m for m in map(HEADER_PART_RE.match, names) if m]
+            footers = [m for m in map(FOOTER_PART_RE.match, names) if m]
+            parts = (
+                [m.group(0) for m in sorted(headers, key=_part_sort_key)]
+                + parts
+                + [m.group(0) for m in sorted(footers, key=_part_sort_key)]
+            )
+
+        remaining = max_chars
+        for part in parts:
+            info = archive.getinfo(part)
+            if info.file_size > max_part_bytes:
+                raise ValueError(f"DOCX part {part} exceeds {max_part_bytes} bytes")
+            with archive.open(info) as raw:
+                reader = _LimitedReader(raw, max_part_bytes, part)
+                remaining -= _extract_part(reader, lines, remaining)
+
+    return "\n".join(lines)
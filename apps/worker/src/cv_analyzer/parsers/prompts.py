@@ -1,5 +1,5 @@
 """Prompt templates for CV analysis."""
-from typing import Dict
+from typing import Dict, List
 from cv_analyzer.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -64,9 +64,46 @@ Return structured JSON matching this schema:
     "improvement_plan": "<detailed plan>",
     "summary": "<summary>"
 }}
+""",
+    
+    "v3": """Analyze the following CV and provide a comprehensive assessment.
+
+CV Content:
+{cv_text}
+
+Skills already detected deterministically (do not repeat them):
+{detected_skills}
+
+Please provide:
+1. Overall score (0-100) with justification
+2. Additional skills NOT in the detected list above (list, may be empty)
+3. Identified gaps (list)
+4. Seniority level assessment (junior/mid/senior/lead)
+5. ATS (Applicant Tracking System) compatibility issues (list)
+6. Improvement recommendations (structured plan)
+
+Format your response as JSON with the following structure:
+{{
+    "overall_score": <number>,
+    "score_breakdown": {{
+        "content_quality": <number>,
+        "structure": <number>,
+        "skills_match": <number>,
+        "ats_compatibility": <number>
+    }},
+    "additional_skills": ["skill1", ...],
+    "gaps": ["gap1", "gap2", ...],
+    "seniority_level": "<level>",
+    "ats_issues": ["issue1", "issue2", ...],
+    "improvement_plan": "<detailed recommendations>",
+    "summary": "<overall assessment summary>"
+}}
 """,
 }
 
+# Filled in before the template reaches a provider, which only formats {cv_text}
+DETECTED_SKILLS_PLACEHOLDER = "{detected_skills}"
+
 
 def get_prompt(version: str = "v1") -> str:
     """Get prompt template by version."""
@@ -74,3 +111,17 @@ def get_prompt(version: str = "v1") -> str:
         logger.warning("prompt_version_not_found", version=version, default="v1")
         version = "v1"
     return PROMPTS[version]
+
+
+def uses_detected_skills(template: str) -> bool:
+    """Whether a template expects pre-extracted skills."""
+    return DETECTED_SKILLS_PLACEHOLDER in template
+
+
+def fill_detected_skills(template: str, skills: List[str]) -> str:
+    """Substitute detected skills into a template, keeping {cv_text} intact."""
+    if not uses_detected_skills(template):
+        return template
+    listed = ", ".join(skills) if skills else "none"
+    listed = listed.replace("{", "{{").replace("}", "}}")
+    return template.replace(DETECTED_SKILLS_PLACEHOLDER, listed)
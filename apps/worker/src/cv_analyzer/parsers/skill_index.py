@@ -0,0 +1,175 @@
+"""Deterministic skill extraction backed by an Aho-Corasick index."""
+import json
+import os
+import threading
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple
+from cv_analyzer.core.config import settings
+from cv_analyzer.core.logging import get_logger
+from cv_analyzer.parsers.skill_taxonomy import SKILL_TAXONOMY
+
+logger = get_logger(__name__)
+
+
+class SkillIndex:
+    """
+    Multi-pattern matcher over a skill taxonomy.
+
+    All canonical names and aliases are compiled into a single Aho-Corasick
+    automaton, so a section is scanned once regardless of taxonomy size.
+    Matches must sit on word boundaries ("java" does not match "javascript").
+    """
+
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str]]] = [[]]
+        self.terms = 0
+
+        for canonical, aliases in taxonomy.items():
+            for term in {canonical, *aliases}:
+                term = " ".join(term.lower().split())
+                if term:
+                    self._add_term(term, canonical)
+                    self.terms += 1
+        self._build_failure_links()
+        self.skills = len(taxonomy)
+
+    def _add_term(self, term: str, canonical: str):
+        node = 0
+        for char in term:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][char] = child
+            node = child
+        self._output[node].append((len(term), canonical))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def _matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, canonical) for every boundary-aligned match."""
+        goto, fail, output = self._goto, self._fail, self._output
+        last = len(text) - 1
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not output[node]:
+                continue
+            if position < last and text[position + 1].isalnum():
+                continue
+            for length, canonical in output[node]:
+                start = position - length + 1
+                if start == 0 or not text[start - 1].isalnum():
+                    yield start, position + 1, canonical
+
+    def find(self, text: str) -> List[str]:
+        """
+        Find canonical skills mentioned in text.
+
+        Overlapping matches resolve to the leftmost-longest one, so
+        "node.js" counts once rather than as "node" plus "js".
+        """
+        matches = sorted(self._matches(text.lower()), key=lambda m: (m[0], m[0] - m[1]))
+        skills = []
+        covered = 0
+        for start, end, canonical in matches:
+            if start >= covered:
+                skills.append(canonical)
+                covered = end
+        return skills
+
+    def extract(self, sections: Dict[str, str]) -> List[Dict[str, object]]:
+        """
+        Extract canonical skills from parsed CV sections.
+
+        Args:
+            sections: Section name -> section text (``CVParser`` output)
+
+        Returns:
+            Skills in order of first appearance, each with the sections it
+            was found in and its mention count
+        """
+        found: Dict[str, Dict[str, object]] = {}
+        for section, text in sections.items():
+            if not text:
+                continue
+            for canonical in self.find(text):
+                entry = found.get(canonical)
+                if entry is None:
+                    entry = found[canonical] = {"skill": canonical, "sections": [], "mentions": 0}
+                if section not in entry["sections"]:
+                    entry["sections"].append(section)
+                entry["mentions"] += 1
+        return list(found.values())
+
+
+_index: Optional[SkillIndex] = None
+_index_mtime: Optional[float] = None
+_index_lock = threading.Lock()
+
+
+def _load_taxonomy(path: Optional[str]) -> Dict[str, List[str]]:
+    if not path:
+        return SKILL_TAXONOMY
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _taxonomy_mtime(path: Optional[str]) -> Optional[float]:
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def reload_skill_index(taxonomy: Optional[Dict[str, List[str]]] = None) -> SkillIndex:
+    """
+    Build a new index and atomically swap it in.
+
+    Args:
+        taxonomy: Taxonomy to index; defaults to ``settings.skill_taxonomy_path``
+            or the bundled taxonomy
+
+    Returns:
+        The newly active index
+    """
+    global _index, _index_mtime
+    path = settings.skill_taxonomy_path
+    with _index_lock:
+        mtime = _taxonomy_mtime(path) if taxonomy is None else None
+        index = SkillIndex(taxonomy if taxonomy is not None else _load_taxonomy(path))
+        _index, _index_mtime = index, mtime
+    logger.info("skill_index_loaded", skills=index.skills, terms=index.terms)
+    return index
+
+
+def get_skill_index() -> SkillIndex:
+    """Get the process-wide skill index, reloading it if the taxonomy file changed."""
+    index = _index
+    if index is None:
+        return reload_skill_index()
+    path = settings.skill_taxonomy_path
+    if path and _index_mtime is not None and _taxonomy_mtime(path) not in (None, _index_mtime):
+        try:
+            return reload_skill_index()
+        except Exception as e:
+            logger.error("skill_index_reload_failed", path=path, error=str(e))
+    return index
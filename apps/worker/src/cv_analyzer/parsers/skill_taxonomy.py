@@ -0,0 +1,95 @@
+"""Bundled skill taxonomy (canonical name -> aliases)."""
+from typing import Dict, List
+
+# Canonical names and aliases are matched case-insensitively on word
+# boundaries. Names that collide with ordinary prose (C, R, Go, "rest") are
+# left out or spelled in an unambiguous form.
+SKILL_TAXONOMY: Dict[str, List[str]] = {
+    # Languages
+    "Python": ["python3", "py3"],
+    "Java": [],
+    "JavaScript": ["js", "ecmascript", "es6"],
+    "TypeScript": ["ts"],
+    "Golang": ["go lang"],
+    "Rust": [],
+    "C++": ["cpp"],
+    "C#": ["csharp", "c sharp"],
+    "Ruby": [],
+    "PHP": [],
+    "Kotlin": [],
+    "Swift": [],
+    "Scala": [],
+    "SQL": [],
+    "Bash": ["shell scripting", "shell script"],
+    # Frontend
+    "React": ["react.js", "reactjs"],
+    "Angular": ["angularjs", "angular.js"],
+    "Vue.js": ["vue", "vuejs"],
+    "Next.js": ["nextjs"],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    # Backend
+    "Node.js": ["node", "nodejs"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": [],
+    "Spring Boot": ["springboot", "spring framework"],
+    ".NET": ["dotnet", "asp.net"],
+    "Ruby on Rails": ["rails", "ror"],
+    "GraphQL": [],
+    "REST APIs": ["rest api", "restful"],
+    "gRPC": [],
+    # Data
+    "PostgreSQL": ["postgres", "psql"],
+    "MySQL": [],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "Elasticsearch": ["elastic search", "opensearch"],
+    "Kafka": ["apache kafka"],
+    "RabbitMQ": [],
+    "Apache Spark": ["spark", "pyspark"],
+    "Airflow": ["apache airflow"],
+    "dbt": [],
+    "Snowflake": [],
+    "BigQuery": [],
+    "Pandas": [],
+    "NumPy": [],
+    # ML / AI
+    "Machine Learning": ["ml"],
+    "Deep Learning": [],
+    "Natural Language Processing": ["nlp"],
+    "Computer Vision": [],
+    "PyTorch": [],
+    "TensorFlow": ["tf"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "LLMs": ["llm", "large language models"],
+    "MLflow": [],
+    # Cloud / DevOps
+    "AWS": ["amazon web services"],
+    "Google Cloud": ["gcp", "google cloud platform"],
+    "Azure": ["microsoft azure"],
+    "Docker": [],
+    "Kubernetes": ["k8s", "kube"],
+    "Helm": [],
+    "Terraform": [],
+    "Ansible": [],
+    "CI/CD": ["ci cd", "continuous integration", "continuous delivery"],
+    "GitHub Actions": [],
+    "GitLab CI": [],
+    "Jenkins": [],
+    "FluxCD": ["flux cd"],
+    "Argo CD": ["argocd"],
+    "Linux": [],
+    "Git": [],
+    # Observability
+    "Prometheus": [],
+    "Grafana": [],
+    "OpenTelemetry": ["otel"],
+    # Practices
+    "Microservices": ["microservice"],
+    "Agile": ["scrum", "kanban"],
+    "Test-Driven Development": ["tdd"],
+    "System Design": [],
+    "Project Management": [],
+    "Leadership": ["team lead", "people management"],
+}
@@ -0,0 +1,132 @@
+"""CV text normalization."""
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Page separator emitted by the PDF parser
+PAGE_BREAK = "\f"
+
+# Rough prompt-token estimate used for reporting savings
+CHARS_PER_TOKEN = 4
+
+# Lines at the top/bottom of a page considered header/footer candidates
+EDGE_LINES = 3
+
+# A line is running furniture when it repeats on this share of pages (min 2)
+REPEAT_PAGE_RATIO = 0.5
+
+BULLET_GLYPHS = "•●▪■□◦‣∙○◆◇►▶➢➤✓✔❖"
+
+# One alternation handles every per-page rewrite so each page is scanned once
+_NORMALIZE_RE = re.compile(
+    r"(?P<bullet>^[^\S\n]*(?:(?:[" + BULLET_GLYPHS + r"]|[-*](?=\s))[^\S\n]*)+)"
+    r"|(?P<lead>^[^\S\n]+)"
+    r"|(?P<hyphen>(?<=[^\W\d_])-[^\S\n]*\n\s*(?=[a-z]))"
+    r"|(?P<newline>[^\S\n]*\n(?:[^\S\n]*\n)*)"
+    r"|(?P<invisible>[\u00ad\u200b-\u200d\u2060\ufeff]+)"
+    r"|(?P<space>[^\S\n]{2,}|[^\S\n ])",
+    re.MULTILINE,
+)
+
+_REPLACEMENTS = {
+    "bullet": "- ",
+    "lead": "",
+    "hyphen": "",
+    "newline": "\n",
+    "invisible": "",
+    "space": " ",
+}
+
+_DIGITS_RE = re.compile(r"\d+")
+
+
+def _replace(match: "re.Match") -> str:
+    return _REPLACEMENTS[match.lastgroup]
+
+
+def normalize_page(page: str) -> str:
+    """
+    Normalize a single page in one regex pass.
+
+    Collapses Unicode whitespace, drops blank lines and invisible characters,
+    joins words hyphenated across line breaks and rewrites any run of bullet
+    glyphs to a single ``- `` marker.
+    """
+    return _NORMALIZE_RE.sub(_replace, page).strip()
+
+
+def _line_key(line: str) -> str:
+    """Comparison key that lets "Page 1 of 3" match "Page 2 of 3"."""
+    return _DIGITS_RE.sub("#", line.lower())
+
+
+def _remove_repeated_lines(pages: List[List[str]]) -> int:
+    """
+    Drop header/footer lines repeated across pages, in place.
+
+    Only the first and last ``EDGE_LINES`` lines of each page are candidates.
+    The first occurrence is kept so a running header that carries the
+    candidate's name still appears once.
+
+    Returns:
+        Number of lines removed
+    """
+    if len(pages) < 2:
+        return 0
+
+    def edges(lines: List[str]) -> set:
+        candidates = lines[:EDGE_LINES] + lines[-EDGE_LINES:]
+        return {_line_key(line) for line in candidates}
+
+    page_counts = Counter()
+    for lines in pages:
+        page_counts.update(edges(lines))
+
+    threshold = max(2, int(len(pages) * REPEAT_PAGE_RATIO + 0.5))
+    repeated = {key for key, count in page_counts.items() if count >= threshold}
+    if not repeated:
+        return 0
+
+    seen = set()
+    removed = 0
+    for lines in pages:
+        edge_positions = set(range(min(EDGE_LINES, len(lines))))
+        edge_positions.update(range(max(0, len(lines) - EDGE_LINES), len(lines)))
+        kept = []
+        for position, line in enumerate(lines):
+            key = _line_key(line)
+            if position in edge_positions and key in repeated:
+                if key in seen:
+                    removed += 1
+                    continue
+                seen.add(key)
+            kept.append(line)
+        lines[:] = kept
+    return removed
+
+
+def normalize_text(text: str) -> Tuple[str, Dict[str, int]]:
+    """
+    Normalize extracted CV text.
+
+    Pages (separated by ``PAGE_BREAK``) are normalized individually, then
+    headers, footers and page numbers repeated across pages are removed.
+
+    Args:
+        text: Raw extracted text
+
+    Returns:
+        Normalized text and stats about what was removed
+    """
+    pages = [normalize_page(page).split("\n") for page in text.split(PAGE_BREAK)]
+    repeated_lines = _remove_repeated_lines(pages)
+    normalized = "\n".join(line for lines in pages for line in lines if line)
+
+    chars_removed = max(0, len(text) - len(normalized))
+    stats = {
+        "pages": len(pages),
+        "repeated_lines_removed": repeated_lines,
+        "chars_removed": chars_removed,
+        "tokens_removed_estimate": chars_removed // CHARS_PER_TOKEN,
+    }
+    return normalized, stats
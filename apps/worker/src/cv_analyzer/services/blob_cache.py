@@ -0,0 +1,151 @@
+"""Node-local on-disk LRU cache for CV blobs."""
+import hashlib
+import mmap
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional
+from cv_analyzer.core.logging import get_logger
+from cv_analyzer.core.metrics import (
+    blob_cache_requests_total,
+    blob_cache_bytes_saved_total,
+    blob_cache_evictions_total,
+    blob_cache_size_bytes,
+)
+
+logger = get_logger(__name__)
+
+
+class BlobCache:
+    """
+    Byte-budgeted LRU cache of immutable objects on local disk.
+    
+    Cached files are returned as read-only ``mmap`` objects, so parsers read
+    them straight from the page cache without another heap copy. Entries
+    already on disk (e.g. after a worker restart) are adopted at startup in
+    least-recently-used order.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # file name -> size
+        self._size = 0
+        self._lock = threading.Lock()
+        self._load_existing()
+    
+    def _load_existing(self):
+        """Adopt files left by a previous process, oldest access first."""
+        files = []
+        for path in self.directory.iterdir():
+            if path.name.startswith(".tmp"):
+                path.unlink(missing_ok=True)
+            elif path.is_file():
+                stat = path.stat()
+                files.append((stat.st_atime, path.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._size += size
+        self._evict()
+        logger.info("blob_cache_loaded", entries=len(self._entries), size=self._size)
+    
+    @staticmethod
+    def _file_name(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+    
+    def _open(self, name: str) -> Optional[mmap.mmap]:
+        try:
+            with open(self.directory / name, "rb") as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+    
+    def get(self, key: str) -> Optional[mmap.mmap]:
+        """
+        Get a cached object.
+        
+        Args:
+            key: Object key
+        
+        Returns:
+            Read-only memory map of the object, or None on a miss
+        """
+        name = self._file_name(key)
+        with self._lock:
+            size = self._entries.get(name)
+            if size is not None:
+                self._entries.move_to_end(name)
+        
+        data = self._open(name) if size is not None else None
+        if data is None:
+            if size is not None:
+                # File vanished underneath us; forget it
+                self._discard(name)
+            blob_cache_requests_total.labels(result="miss").inc()
+            return None
+        
+        blob_cache_requests_total.labels(result="hit").inc()
+        blob_cache_bytes_saved_total.inc(size)
+        return data
+    
+    def put(self, key: str, chunks: Iterable[bytes]) -> Optional[mmap.mmap]:
+        """
+        Write an object to the cache from a stream of chunks.
+        
+        Objects larger than the whole budget are still returned as a memory
+        map but are not retained.
+        
+        Args:
+            key: Object key
+            chunks: Object content
+        
+        Returns:
+            Read-only memory map of the object, or None if it is empty
+        """
+        name = self._file_name(key)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp", dir=self.directory)
+        size = 0
+        try:
+            with os.fdopen(fd, "r+b") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    size += len(chunk)
+                f.flush()
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+            if data is None or size > self.max_bytes:
+                os.unlink(tmp_path)
+                return data
+            os.replace(tmp_path, self.directory / name)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        
+        with self._lock:
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                self._size -= previous
+            self._entries[name] = size
+            self._size += size
+            self._evict()
+        return data
+    
+    def _discard(self, name: str):
+        with self._lock:
+            size = self._entries.pop(name, None)
+            if size is not None:
+                self._size -= size
+                blob_cache_size_bytes.set(self._size)
+    
+    def _evict(self):
+        """Drop least recently used entries until within budget (lock held)."""
+        while self._size > self.max_bytes and self._entries:
+            name, size = self._entries.popitem(last=False)
+            self._size -= size
+            # Open memory maps stay valid after unlink
+            (self.directory / name).unlink(missing_ok=True)
+            blob_cache_evictions_total.inc()
+        blob_cache_size_bytes.set(self._size)
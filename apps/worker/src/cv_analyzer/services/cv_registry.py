@@ -0,0 +1,28 @@
+"""CV metadata index."""
+from typing import Optional, Dict, Any
+import redis
+from cv_analyzer.core.config import settings
+from cv_analyzer.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class CVRegistry:
+    """Read access to the CV metadata index maintained by the backend."""
+    
+    def __init__(self):
+        self.redis_client = redis.Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            db=settings.redis_db,
+            decode_responses=True,
+        )
+        self.cv_prefix = "cv:"
+    
+    def get(self, cv_id: str) -> Optional[Dict[str, Any]]:
+        """Get CV metadata (filename, content type, size, hash) or None."""
+        record = self.redis_client.hgetall(f"{self.cv_prefix}{cv_id}")
+        if not record:
+            return None
+        record["size_bytes"] = int(record["size_bytes"])
+        return record
@@ -1,13 +1,24 @@
 """Job status tracking service."""
 import json
+import time
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 import redis
+from cv_analyzer.core.codec import encode_event, decode_event_fields
 from cv_analyzer.core.config import settings
+from cv_analyzer.core.job_scripts import STATUS_ORDER, TRANSITION_SCRIPT, APPEND_EVENTS_SCRIPT
 from cv_analyzer.core.logging import get_logger
+from cv_analyzer.services.timeline_buffer import TimelineBuffer
 
 logger = get_logger(__name__)
 
+# Seconds job records and timelines are kept
+JOB_TTL_SECONDS = 86400 * 7
+
+
+class InvalidTransitionError(ValueError):
+    """Raised when a job status change is not allowed from its current status."""
+
 
 class JobStatus(str):
     """Job status enumeration."""
@@ -27,7 +38,15 @@ class TimelineEvent:
 
 
 class JobTracker:
-    """Service for tracking job status and timeline."""
+    """
+    Service for tracking job status and timeline.
+    
+    Jobs are Redis hashes (``job:{job_id}``); the timeline is a list
+    (``timeline:{job_id}``), newest event first. Every timeline event is
+    also published on ``job-events:{job_id}``. Sorted-set indexes
+    (``jobs:index:created``, ``jobs:index:cv:{cv_id}`` and
+    ``jobs:index:status:{status}``) list jobs by creation time.
+    """
     
     def __init__(self):
         self.redis_client = redis.Redis(
@@ -36,8 +55,25 @@ class JobTracker:
             db=settings.redis_db,
             decode_responses=True,
         )
+        # Timeline entries are binary, so they are read without decoding
+        self.binary_client = redis.Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            db=settings.redis_db,
+        )
         self.job_prefix = "job:"
         self.timeline_prefix = "timeline:"
+        self.channel_prefix = "job-events:"
+        self.index_prefix = "jobs:index:"
+        self._transition = self.redis_client.register_script(TRANSITION_SCRIPT)
+        self._append_events = self.redis_client.register_script(APPEND_EVENTS_SCRIPT)
+        self.timeline_buffer: Optional[TimelineBuffer] = None
+        if settings.timeline_buffer_max_events > 0:
+            self.timeline_buffer = TimelineBuffer(
+                self.redis_client,
+                self.write_events,
+                settings.timeline_buffer_max_events,
+            )
     
     def create_job(
         self,
@@ -46,53 +82,201 @@ class JobTracker:
         provider: str,
         prompt_version: Optional[str] = None,
     ):
-        """Create a new job record."""
-        job_data = {
-            "job_id": job_id,
-            "cv_id": cv_id,
-            "status": JobStatus.PENDING,
-            "provider": provider,
-            "prompt_version": prompt_version,
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat(),
-        }
-        self.redis_client.setex(
-            f"{self.job_prefix}{job_id}",
-            86400 * 7,  # 7 days TTL
-            json.dumps(job_data),
-        )
-        self.add_timeline_event(job_id, "job_created", "Job created", {})
-        logger.info("job_created", job_id=job_id, cv_id=cv_id)
+        """Create a new job record, its index entries and first timeline event in one round trip."""
+        self.create_jobs([{"job_id": job_id, "cv_id": cv_id, "provider": provider, "prompt_version": prompt_version}])
     
-    def update_job_status(
+    def create_jobs(self, jobs: List[Dict[str, Any]], client: Optional[redis.Redis] = None):
+        """
+        Create several job records with their index entries and first timeline events.
+        
+        Expired index entries are trimmed once per batch rather than per job.
+        
+        Args:
+            jobs: Dicts with ``job_id``, ``cv_id``, ``provider`` and ``prompt_version``
+            client: Pipeline to queue the writes on (default: one transaction, executed now)
+        """
+        if not jobs:
+            return
+        created = time.time()
+        now = datetime.utcfromtimestamp(created)
+        created_event = encode_event(now, "job_created", "Job created", {})
+        created_index = f"{self.index_prefix}created"
+        pending_index = self._status_index(JobStatus.PENDING)
+        pipe = client if client is not None else self.redis_client.pipeline()
+        # One multi-member ZADD per index
+        index_entries: Dict[str, Dict[str, float]] = {}
+        cv_indexes = set()
+        for job in jobs:
+            job_id = job["job_id"]
+            job_key = f"{self.job_prefix}{job_id}"
+            pipe.hset(job_key, mapping={
+                "job_id": job_id,
+                "cv_id": job["cv_id"],
+                "status": JobStatus.PENDING,
+                "provider": job["provider"],
+                "prompt_version": job["prompt_version"] or "",
+                "created_at": now.isoformat(),
+                "updated_at": now.isoformat(),
+                "version": 0,
+            })
+            pipe.expire(job_key, JOB_TTL_SECONDS)
+            cv_index = f"{self.index_prefix}cv:{job['cv_id']}"
+            cv_indexes.add(cv_index)
+            for index in (created_index, cv_index, pending_index):
+                index_entries.setdefault(index, {})[job_id] = created
+            self.write_events(job_id, [created_event], client=pipe)
+        for index, entries in index_entries.items():
+            pipe.zadd(index, entries)
+        for index in (created_index, *cv_indexes, *self._status_indexes()):
+            pipe.zremrangebyscore(index, "-inf", created - JOB_TTL_SECONDS)
+        for cv_index in cv_indexes:
+            pipe.expire(cv_index, JOB_TTL_SECONDS)
+        if client is None:
+            pipe.execute()
+        if len(jobs) == 1:
+            logger.info("job_created", job_id=jobs[0]["job_id"], cv_id=jobs[0]["cv_id"])
+        else:
+            logger.info("jobs_created", jobs=len(jobs))
+    
+    def transition(
         self,
         job_id: str,
         status: str,
+        event: Optional[str] = None,
+        message: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
         error: Optional[str] = None,
-    ):
-        """Update job status."""
-        job_data = self.get_job(job_id)
-        if not job_data:
-            raise ValueError(f"Job {job_id} not found")
+    ) -> Dict[str, Any]:
+        """
+        Change job status and record the matching timeline event atomically.
         
-        job_data["status"] = status
-        job_data["updated_at"] = datetime.utcnow().isoformat()
-        if error:
-            job_data["error"] = error
+        Validation, the update, the timeline push and TTL refresh all run in
+        one server-side script, so concurrent writers cannot lose updates.
+        Allowed transitions: pending -> processing | failed,
+        processing -> completed | failed.
         
-        self.redis_client.setex(
-            f"{self.job_prefix}{job_id}",
-            86400 * 7,
-            json.dumps(job_data),
-        )
+        Args:
+            job_id: Job identifier
+            status: New status
+            event: Timeline event name (``status_changed`` if omitted)
+            message: Timeline event message
+            metadata: Timeline event metadata
+            error: Error message to store on the job
+            
+        Returns:
+            Updated job data
+            
+        Raises:
+            ValueError: If the job does not exist
+            InvalidTransitionError: If the transition is not allowed
+        """
+        now = datetime.utcnow()
+        # Buffered events go first, in the same script call
+        pending = self.timeline_buffer.drain(job_id) if self.timeline_buffer else []
+        if not event:
+            # Every status change bumps the version and is published to subscribers
+            event, message = "status_changed", f"Status changed to {status}"
+        events = pending + [encode_event(now, event, message or "", metadata, status)]
+        try:
+            result = self._transition(
+                keys=[*self._event_keys(job_id), f"{self.index_prefix}created", *self._status_indexes()],
+                args=[status, now.isoformat(), JOB_TTL_SECONDS, error or "", *events],
+            )
+        except redis.RedisError as e:
+            if self.timeline_buffer:
+                self.timeline_buffer.restore(job_id, pending)
+            reason = str(e)
+            if reason.startswith("NOT_FOUND"):
+                raise ValueError(f"Job {job_id} not found")
+            if reason.startswith("INVALID_TRANSITION"):
+                raise InvalidTransitionError(f"Job {job_id}: {reason.split(' ', 1)[1]}")
+            if reason.startswith("WRONGTYPE") and self._migrate_legacy(job_id):
+                return self.transition(job_id, status, event, message, metadata, error)
+            raise
+        
+        job_data = self._decode(dict(zip(result[::2], result[1::2])))
         logger.info("job_status_updated", job_id=job_id, status=status)
+        return job_data
+    
+    def update_job_status(
+        self,
+        job_id: str,
+        status: str,
+        error: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Update job status, recorded as a ``status_changed`` timeline event."""
+        return self.transition(job_id, status, error=error)
     
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get job data."""
-        data = self.redis_client.get(f"{self.job_prefix}{job_id}")
-        if data:
-            return json.loads(data)
-        return None
+        key = f"{self.job_prefix}{job_id}"
+        try:
+            job_data = self.redis_client.hgetall(key)
+        except redis.ResponseError:
+            # Record written before jobs were stored as hashes
+            data = self.redis_client.get(key)
+            return json.loads(data) if data else None
+        return self._decode(job_data) if job_data else None
+    
+    @staticmethod
+    def _decode(job_data: Dict[str, str]) -> Dict[str, Any]:
+        job_data["prompt_version"] = job_data.get("prompt_version") or None
+        job_data["version"] = int(job_data.get("version") or 0)
+        return job_data
+    
+    def _migrate_legacy(self, job_id: str) -> bool:
+        """
+        Convert a JSON-string job record to a hash in place.
+        
+        Returns:
+            True if the record was converted (or already had been)
+        """
+        key = f"{self.job_prefix}{job_id}"
+        with self.redis_client.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                if pipe.type(key) != "string":
+                    return pipe.exists(key) > 0
+                job_data = json.loads(pipe.get(key))
+                ttl = pipe.ttl(key)
+                pipe.multi()
+                pipe.delete(key)
+                pipe.hset(key, mapping={k: v for k, v in job_data.items() if v is not None})
+                pipe.expire(key, ttl if ttl > 0 else JOB_TTL_SECONDS)
+                pipe.execute()
+            except redis.WatchError:
+                pass
+        logger.info("job_record_migrated", job_id=job_id)
+        return True
+    
+    def _status_index(self, status: str) -> str:
+        return f"{self.index_prefix}status:{status}"
+    
+    def _status_indexes(self) -> List[str]:
+        return [self._status_index(status) for status in STATUS_ORDER]
+    
+    def _event_keys(self, job_id: str) -> List[str]:
+        """Script keys: job hash, timeline list, event channel."""
+        return [
+            f"{self.job_prefix}{job_id}",
+            f"{self.timeline_prefix}{job_id}",
+            f"{self.channel_prefix}{job_id}",
+        ]
+    
+    def write_events(self, job_id: str, events: List[bytes], client: Optional[redis.Redis] = None):
+        """
+        Append serialized timeline events (oldest first), assigning versions.
+        
+        Args:
+            job_id: Job identifier
+            events: Events from ``codec.encode_event``
+            client: Pipeline to queue the write on (default: execute now)
+        """
+        self._append_events(
+            keys=self._event_keys(job_id),
+            args=[JOB_TTL_SECONDS, *events],
+            client=client,
+        )
     
     def add_timeline_event(
         self,
@@ -101,32 +285,20 @@ class JobTracker:
         message: str,
         metadata: Optional[Dict[str, Any]] = None,
     ):
-        """Add timeline event."""
-        event_data = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "event": event,
-            "message": message,
-            "metadata": metadata or {},
-        }
-        self.redis_client.lpush(
-            f"{self.timeline_prefix}{job_id}",
-            json.dumps(event_data),
-        )
-        self.redis_client.expire(f"{self.timeline_prefix}{job_id}", 86400 * 7)
-        logger.debug("timeline_event_added", job_id=job_id, event=event)
+        """Add timeline event (buffered when the write-behind buffer is enabled)."""
+        encoded = encode_event(datetime.utcnow(), event, message, metadata)
+        if self.timeline_buffer:
+            self.timeline_buffer.add(job_id, encoded)
+            return
+        
+        self.write_events(job_id, [encoded])
+        logger.debug("timeline_event_added", job_id=job_id, timeline_event=event)
     
     def get_timeline(self, job_id: str) -> List[TimelineEvent]:
-        """Get job timeline."""
-        events_json = self.redis_client.lrange(f"{self.timeline_prefix}{job_id}", 0, -1)
+        """Get job timeline (events still buffered in this process are not included)."""
+        entries = self.binary_client.lrange(f"{self.timeline_prefix}{job_id}", 0, -1)
         events = []
-        for event_json in reversed(events_json):  # Reverse to get chronological order
-            event_data = json.loads(event_json)
-            events.append(
-                TimelineEvent(
-                    timestamp=datetime.fromisoformat(event_data["timestamp"]),
-                    event=event_data["event"],
-                    message=event_data["message"],
-                    metadata=event_data.get("metadata"),
-                )
-            )
+        for entry in reversed(entries):  # Reverse to get chronological order
+            _, timestamp, event, message, metadata, _ = decode_event_fields(entry)
+            events.append(TimelineEvent(timestamp=timestamp, event=event, message=message, metadata=metadata))
         return events
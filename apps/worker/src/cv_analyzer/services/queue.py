@@ -1,9 +1,10 @@
 """Redis queue service."""
-import json
+import time
 import uuid
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import redis
+from cv_analyzer.core.codec import encode_message, decode_message
 from cv_analyzer.core.config import settings
 from cv_analyzer.core.logging import get_logger
 from cv_analyzer.core.metrics import (
@@ -14,16 +15,25 @@ from cv_analyzer.core.metrics import (
 
 logger = get_logger(__name__)
 
+# Dequeues are counted in ``{queue_name}:drained:{bucket}`` keys, one per
+# bucket of this many seconds; the API reads them as the worker drain rate
+# for admission control
+DRAIN_BUCKET_SECONDS = 10
+
 
 class QueueService:
-    """Service for job queue management."""
+    """
+    Service for job queue management.
+    
+    Messages use the compact wire format from ``cv_analyzer.core.codec``;
+    JSON messages queued by older producers are still accepted.
+    """
     
     def __init__(self):
         self.redis_client = redis.Redis(
             host=settings.redis_host,
             port=settings.redis_port,
             db=settings.redis_db,
-            decode_responses=True,
         )
         self.queue_name = settings.redis_queue_name
     
@@ -46,28 +56,48 @@ class QueueService:
         Returns:
             Job ID
         """
-        job_id = str(uuid.uuid4())
-        job_data = {
-            "job_id": job_id,
+        job_data = self.new_job(cv_id, provider, prompt_version, metadata)
+        self.enqueue_jobs([job_data])
+        return job_data["job_id"]
+    
+    def new_job(
+        self,
+        cv_id: str,
+        provider: Optional[str] = None,
+        prompt_version: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Build a job message with a new job ID, without enqueueing it."""
+        return {
+            "job_id": str(uuid.uuid4()),
             "cv_id": cv_id,
             "provider": provider or settings.default_provider,
             "prompt_version": prompt_version,
             "metadata": metadata or {},
             "created_at": datetime.utcnow().isoformat(),
         }
+    
+    def enqueue_jobs(self, jobs: List[Dict[str, Any]], client: Optional[redis.Redis] = None):
+        """
+        Enqueue job messages with a single LPUSH; they are dequeued in list order.
         
+        Args:
+            jobs: Messages from ``new_job``
+            client: Pipeline to queue the push on (default: execute now)
+        """
         try:
-            self.redis_client.lpush(
-                self.queue_name,
-                json.dumps(job_data),
-            )
-            queue_enqueued_total.labels(queue_name=self.queue_name).inc()
-            self._update_queue_size()
-            logger.info("job_enqueued", job_id=job_id, cv_id=cv_id)
-            return job_id
+            redis_client = client if client is not None else self.redis_client
+            redis_client.lpush(self.queue_name, *(encode_message(job) for job in jobs))
+            queue_enqueued_total.labels(queue_name=self.queue_name).inc(len(jobs))
+            if client is None:
+                self.update_queue_size()
         except Exception as e:
-            logger.error("job_enqueue_failed", job_id=job_id, error=str(e))
+            logger.error("job_enqueue_failed", jobs=len(jobs), error=str(e))
             raise
+        if len(jobs) == 1:
+            logger.info("job_enqueued", job_id=jobs[0]["job_id"], cv_id=jobs[0]["cv_id"])
+        else:
+            logger.info("jobs_enqueued", jobs=len(jobs))
     
     def dequeue_job(self, timeout: int = 5) -> Optional[Dict[str, Any]]:
         """
@@ -82,10 +112,10 @@ class QueueService:
         try:
             result = self.redis_client.brpop(self.queue_name, timeout=timeout)
             if result:
-                _, job_json = result
-                job_data = json.loads(job_json)
+                _, message = result
+                job_data = decode_message(message)
                 queue_dequeued_total.labels(queue_name=self.queue_name).inc()
-                self._update_queue_size()
+                self._record_dequeue()
                 logger.info("job_dequeued", job_id=job_data.get("job_id"))
                 return job_data
             return None
@@ -93,11 +123,21 @@ class QueueService:
             logger.error("job_dequeue_failed", error=str(e))
             raise
     
+    def _record_dequeue(self):
+        """Count a dequeue towards the drain rate and refresh the queue size metric."""
+        drained_key = f"{self.queue_name}:drained:{int(time.time()) // DRAIN_BUCKET_SECONDS}"
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.incr(drained_key)
+        pipe.expire(drained_key, settings.queue_drain_window_seconds + DRAIN_BUCKET_SECONDS)
+        pipe.llen(self.queue_name)
+        _, _, size = pipe.execute()
+        queue_size.labels(queue_name=self.queue_name).set(size)
+    
     def get_queue_size(self) -> int:
         """Get current queue size."""
         return self.redis_client.llen(self.queue_name)
     
-    def _update_queue_size(self):
+    def update_queue_size(self):
         """Update queue size metric."""
         size = self.get_queue_size()
         queue_size.labels(queue_name=self.queue_name).set(size)
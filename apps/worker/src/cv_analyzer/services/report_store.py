@@ -0,0 +1,198 @@
+"""Batched persistence of analysis reports to PostgreSQL."""
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import redis
+from sqlalchemy.dialects.postgresql import insert
+from cv_analyzer.core.config import settings
+from cv_analyzer.core.database import database
+from cv_analyzer.core.logging import get_logger
+from cv_analyzer.core.metrics import report_batch_size, report_write_duration_seconds, reports_dropped_total
+from cv_analyzer.core.report_schema import analysis_reports, REPORT_CACHE_PREFIX
+
+logger = get_logger(__name__)
+
+# Lifetime of a CV's report version counter, well beyond any cache read
+REPORT_VERSION_TTL_SECONDS = 86400
+
+
+def build_report(
+    job_id: str,
+    cv_id: str,
+    provider: str,
+    prompt_version: str,
+    result: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Shape an analyzer result as an ``AnalysisReport`` document.
+    
+    Prompts return scores either as a ``scores`` list or as a
+    ``score_breakdown`` mapping; both become ``{category, score,
+    description}`` entries.
+    """
+    analysis = result["analysis"]
+    scores = analysis.get("scores")
+    if not scores:
+        scores = [
+            {"category": category, "score": score, "description": ""}
+            for category, score in (analysis.get("score_breakdown") or {}).items()
+            if isinstance(score, (int, float))
+        ]
+    improvement_plan = analysis.get("improvement_plan") or ""
+    if not isinstance(improvement_plan, str):
+        improvement_plan = json.dumps(improvement_plan)
+    return {
+        "cv_id": cv_id,
+        "job_id": job_id,
+        "provider": provider,
+        "prompt_version": prompt_version,
+        "scores": scores,
+        "summary": analysis.get("summary") or "",
+        "skills": analysis.get("skills") or [],
+        "gaps": analysis.get("gaps") or [],
+        "seniority_level": analysis.get("seniority_level"),
+        "ats_issues": analysis.get("ats_issues") or [],
+        "improvement_plan": improvement_plan,
+        "raw_analysis": analysis,
+        "generated_at": datetime.utcnow().isoformat(),
+    }
+
+
+class ReportNotStoredError(Exception):
+    """Raised to a report's writer when it was dropped before being stored."""
+
+
+class ReportWriter:
+    """
+    Buffers reports and writes them to PostgreSQL in batches.
+    
+    ``write()`` returns a future that resolves once the report's batch has
+    committed, so a job is only marked completed when its report can be
+    read. Writing wakes ``run()``, which writes everything queued by then
+    and otherwise flushes every ``report_flush_interval_seconds``; reports
+    queued while a batch is being written go into the next one. Each batch
+    is one multi-row upsert (a redelivered job overwrites its report)
+    followed by one pipeline dropping the affected CVs' cached reports. A
+    failed batch fails its reports' futures; beyond ``report_max_pending``
+    queued reports the oldest are dropped and fail with
+    ``ReportNotStoredError``, as do reports left over at shutdown.
+    """
+    
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_seconds: Optional[float] = None,
+        max_pending: Optional[int] = None,
+    ):
+        self.redis_client = redis_client or redis.Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            db=settings.redis_db,
+            decode_responses=True,
+        )
+        self.batch_size = batch_size or settings.report_batch_size
+        self.flush_interval_seconds = flush_interval_seconds or settings.report_flush_interval_seconds
+        self.max_pending = max_pending or settings.report_max_pending
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._batch_ready = asyncio.Event()
+    
+    def write(self, report: Dict[str, Any]) -> asyncio.Future:
+        """
+        Queue a report and wake the writer.
+        
+        Returns:
+            A future resolved once the report is stored, or failed with the
+            database error or ``ReportNotStoredError``
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((report, future))
+        excess = len(self._pending) - self.max_pending
+        if excess > 0:
+            self._fail(self._pending[:excess], "report_dropped")
+            del self._pending[:excess]
+            reports_dropped_total.inc(excess)
+        self._batch_ready.set()
+        return future
+    
+    async def run(self):
+        """Write batches until cancelled, then write whatever is left."""
+        try:
+            while True:
+                # Unlike wait_for, timeout() never swallows a cancel that
+                # arrives just as the event is set, so shutdown cannot hang
+                try:
+                    async with asyncio.timeout(self.flush_interval_seconds):
+                        await self._batch_ready.wait()
+                except TimeoutError:
+                    pass
+                self._batch_ready.clear()
+                await self.flush()
+        finally:
+            await self.flush()
+            self._fail(self._pending, "report_not_stored")
+            self._pending = []
+    
+    async def flush(self):
+        """Write all queued reports, one batch at a time."""
+        while self._pending:
+            batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+            try:
+                await self._write_batch([report for report, _ in batch])
+            except Exception as e:
+                logger.error("report_batch_failed", reports=len(batch), error=str(e))
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+    
+    @staticmethod
+    def _fail(entries: List[Tuple[Dict[str, Any], asyncio.Future]], event: str):
+        """Fail the futures of reports that will not be stored."""
+        for report, future in entries:
+            logger.error(event, job_id=report["job_id"])
+            if not future.done():
+                future.set_exception(ReportNotStoredError(f"Report for job {report['job_id']} was not stored"))
+    
+    async def _write_batch(self, reports: List[Dict[str, Any]]):
+        start = time.perf_counter()
+        rows = [
+            {
+                "job_id": report["job_id"],
+                "cv_id": report["cv_id"],
+                "provider": report["provider"],
+                "prompt_version": report["prompt_version"],
+                "report": report,
+                "generated_at": datetime.fromisoformat(report["generated_at"]),
+            }
+            for report in reports
+        ]
+        statement = insert(analysis_reports)
+        statement = statement.on_conflict_do_update(
+            index_elements=[analysis_reports.c.job_id],
+            set_={name: statement.excluded[name] for name in ("cv_id", "provider", "prompt_version", "report", "generated_at")},
+        )
+        async with database.transaction() as connection:
+            await connection.execute(statement, rows)
+        report_batch_size.observe(len(reports))
+        report_write_duration_seconds.observe(time.perf_counter() - start)
+        
+        # Stored reports are the source of truth; a failed invalidation only
+        # leaves a stale copy until its TTL runs out. Bumping the version
+        # stops the API caching a report it read before this write.
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for report in reports:
+                cv_key = f"{REPORT_CACHE_PREFIX}cv:{report['cv_id']}"
+                pipe.incr(f"{cv_key}:version")
+                pipe.expire(f"{cv_key}:version", REPORT_VERSION_TTL_SECONDS)
+                pipe.delete(cv_key, f"{cv_key}:job:{report['job_id']}")
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.error("report_cache_invalidation_failed", error=str(e))
+        logger.info("reports_stored", reports=len(reports))
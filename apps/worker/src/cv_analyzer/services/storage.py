@@ -1,13 +1,17 @@
 """MinIO storage service."""
 import io
-from typing import Optional
+import tempfile
+from typing import BinaryIO, Optional
 from minio import Minio
 from minio.error import S3Error
 from cv_analyzer.core.config import settings
 from cv_analyzer.core.logging import get_logger
+from cv_analyzer.services.blob_cache import BlobCache
 
 logger = get_logger(__name__)
 
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 class StorageService:
     """Service for file storage in MinIO."""
@@ -20,6 +24,18 @@ class StorageService:
             secure=settings.minio_secure,
         )
         self._ensure_bucket()
+        self.cache = self._init_cache()
+    
+    @staticmethod
+    def _init_cache() -> Optional[BlobCache]:
+        """Create the local blob cache if enabled and the directory is usable."""
+        if settings.blob_cache_max_mb <= 0:
+            return None
+        try:
+            return BlobCache(settings.blob_cache_dir, settings.blob_cache_max_mb * 1024 * 1024)
+        except OSError as e:
+            logger.warning("blob_cache_disabled", directory=settings.blob_cache_dir, error=str(e))
+            return None
     
     def _ensure_bucket(self):
         """Ensure bucket exists."""
@@ -58,28 +74,61 @@ class StorageService:
             logger.error("file_upload_failed", file_id=file_id, error=str(e))
             raise
     
-    def download_file(self, file_id: str) -> bytes:
+    def download_file(self, file_id: str, object_name: Optional[str] = None) -> BinaryIO:
         """
         Download file from MinIO.
         
+        The object is streamed in chunks and never held as one ``bytes``
+        value. With the local blob cache enabled it is served from (or
+        streamed into) the cache as a read-only memory map; otherwise it is
+        spooled into a temporary file that stays in memory up to
+        ``download_spool_max_mb``. Callers should ``close()`` the handle when
+        done.
+        
         Args:
             file_id: File identifier
+            object_name: Resolved object key (defaults to ``cvs/{file_id}``)
             
         Returns:
-            File content as bytes
+            Seekable binary file-like object positioned at the start
         """
-        object_name = f"cvs/{file_id}"
+        object_name = object_name or f"cvs/{file_id}"
+        if self.cache:
+            cached = self.cache.get(object_name)
+            if cached is not None:
+                logger.info("file_cache_hit", file_id=file_id, object_name=object_name)
+                return cached
+        
         try:
             response = self.client.get_object(settings.minio_bucket, object_name)
-            data = response.read()
-            response.close()
-            response.release_conn()
+            try:
+                chunks = response.stream(DOWNLOAD_CHUNK_SIZE)
+                if self.cache:
+                    data = self.cache.put(object_name, chunks) or io.BytesIO()
+                else:
+                    data = self._spool(chunks)
+            finally:
+                response.close()
+                response.release_conn()
             logger.info("file_downloaded", file_id=file_id, object_name=object_name)
             return data
         except S3Error as e:
             logger.error("file_download_failed", file_id=file_id, error=str(e))
             raise
     
+    @staticmethod
+    def _spool(chunks) -> BinaryIO:
+        """Copy chunks into a temp file that only touches disk above the threshold."""
+        spool = tempfile.SpooledTemporaryFile(max_size=settings.download_spool_max_mb * 1024 * 1024)
+        try:
+            for chunk in chunks:
+                spool.write(chunk)
+            spool.seek(0)
+        except BaseException:
+            spool.close()
+            raise
+        return spool
+    
     def delete_file(self, file_id: str):
         """
         Delete file from MinIO.
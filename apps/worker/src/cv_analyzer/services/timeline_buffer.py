@@ -0,0 +1,126 @@
+"""Write-behind buffer for job timeline events."""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List
+import redis
+from cv_analyzer.core.logging import get_logger
+from cv_analyzer.core.metrics import (
+    timeline_buffer_events,
+    timeline_events_dropped_total,
+    timeline_flush_duration_seconds,
+)
+
+logger = get_logger(__name__)
+
+
+class TimelineBuffer:
+    """
+    Bounded buffer of encoded timeline events, flushed in one pipeline.
+    
+    Events are kept per job in arrival order. They are written on a short
+    interval by ``run()``, and ``JobTracker.transition`` drains a job's
+    pending events into its status-change script, so they always land
+    before the transition's own event and no later than a terminal status.
+    When the buffer is full and a flush fails, the oldest event is dropped.
+    
+    Flushes queue each job's events on one pipeline through
+    ``write_events(job_id, events, client=pipeline)``.
+    """
+    
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        write_events: Callable[..., None],
+        max_events: int,
+    ):
+        self.redis_client = redis_client
+        self.write_events = write_events
+        self.max_events = max_events
+        self._events: "OrderedDict[str, List[bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # Held for a whole flush so a drain cannot overtake events in flight
+        self._flush_lock = threading.Lock()
+    
+    def add(self, job_id: str, event: bytes):
+        """Queue an event, flushing early if the buffer is full."""
+        if self._size >= self.max_events:
+            self.flush()
+        with self._lock:
+            if self._size >= self.max_events:
+                self._drop_oldest()
+            self._events.setdefault(job_id, []).append(event)
+            self._size += 1
+            timeline_buffer_events.set(self._size)
+    
+    def drain(self, job_id: str) -> List[bytes]:
+        """Take a job's pending events (oldest first) for writing elsewhere."""
+        with self._flush_lock, self._lock:
+            events = self._events.pop(job_id, [])
+            self._size -= len(events)
+            timeline_buffer_events.set(self._size)
+        return events
+    
+    def restore(self, job_id: str, events: List[bytes]):
+        """Put drained events back after a failed write."""
+        if not events:
+            return
+        with self._lock:
+            self._events[job_id] = events + self._events.get(job_id, [])
+            self._events.move_to_end(job_id, last=False)
+            self._size += len(events)
+            while self._size > self.max_events:
+                self._drop_oldest()
+            timeline_buffer_events.set(self._size)
+    
+    def flush(self) -> int:
+        """
+        Write all pending events in a single pipeline.
+        
+        Returns:
+            Number of events written (0 if the write failed; events are kept)
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._events = self._events, OrderedDict()
+                self._size = 0
+            if not pending:
+                return 0
+            
+            start = time.perf_counter()
+            pipe = self.redis_client.pipeline(transaction=False)
+            for job_id, events in pending.items():
+                self.write_events(job_id, events, client=pipe)
+            try:
+                pipe.execute()
+            except redis.RedisError as e:
+                logger.error("timeline_flush_failed", error=str(e))
+                for job_id, events in reversed(pending.items()):
+                    self.restore(job_id, events)
+                return 0
+            finally:
+                timeline_flush_duration_seconds.observe(time.perf_counter() - start)
+        
+        timeline_buffer_events.set(self._size)
+        return sum(len(events) for events in pending.values())
+    
+    async def run(self, interval_seconds: float):
+        """Flush periodically until cancelled, then flush once more."""
+        try:
+            while True:
+                await asyncio.sleep(interval_seconds)
+                await asyncio.to_thread(self.flush)
+        finally:
+            self.flush()
+    
+    def _drop_oldest(self):
+        """Drop the oldest buffered event (lock held)."""
+        job_id, events = next(iter(self._events.items()))
+        events.pop(0)
+        if not events:
+            del self._events[job_id]
+        self._size -= 1
+        timeline_events_dropped_total.inc()
+        logger.warning("timeline_event_dropped", job_id=job_id)
@@ -0,0 +1,12 @@
+"""Tests for the CV analysis orchestrator."""
+from cv_analyzer.analyzers.analyzer import CVAnalyzer
+
+
+def test_merge_skills_skips_invalid_items_and_duplicates():
+    """Test model-only skills are merged case-insensitively and non-strings dropped."""
+    merged = CVAnalyzer._merge_skills(
+        ["Python", "Kubernetes"],
+        ["python", "Terraform", {"name": "Go"}, None, 3, "terraform", " Rust ", ""],
+    )
+    assert merged == ["Python", "Kubernetes", "Terraform", "Rust"]
+    assert CVAnalyzer._merge_skills(["Python"], "Go, Rust") == ["Python"]
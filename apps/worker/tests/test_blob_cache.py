@@ -0,0 +1,20 @@
+"""Tests for the local blob cache."""
+from cv_analyzer.parsers.cv_parser import CVParser
+from cv_analyzer.services.blob_cache import BlobCache
+
+
+def test_blob_cache_lru_eviction(tmp_path):
+    """Test the local blob cache evicts least recently used entries."""
+    cache = BlobCache(str(tmp_path), max_bytes=10)
+    cache.put("blobs/a", [b"aaaa"]).close()
+    cache.put("blobs/b", [b"bbbb"]).close()
+    hit = cache.get("blobs/a")
+    assert hit[:] == b"aaaa"
+    hit.close()
+
+    cache.put("blobs/c", [b"cccc"]).close()
+    assert cache.get("blobs/b") is None
+    assert cache.get("blobs/a") is not None
+
+    parsed = CVParser().parse(cache.get("blobs/c"), "cv.txt")
+    assert parsed["normalized_text"] == "cccc"
@@ -0,0 +1,26 @@
+"""Tests for the queue message and timeline entry codec."""
+import json
+from datetime import datetime
+import msgpack
+from cv_analyzer.core import codec
+
+
+def test_codec_reads_msgpack_and_legacy_json():
+    """Test queue messages and timeline entries decode in both wire formats."""
+    message = {"job_id": "j1", "cv_id": "c1", "metadata": {}, "created_at": "2026-01-01T12:00:00.123000"}
+    assert codec.decode_message(codec.encode_message(message)) == message
+    assert codec.decode_message(json.dumps(message).encode()) == message
+
+    # As completed by the Redis script: array header and seq after the version byte
+    encoded = codec.encode_event(datetime(2026, 1, 1, 12), "cv_parsed", "CV parsed", {"pages": 2}, "processing")
+    entry = encoded[:1] + b"\x96" + msgpack.packb(300) + encoded[1:]
+    assert codec.decode_event(entry) == {
+        "seq": 300,
+        "timestamp": "2026-01-01T12:00:00",
+        "event": "cv_parsed",
+        "message": "CV parsed",
+        "metadata": {"pages": 2},
+        "status": "processing",
+    }
+    legacy = json.dumps({"seq": 3, "timestamp": "2026-01-01T12:00:00", "event": "e", "message": "m"})
+    assert codec.decode_event_fields(legacy.encode())[:4] == (3, datetime(2026, 1, 1, 12), "e", "m")
@@ -1,6 +1,9 @@
 """Example test file for CV parser."""
+import io
+import zipfile
 import pytest
 from cv_analyzer.parsers.cv_parser import CVParser
+from cv_analyzer.parsers.skill_index import SkillIndex
 
 
 def test_parse_txt():
@@ -11,3 +14,77 @@ def test_parse_txt():
     assert "raw_text" in result
     assert "normalized_text" in result
     assert "sections" in result
+
+
+def _build_docx(body: str, header: str = "") -> bytes:
+    """Build a minimal DOCX archive from raw WordprocessingML."""
+    ns = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", f"<w:document {ns}><w:body>{body}</w:body></w:document>")
+        if header:
+            archive.writestr("word/header1.xml", f"<w:hdr {ns}>{header}</w:hdr>")
+    return buffer.getvalue()
+
+
+def test_parse_docx_includes_tables_and_headers():
+    """Test DOCX extraction covers headers, tables and document order."""
+    body = (
+        "<w:p><w:r><w:t>Skills</w:t></w:r></w:p>"
+        "<w:tbl><w:tr>"
+        "<w:tc><w:p><w:r><w:t>Python</w:t></w:r></w:p></w:tc>"
+        "<w:tc><w:p><w:r><w:t>Kubernetes</w:t></w:r></w:p></w:tc>"
+        "</w:tr></w:tbl>"
+        "<w:p><w:r><w:t>Experience</w:t></w:r></w:p>"
+    )
+    header = "<w:p><w:r><w:t>Jane Doe</w:t></w:r></w:p>"
+    result = CVParser().parse(_build_docx(body, header), "cv.docx")
+    assert result["raw_text"].split("\n") == [
+        "Jane Doe",
+        "Skills",
+        "Python | Kubernetes",
+        "Experience",
+    ]
+
+
+def test_parse_docx_ignores_tab_stop_definitions():
+    """Test tab stops under w:pPr/w:tabs do not add tab characters."""
+    body = (
+        "<w:p><w:pPr><w:tabs><w:tab w:val=\"right\" w:pos=\"9000\"/></w:tabs></w:pPr>"
+        "<w:r><w:t>Engineer</w:t></w:r><w:r><w:tab/><w:t>2020</w:t></w:r></w:p>"
+    )
+    result = CVParser().parse(_build_docx(body), "cv.docx")
+    assert result["raw_text"] == "Engineer\t2020"
+
+
+def test_normalize_removes_repeated_page_furniture():
+    """Test cross-page header/footer removal and whitespace cleanup."""
+    pages = [
+        "Jane Doe\nSenior engi-\nneer at Acme\n• • Led  migrations\nPage 1 of 2",
+        "Jane Doe\n● Built APIs\n\n\n   Python, Go\nPage 2 of 2",
+    ]
+    normalized, stats = CVParser._normalize_text("\f".join(pages))
+    assert normalized.split("\n") == [
+        "Jane Doe",
+        "Senior engineer at Acme",
+        "- Led migrations",
+        "Page 1 of 2",
+        "- Built APIs",
+        "Python, Go",
+    ]
+    assert stats["repeated_lines_removed"] == 2
+    assert stats["chars_removed"] > 0
+
+
+def test_skill_index_maps_aliases_with_section_provenance():
+    """Test alias matching, word boundaries and section provenance."""
+    index = SkillIndex({"Kubernetes": ["k8s"], "Java": [], "JavaScript": ["js"]})
+    skills = index.extract({
+        "experience": "Ran k8s clusters and JavaScript services",
+        "skills": "Kubernetes, Java",
+    })
+    assert skills == [
+        {"skill": "Kubernetes", "sections": ["experience", "skills"], "mentions": 2},
+        {"skill": "JavaScript", "sections": ["experience"], "mentions": 1},
+        {"skill": "Java", "sections": ["skills"], "mentions": 1},
+    ]
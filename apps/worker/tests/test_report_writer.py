@@ -0,0 +1,99 @@
+"""Tests for batched report persistence."""
+import asyncio
+import contextlib
+import fakeredis
+import pytest
+from cv_analyzer.services import report_store
+from cv_analyzer.services.report_store import ReportWriter, ReportNotStoredError, build_report
+
+RESULT = {"analysis": {"summary": "Strong profile", "score_breakdown": {"structure": 80}}}
+
+
+class FakeDatabase:
+    """Records the rows of each committed batch, or fails while ``error`` is set."""
+    
+    def __init__(self):
+        self.batches = []
+        self.error = None
+    
+    @contextlib.asynccontextmanager
+    async def transaction(self):
+        yield self
+    
+    async def execute(self, statement, rows):
+        await asyncio.sleep(0)
+        if self.error:
+            raise self.error
+        self.batches.append([row["job_id"] for row in rows])
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(report_store, "database", database)
+    return database
+
+
+@pytest.fixture
+async def writer(database):
+    writer = ReportWriter(redis_client=fakeredis.FakeRedis(decode_responses=True), flush_interval_seconds=60)
+    task = asyncio.create_task(writer.run())
+    yield writer
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+def report(job_id: str, cv_id: str = "cv-1"):
+    return build_report(job_id, cv_id, "openai", "v1", RESULT)
+
+
+async def test_write_resolves_after_commit(writer, database):
+    """Test the future resolves once the report is committed, without waiting out the interval."""
+    writer.redis_client.set("report:cv:cv-1", "stale")
+    await asyncio.wait_for(writer.write(report("job-1")), timeout=1)
+    
+    assert database.batches == [["job-1"]]
+    assert not writer.redis_client.exists("report:cv:cv-1")
+    assert writer.redis_client.get("report:cv:cv-1:version") == "1"
+
+
+async def test_reports_queued_together_share_a_batch(writer, database):
+    """Test reports queued before the writer runs go out in one upsert."""
+    await asyncio.gather(*(writer.write(report(f"job-{i}")) for i in range(3)))
+    assert database.batches == [["job-0", "job-1", "job-2"]]
+
+
+async def test_failed_commit_fails_the_write(writer, database):
+    """Test a database error reaches the report's writer instead of being retried later."""
+    database.error = ConnectionError("database unavailable")
+    with pytest.raises(ConnectionError):
+        await writer.write(report("job-1"))
+    
+    database.error = None
+    await writer.write(report("job-2"))
+    assert database.batches == [["job-2"]]
+
+
+async def test_oldest_report_dropped_beyond_max_pending(database):
+    """Test the oldest queued reports fail once the queue is full."""
+    writer = ReportWriter(redis_client=fakeredis.FakeRedis(decode_responses=True), max_pending=2)
+    futures = [writer.write(report(f"job-{i}")) for i in range(3)]
+    
+    with pytest.raises(ReportNotStoredError):
+        await futures[0]
+    await writer.flush()
+    await asyncio.gather(*futures[1:])
+    assert database.batches == [["job-1", "job-2"]]
+
+
+async def test_shutdown_writes_queued_reports(database):
+    """Test cancelling the writer stores what is still queued."""
+    writer = ReportWriter(redis_client=fakeredis.FakeRedis(decode_responses=True), flush_interval_seconds=60)
+    task = asyncio.create_task(writer.run())
+    await asyncio.sleep(0)
+    future = writer.write(report("job-1"))
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    
+    await future
+    assert database.batches == [["job-1"]]
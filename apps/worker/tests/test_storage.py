@@ -0,0 +1,18 @@
+"""Tests for the worker storage service."""
+from cv_analyzer.core.config import settings
+from cv_analyzer.parsers.cv_parser import CVParser
+from cv_analyzer.services.storage import StorageService
+
+
+def test_download_spools_to_disk_and_parses(monkeypatch):
+    """Test downloaded chunks spill to a temp file that the parser reads directly."""
+    monkeypatch.setattr(settings, "download_spool_max_mb", 16 / (1024 * 1024))  # 16 bytes
+    chunks = [b"Python developer\n", b"Skills: Docker, Kubernetes"]
+    spool = StorageService._spool(iter(chunks))
+    try:
+        assert spool.tell() == 0
+        assert spool._rolled
+        parsed = CVParser().parse(spool, "cv.txt")
+        assert "Docker" in parsed["normalized_text"]
+    finally:
+        spool.close()
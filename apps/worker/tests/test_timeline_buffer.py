@@ -0,0 +1,143 @@
+"""Tests for the write-behind timeline buffer."""
+import asyncio
+import fakeredis
+import pytest
+import redis
+from cv_analyzer.services.timeline_buffer import TimelineBuffer
+
+
+class FlakyRedis(fakeredis.FakeRedis):
+    """FakeRedis whose pipelines fail to execute while ``fail`` is set."""
+    
+    fail = False
+    
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        if self.fail:
+            def execute(raise_on_error=True):
+                raise redis.ConnectionError("connection lost")
+            pipe.execute = execute
+        return pipe
+
+
+def write_events(job_id, events, client):
+    client.rpush(f"timeline:{job_id}", *events)
+
+
+@pytest.fixture
+def client():
+    return FlakyRedis()
+
+
+def make_buffer(client, max_events=100):
+    return TimelineBuffer(client, write_events, max_events)
+
+
+def timeline(client, job_id):
+    return client.lrange(f"timeline:{job_id}", 0, -1)
+
+
+def test_flush_writes_events_in_arrival_order(client):
+    buffer = make_buffer(client)
+    buffer.add("job-a", b"a1")
+    buffer.add("job-b", b"b1")
+    buffer.add("job-a", b"a2")
+    
+    assert buffer.flush() == 3
+    assert timeline(client, "job-a") == [b"a1", b"a2"]
+    assert timeline(client, "job-b") == [b"b1"]
+    assert buffer.flush() == 0
+
+
+def test_drain_takes_one_jobs_events(client):
+    buffer = make_buffer(client)
+    buffer.add("job-a", b"a1")
+    buffer.add("job-b", b"b1")
+    buffer.add("job-a", b"a2")
+    
+    assert buffer.drain("job-a") == [b"a1", b"a2"]
+    assert buffer.drain("job-a") == []
+    assert buffer.flush() == 1
+    assert timeline(client, "job-a") == []
+    assert timeline(client, "job-b") == [b"b1"]
+
+
+def test_failed_flush_restores_events_ahead_of_newer_ones(client):
+    buffer = make_buffer(client)
+    buffer.add("job-a", b"a1")
+    buffer.add("job-b", b"b1")
+    buffer.add("job-a", b"a2")
+    client.fail = True
+    
+    assert buffer.flush() == 0
+    
+    buffer.add("job-a", b"a3")
+    buffer.add("job-c", b"c1")
+    client.fail = False
+    
+    assert buffer.flush() == 5
+    assert timeline(client, "job-a") == [b"a1", b"a2", b"a3"]
+    assert timeline(client, "job-b") == [b"b1"]
+    assert timeline(client, "job-c") == [b"c1"]
+
+
+def test_restore_puts_drained_events_first(client):
+    buffer = make_buffer(client)
+    buffer.add("job-a", b"a1")
+    drained = buffer.drain("job-a")
+    buffer.add("job-a", b"a2")
+    
+    buffer.restore("job-a", drained)
+    
+    assert buffer.drain("job-a") == [b"a1", b"a2"]
+
+
+def test_full_buffer_drops_oldest_event_when_flush_fails(client):
+    buffer = make_buffer(client, max_events=3)
+    client.fail = True
+    buffer.add("job-a", b"a1")
+    buffer.add("job-b", b"b1")
+    buffer.add("job-a", b"a2")
+    buffer.add("job-a", b"a3")
+    
+    assert buffer._size == 3
+    client.fail = False
+    assert buffer.flush() == 3
+    assert timeline(client, "job-a") == [b"a2", b"a3"]
+    assert timeline(client, "job-b") == [b"b1"]
+
+
+def test_full_buffer_flushes_instead_of_dropping(client):
+    buffer = make_buffer(client, max_events=2)
+    for event in (b"e1", b"e2", b"e3"):
+        buffer.add("job-a", event)
+    
+    assert timeline(client, "job-a") == [b"e1", b"e2"]
+    assert buffer.flush() == 1
+    assert timeline(client, "job-a") == [b"e1", b"e2", b"e3"]
+
+
+def test_restore_over_the_cap_drops_oldest(client):
+    buffer = make_buffer(client, max_events=2)
+    buffer.add("job-a", b"a1")
+    buffer.add("job-a", b"a2")
+    drained = buffer.drain("job-a")
+    buffer.add("job-b", b"b1")
+    
+    buffer.restore("job-a", drained)
+    
+    assert buffer._size == 2
+    assert buffer.drain("job-a") == [b"a2"]
+    assert buffer.drain("job-b") == [b"b1"]
+
+
+async def test_run_flushes_pending_events_when_cancelled(client):
+    buffer = make_buffer(client)
+    task = asyncio.create_task(buffer.run(interval_seconds=60))
+    await asyncio.sleep(0)
+    buffer.add("job-a", b"a1")
+    
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    
+    assert timeline(client, "job-a") == [b"a1"]
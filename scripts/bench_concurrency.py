@@ -0,0 +1,80 @@
+"""
+Load test the API at increasing concurrency against a single process.
+
+Usage:
+    python scripts/bench_concurrency.py [--url http://localhost:8000] [--cv-id ID] [--requests 400]
+
+Start one API process (``uvicorn cv_analyzer.api.main:app --workers 1``)
+with Redis and MinIO running. Each level sends ``--requests`` requests with
+that many in flight and reports throughput and latency percentiles. The
+mix is ``GET /ready`` (Redis ping and MinIO bucket check), ``GET /jobs``
+(Redis indexes) and, with ``--cv-id``, ``POST /cv/{cv_id}/analyze`` (CV
+lookup, job creation and enqueue). Throughput should keep rising with
+concurrency until Redis, MinIO or the CPU saturates, rather than staying
+flat as it does when requests block the event loop.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Optional
+
+import httpx
+
+LEVELS = [1, 4, 16, 64]
+
+
+def request_mix(cv_id: Optional[str]) -> List[tuple]:
+    mix = [("GET", "/ready", None), ("GET", "/api/v1/jobs?limit=20", None)]
+    if cv_id:
+        mix.append(("POST", f"/api/v1/cv/{cv_id}/analyze", {}))
+    return mix
+
+
+async def run_level(client: httpx.AsyncClient, mix: List[tuple], concurrency: int, total: int):
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        method, path, body = mix[i % len(mix)]
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+    print(f"  {concurrency:>4} in flight  {total / elapsed:8.1f} req/s   p50 {p50:7.1f} ms   p95 {p95:7.1f} ms   errors {errors}")
+    return total / elapsed
+
+
+async def run(url: str, cv_id: Optional[str], total: int):
+    mix = request_mix(cv_id)
+    limits = httpx.Limits(max_connections=max(LEVELS), max_keepalive_connections=max(LEVELS))
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        await run_level(client, mix, 1, len(mix) * 5)  # warm up
+        print(f"{total} requests per level against {url}")
+        throughput = [await run_level(client, mix, level, total) for level in LEVELS]
+    print(f"  scaling {LEVELS[0]} -> {LEVELS[-1]} in flight: {throughput[-1] / throughput[0]:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--cv-id", help="An uploaded CV to include analyze requests")
+    parser.add_argument("--requests", type=int, default=400)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.cv_id, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark the streaming DOCX extractor against the python-docx paragraph path.
+
+Usage:
+    PYTHONPATH=apps/worker/src python scripts/bench_docx_extract.py [file.docx ...]
+
+Without arguments a synthetic CV is generated containing body paragraphs, a
+skills table, a header, a footer and a text box. Recall is the fraction of
+ground-truth words (synthetic CV) or of python-docx paragraph words (real
+files) that each extractor returns.
+"""
+import io
+import re
+import sys
+import time
+from typing import Callable, List, Set, Tuple
+
+from docx import Document
+from docx.oxml import parse_xml
+
+from cv_analyzer.parsers.docx_extractor import extract_docx_text
+
+ITERATIONS = 50
+WORD_RE = re.compile(r"\w+")
+
+TEXTBOX_XML = (
+    '<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml">'
+    "<mc:AlternateContent><mc:Choice Requires=\"wps\"><w:drawing><wps:txbx>"
+    "<w:txbxContent><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:txbxContent>"
+    "</wps:txbx></w:drawing></mc:Choice><mc:Fallback><w:pict><v:textbox>"
+    "<w:txbxContent><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:txbxContent>"
+    "</v:textbox></w:pict></mc:Fallback></mc:AlternateContent></w:r>"
+)
+
+
+def build_synthetic_cv(jobs: int = 40) -> Tuple[bytes, Set[str]]:
+    """Build a synthetic CV and return its bytes plus ground-truth words."""
+    truth: List[str] = []
+    doc = Document()
+
+    section = doc.sections[0]
+    section.header.paragraphs[0].text = "Jane Candidate - jane@example.com"
+    section.footer.paragraphs[0].text = "Curriculum vitae page footer"
+    truth += ["Jane Candidate - jane@example.com", "Curriculum vitae page footer"]
+
+    doc.add_heading("Experience", level=1)
+    truth.append("Experience")
+    for i in range(jobs):
+        line = f"Role{i} at Company{i}: delivered project{i} using stack{i}"
+        doc.add_paragraph(line)
+        truth.append(line)
+
+    doc.add_heading("Skills", level=1)
+    truth.append("Skills")
+    table = doc.add_table(rows=4, cols=3)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"skill{r}x{c}"
+            truth.append(cell.text)
+
+    anchor = doc.add_paragraph("Highlights")
+    anchor._p.append(parse_xml(TEXTBOX_XML.format(text="Textbox award winner")))
+    truth += ["Highlights", "Textbox award winner"]
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue(), set(WORD_RE.findall(" ".join(truth)))
+
+
+def python_docx_paragraphs(data: bytes) -> str:
+    """Baseline: the previous CVParser._parse_docx implementation."""
+    doc = Document(io.BytesIO(data))
+    return "\n".join(paragraph.text for paragraph in doc.paragraphs)
+
+
+def bench(name: str, fn: Callable[[bytes], str], data: bytes, truth: Set[str]):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        text = fn(data)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / ITERATIONS
+    found = set(WORD_RE.findall(text))
+    recall = len(truth & found) / len(truth) if truth else 1.0
+    print(f"  {name:<14} {elapsed_ms:8.2f} ms/doc   recall {recall:6.1%}")
+
+
+def main(paths: List[str]):
+    if paths:
+        samples = []
+        for path in paths:
+            with open(path, "rb") as f:
+                data = f.read()
+            truth = set(WORD_RE.findall(python_docx_paragraphs(data)))
+            samples.append((path, data, truth))
+    else:
+        data, truth = build_synthetic_cv()
+        samples = [("synthetic CV", data, truth)]
+
+    for name, data, truth in samples:
+        print(f"{name} ({len(data)} bytes, {ITERATIONS} iterations)")
+        bench("python-docx", python_docx_paragraphs, data, truth)
+        bench("streaming", extract_docx_text, data, truth)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,164 @@
+"""
+Benchmark the msgpack wire format against JSON for timeline entries and queue messages.
+
+Usage:
+    PYTHONPATH=apps/backend/src python scripts/bench_wire_format.py [--redis host:port]
+
+Reports the encoded size and the decode time of a typical job timeline
+(the path behind ``GET /jobs/{job_id}``) and of queue messages. With
+``--redis``, both encodings are also written to a scratch Redis database
+and the memory used by each list is read back with ``MEMORY USAGE``.
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+import msgpack
+
+from cv_analyzer.core import codec
+from cv_analyzer.models.schemas import TimelineEvent
+
+ITERATIONS = 2000
+TIMELINE_EVENTS = [
+    ("job_created", "Job created", {}, None),
+    ("processing_started", "Worker started processing", {}, "processing"),
+    ("cv_downloaded", "CV downloaded from storage", {"size_bytes": 183422}, None),
+    ("cv_parsed", "CV parsed", {"characters": 8214, "pages": 2}, None),
+    ("analysis_started", "Calling AI provider", {"provider": "openai", "model": "gpt-4"}, None),
+    ("analysis_completed", "Analysis completed", {"tokens": 3120, "duration_ms": 8410}, None),
+    ("job_completed", "Job completed successfully", {}, "completed"),
+]
+
+
+def json_timeline() -> List[bytes]:
+    """Entries as written before the msgpack format (newest first)."""
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    entries = []
+    for seq, (event, message, metadata, status) in enumerate(TIMELINE_EVENTS, 1):
+        event_data = {
+            "seq": seq,
+            "timestamp": (start + timedelta(seconds=seq)).isoformat(),
+            "event": event,
+            "message": message,
+            "metadata": metadata,
+        }
+        if status:
+            event_data["status"] = status
+        entries.append(json.dumps(event_data).encode())
+    return entries[::-1]
+
+
+def msgpack_timeline() -> List[bytes]:
+    """The same entries as the Redis script would store them."""
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    entries = []
+    for seq, (event, message, metadata, status) in enumerate(TIMELINE_EVENTS, 1):
+        body = codec.encode_event(start + timedelta(seconds=seq), event, message, metadata, status)
+        entries.append(b"\x01\x96" + msgpack.packb(seq) + body[1:])
+    return entries[::-1]
+
+
+def parse_json_timeline(entries: List[bytes]) -> List[TimelineEvent]:
+    """Baseline: the previous JobTracker._parse_timeline implementation."""
+    events = []
+    for event_json in reversed(entries):
+        event_data = json.loads(event_json)
+        events.append(
+            TimelineEvent(
+                timestamp=datetime.fromisoformat(event_data["timestamp"]),
+                event=event_data["event"],
+                message=event_data["message"],
+                metadata=event_data.get("metadata"),
+            )
+        )
+    return events
+
+
+def parse_msgpack_timeline(entries: List[bytes]) -> List[TimelineEvent]:
+    """Current JobTracker._parse_timeline implementation."""
+    events = []
+    for entry in reversed(entries):
+        _, timestamp, event, message, metadata, _ = codec.decode_event_fields(entry)
+        events.append(TimelineEvent(timestamp=timestamp, event=event, message=message, metadata=metadata))
+    return events
+
+
+def queue_message() -> dict:
+    return {
+        "job_id": str(uuid.uuid4()),
+        "cv_id": str(uuid.uuid4()),
+        "provider": "openai",
+        "prompt_version": "v2",
+        "metadata": {"source": "bulk", "priority": "normal"},
+        "created_at": datetime(2026, 1, 1, 12, 0, 0, 123000).isoformat(),
+    }
+
+
+def bench(name: str, fn: Callable[[], object], iterations: int = ITERATIONS) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed_us = (time.perf_counter() - start) * 1e6 / iterations
+    print(f"  {name:<10} {elapsed_us:8.2f} us/op")
+    return elapsed_us
+
+
+def report_sizes(name: str, json_values: List[bytes], msgpack_values: List[bytes]):
+    json_size = sum(map(len, json_values))
+    msgpack_size = sum(map(len, msgpack_values))
+    print(f"  {name:<10} json {json_size:6d} B   msgpack {msgpack_size:6d} B   ({1 - msgpack_size / json_size:.0%} smaller)")
+
+
+def redis_memory(address: str, json_values: List[bytes], msgpack_values: List[bytes], copies: int = 1000):
+    """Store ``copies`` of each list in a scratch database and compare MEMORY USAGE."""
+    import redis
+
+    host, _, port = address.partition(":")
+    client = redis.Redis(host=host, port=int(port or 6379), db=15)
+    usage = {}
+    for label, values in (("json", json_values), ("msgpack", msgpack_values)):
+        key = f"bench:wire:{label}"
+        client.delete(key)
+        client.rpush(key, *(values * copies))
+        usage[label] = client.memory_usage(key, samples=0)
+        client.delete(key)
+    print(
+        f"  redis      json {usage['json'] / copies:8.0f} B/list   msgpack {usage['msgpack'] / copies:8.0f} B/list   "
+        f"({1 - usage['msgpack'] / usage['json']:.0%} smaller)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--redis", help="host:port of a scratch Redis server (uses db 15)")
+    args = parser.parse_args()
+
+    json_entries, msgpack_entries = json_timeline(), msgpack_timeline()
+    assert parse_json_timeline(json_entries) == parse_msgpack_timeline(msgpack_entries)
+
+    messages = [queue_message() for _ in range(100)]
+    json_messages = [json.dumps(message).encode() for message in messages]
+    msgpack_messages = [codec.encode_message(message) for message in messages]
+
+    print(f"Timeline of {len(TIMELINE_EVENTS)} events ({ITERATIONS} iterations)")
+    report_sizes("size", json_entries, msgpack_entries)
+    before = bench("json", lambda: parse_json_timeline(json_entries))
+    after = bench("msgpack", lambda: parse_msgpack_timeline(msgpack_entries))
+    print(f"  decode CPU saved: {1 - after / before:.0%}")
+    if args.redis:
+        redis_memory(args.redis, json_entries, msgpack_entries)
+
+    print(f"Queue messages ({len(messages)} per op, {ITERATIONS // 10} iterations)")
+    report_sizes("size", json_messages, msgpack_messages)
+    before = bench("json", lambda: [json.loads(m) for m in json_messages], ITERATIONS // 10)
+    after = bench("msgpack", lambda: [codec.decode_message(m) for m in msgpack_messages], ITERATIONS // 10)
+    print(f"  decode CPU saved: {1 - after / before:.0%}")
+    if args.redis:
+        redis_memory(args.redis, json_messages, msgpack_messages, copies=10)
+
+
+if __name__ == "__main__":
+    main()
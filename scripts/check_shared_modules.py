@@ -0,0 +1,45 @@
+"""
+Check that modules shared by the backend and worker images are identical.
+
+Usage:
+    python scripts/check_shared_modules.py
+
+Each image is built from its own app directory, so modules both need are
+kept as copies under ``apps/{backend,worker}/src/cv_analyzer``. Exits
+non-zero and lists the copies that differ, so an edit to one is not
+forgotten in the other.
+"""
+import filecmp
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APPS = [ROOT / "apps" / "backend" / "src" / "cv_analyzer", ROOT / "apps" / "worker" / "src" / "cv_analyzer"]
+
+SHARED_MODULES = [
+    "core/codec.py",
+    "core/database.py",
+    "core/job_scripts.py",
+    "core/logging.py",
+    "core/report_schema.py",
+    "providers/__init__.py",
+    "providers/base.py",
+    "providers/factory.py",
+    "providers/openai_provider.py",
+    "providers/anthropic_provider.py",
+]
+
+
+def main():
+    backend, worker = APPS
+    drifted = [
+        module for module in SHARED_MODULES
+        if not filecmp.cmp(backend / module, worker / module, shallow=False)
+    ]
+    for module in drifted:
+        print(f"{module} differs between {backend.relative_to(ROOT)} and {worker.relative_to(ROOT)}")
+    sys.exit(1 if drifted else 0)
+
+
+if __name__ == "__main__":
+    main()